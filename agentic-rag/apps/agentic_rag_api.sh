@@ -9,11 +9,34 @@
 #
 # Optional environment variables:
 #   LLM_PROVIDER - "anthropic" (default) or "openai"
+#   LLM_PROMPT_CACHING - Mark static system prompts for Anthropic prompt caching; no effect while
+#                        they are under the 1024-token cacheable minimum, as they are now (default: false)
+#   QDRANT_PREFER_GRPC - Use gRPC (port QDRANT_GRPC_PORT, default 6334) for Qdrant (default: false)
 #   REFINEMENT_MODEL - Model for refinement tasks
 #   GENERATION_MODEL - Model for answer generation
+#   GENERATION_CONTEXT_BUDGET_TOKENS - Token budget for documents in the generation prompt (default: 6000)
+#   DEFAULT_DEADLINE_MS - Per-query latency budget when the request sets none (default: unset)
+#   FALLBACK_GENERATION_MODEL - Small generation model for routed simple queries and tight deadlines
+#   MODEL_ROUTING_ENABLED - Route simple queries to the small generation model (default: true)
 #   MLFLOW_TRACKING_URI - MLflow server URL
 #   MLFLOW_EXPERIMENT_NAME - Experiment name for tracing
 #   MLFLOW_ENABLED - Enable/disable MLflow (default: true)
+#   MLFLOW_ASYNC_EXPORT - Log MLflow runs from a background thread (default: true)
+#   MLFLOW_SAMPLE_RATE - Fraction of queries traced with spans; others export only if failed/slow (default: 1.0)
+#   MLFLOW_SLOW_REQUEST_MS - Unsampled queries at/over this latency (or profiled) are still exported (default: 15000)
+#   MLFLOW_SPAN_MAX_CHARS / MLFLOW_ARTIFACT_MAX_CHARS - Truncate logged strings (default: 2000 / 8000)
+#   MLFLOW_REDACT_FIELDS - JSON list of payload/param keys logged only as a hash, e.g. ["question"] (runs are then named by query_id)
+#   METRICS_ENABLED - Serve Prometheus metrics at /metrics (default: true)
+#   OTEL_EXPORTER_OTLP_ENDPOINT - Export pipeline spans over OTLP/HTTP, e.g. http://otel-collector:4318
+#   OTEL_SERVICE_NAME - Service name on exported spans (default: agentic-rag)
+#   PROFILING_ENABLED - Allow per-query profiling via X-Debug-Profile: true (default: false)
+#   PROFILING_SAMPLE_RATE - Fraction of queries profiled without the header (default: 0.0)
+#   PROFILING_BACKEND - cprofile or pyinstrument (default: cprofile)
+#   PROFILING_OUTPUT_DIR - Directory for profile reports, in addition to the MLflow run
+#   CHUNK_MAX_CHARS - Index documents longer than this (e.g. 1500) as overlapping chunks; re-index after changing (default: 0, disabled)
+#   CHUNK_OVERLAP_CHARS - Text shared by consecutive chunks (default: 200)
+#   CHUNK_SEARCH_OVERFETCH - Chunks fetched per requested document before collapsing to parents (default: 3)
+#   WARMUP_ENABLED - Preload/warm models at startup; /health is "ready" after, "degraded" if it fails (default: true)
 #   API_PORT - API server port (default: 8888)
 #   API_HOST - API server host (default: 0.0.0.0)
 #   PROJECT_PATH - Path to project with pyproject.toml (default: /mnt)
@@ -0,0 +1,3 @@
+# benchmarks package
+"""Offline benchmarks for indexing, retrieval and reranking performance,
+end-to-end pipeline latency and API saturation."""
@@ -0,0 +1,147 @@
+# candidates.py
+"""
+Micro-benchmark: per-candidate Document rebuilding versus CandidateSet.
+
+Times the document handling of the rerank and filter hot loops (scoring
+itself excluded) for 50/100/200 candidates:
+- validated: pair, sort, and build a validated Document with merged
+  metadata for every candidate (the previous implementation)
+- candidate_set: scores in side arrays, argsort, and an unvalidated copy
+  of the kept candidates only (reranking.candidates.CandidateSet)
+
+Usage:
+    python -m agentic_rag.benchmarks.candidates
+    python -m agentic_rag.benchmarks.candidates --counts 50 200 --top-k 10 --repeats 500
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+from agentic_rag.models import Document, SourceType
+from agentic_rag.reranking.candidates import CandidateSet
+
+from .corpus import load_corpus
+
+
+def _candidates(documents: list[dict], count: int) -> list[Document]:
+    """Build `count` candidate Documents, cycling the corpus with distinct ids."""
+    return [
+        Document(
+            id=f"{documents[i % len(documents)]['id']}-{i}",
+            text=documents[i % len(documents)]["text"],
+            source=SourceType.INCIDENTS,
+            metadata=dict(documents[i % len(documents)].get("metadata", {})),
+            score=1.0 / (i + 1),
+        )
+        for i in range(count)
+    ]
+
+
+def rerank_validated(documents: list[Document], scores: list[float], top_k: int) -> list[Document]:
+    scored_docs = sorted(zip(documents, scores), key=lambda x: x[1], reverse=True)
+    reranked = [
+        Document(
+            id=doc.id,
+            text=doc.text,
+            source=doc.source,
+            metadata={**doc.metadata, "original_score": doc.score, "cross_encoder_score": float(score)},
+            score=float(score),
+        )
+        for doc, score in scored_docs
+    ]
+    return reranked[:top_k]
+
+
+def rerank_candidate_set(documents: list[Document], scores: list[float], top_k: int) -> list[Document]:
+    candidates = CandidateSet(documents)
+    candidates.add_scores("original", [doc.score for doc in documents])
+    candidates.add_scores("cross_encoder", scores)
+    return candidates.materialize(
+        candidates.ranked("cross_encoder")[:top_k],
+        score_stage="cross_encoder",
+        metadata={"original_score": "original", "cross_encoder_score": "cross_encoder"},
+    )
+
+
+def filter_validated(documents: list[Document], scores: list[float], threshold: float) -> list[Document]:
+    kept = []
+    for doc, score in sorted(zip(documents, scores), key=lambda x: x[1], reverse=True):
+        if score >= threshold:
+            kept.append(Document(
+                id=doc.id,
+                text=doc.text,
+                source=doc.source,
+                metadata={**doc.metadata, "relevance_score": score, "filter_rank": len(kept) + 1},
+                score=doc.score,
+            ))
+    return kept
+
+
+def filter_candidate_set(documents: list[Document], scores: list[float], threshold: float) -> list[Document]:
+    candidates = CandidateSet(documents)
+    candidates.add_scores("relevance", scores)
+    relevance = candidates.scores["relevance"]
+    kept = [i for i in candidates.ranked("relevance") if relevance[i] >= threshold]
+    return candidates.materialize(kept, metadata={"relevance_score": "relevance"}, rank_key="filter_rank")
+
+
+def _time_us(fn, repeats: int) -> float:
+    """Median microseconds per call."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(timings)
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark candidate document handling in rerank/filter")
+    parser.add_argument("--csv-file", help="NTSB CSV export to add to the sample corpus")
+    parser.add_argument("--counts", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--top-k", type=int, default=10, help="Documents kept by rerank")
+    parser.add_argument("--threshold", type=float, default=7.0, help="Filter relevance threshold (1-10 scores)")
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = load_corpus(args.csv_file, limit=max(args.counts))
+
+    report = {}
+    print(f"  {'candidates':>10}{'stage':>8}{'validated us':>15}{'candidate_set us':>19}{'speedup':>9}")
+    for count in args.counts:
+        documents = _candidates(corpus, count)
+        logits = [rng.gauss(0, 3) for _ in documents]
+        relevance = [float(rng.randint(1, 10)) for _ in documents]
+
+        cases = {
+            "rerank": (
+                lambda: rerank_validated(documents, logits, args.top_k),
+                lambda: rerank_candidate_set(documents, logits, args.top_k),
+            ),
+            "filter": (
+                lambda: filter_validated(documents, relevance, args.threshold),
+                lambda: filter_candidate_set(documents, relevance, args.threshold),
+            ),
+        }
+        report[count] = {}
+        for stage, (validated, candidate_set) in cases.items():
+            assert [d.id for d in validated()] == [d.id for d in candidate_set()]
+            before, after = _time_us(validated, args.repeats), _time_us(candidate_set, args.repeats)
+            report[count][stage] = {"validated_us": before, "candidate_set_us": after, "speedup": before / after}
+            print(f"  {count:>10}{stage:>8}{before:>15.1f}{after:>19.1f}{before / after:>8.1f}x")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# corpus.py
+"""Benchmark corpus: bundled sample documents plus an optional NTSB CSV export."""
+
+from pathlib import Path
+
+from agentic_rag.data.load_sample_data import SAMPLE_INCIDENTS, SAMPLE_REGULATIONS, SAMPLE_NEWS
+from agentic_rag.data.loaders import NTSBLoader
+from agentic_rag.models import SourceType
+
+
+BENCHMARK_QUERIES = [
+    "What are common causes of Cessna 172 accidents?",
+    "Accidents caused by fuel exhaustion",
+    "Stall on approach due to low airspeed",
+    "VFR flight into instrument meteorological conditions",
+    "Engine failure during takeoff",
+    "What are the VFR weather minimums?",
+    "Preflight action requirements for pilots",
+    "Pilot recent flight experience requirements",
+    "Helicopter accidents in mountainous terrain",
+    "Student pilot loss of control during landing",
+]
+
+# Queries labelled with the expected intent and sources, for replaying the
+# full pipelines (the fake LLM answers intent classification from the label),
+# and with the relevant sample document ids per source, for retrieval evaluation
+LABELLED_QUERIES = [
+    {
+        "question": "What happened in the Cessna 172S accident near Atlanta, GA?",
+        "intent": "factual",
+        "sources": ["incidents"],
+        "relevant": {"incidents": ["ERA23FA001"]},
+    },
+    {
+        "question": "What caused the Piper PA-28-180 accident in Phoenix, AZ?",
+        "intent": "causal",
+        "sources": ["incidents", "news"],
+        "relevant": {"incidents": ["WPR22LA002"], "news": ["news_001"]},
+    },
+    {
+        "question": "Why did the Beechcraft Bonanza crash near Chicago?",
+        "intent": "causal",
+        "sources": ["incidents", "news"],
+        "relevant": {"incidents": ["CEN21FA003"], "news": ["news_002"]},
+    },
+    {
+        "question": "What are the VFR weather minimums?",
+        "intent": "regulatory",
+        "sources": ["regulations"],
+        "relevant": {"regulations": ["91.155"]},
+    },
+    {
+        "question": "What preflight action does 14 CFR 91.103 require?",
+        "intent": "regulatory",
+        "sources": ["regulations"],
+        "relevant": {"regulations": ["91.103"]},
+    },
+    {
+        "question": "Pilot recent flight experience requirements",
+        "intent": "regulatory",
+        "sources": ["regulations"],
+        "relevant": {"regulations": ["61.57"]},
+    },
+    {
+        "question": "Did the pilot in ERA23FA001 comply with preflight requirements?",
+        "intent": "compliance",
+        "sources": ["incidents", "regulations"],
+        "relevant": {"incidents": ["ERA23FA001"], "regulations": ["91.103"]},
+    },
+    {
+        "question": "Was the Phoenix flight legal under VFR weather minimums?",
+        "intent": "compliance",
+        "sources": ["incidents", "regulations"],
+        "relevant": {"incidents": ["WPR22LA002"], "regulations": ["91.155"]},
+    },
+    {
+        "question": "How does the Atlanta accident compare to other fuel exhaustion accidents?",
+        "intent": "comparative",
+        "sources": ["incidents"],
+        "relevant": {"incidents": ["ERA23FA001", "WPR22LA002"]},
+    },
+    {
+        "question": "Accidents caused by fuel exhaustion",
+        "intent": "factual",
+        "sources": ["incidents"],
+        "relevant": {"incidents": ["WPR22LA002"]},
+    },
+    {
+        "question": "What do reports, regulations and news coverage say about VFR into IMC accidents?",
+        "intent": "multi_source",
+        "sources": ["incidents", "regulations", "news"],
+        "relevant": {"incidents": ["CEN21FA003"], "regulations": ["91.155"], "news": ["news_002"]},
+    },
+    {
+        "question": "Stall on approach due to low airspeed",
+        "intent": "causal",
+        "sources": ["incidents"],
+        "relevant": {"incidents": ["ERA23FA001"]},
+    },
+]
+
+
+def load_corpus(csv_file: str | Path | None = None, limit: int | None = None) -> list[dict]:
+    """
+    Load benchmark documents as {"id", "text", "metadata"} dicts.
+
+    Args:
+        csv_file: Optional NTSB CSV export to add to the bundled samples
+        limit: Maximum number of documents to return
+
+    Returns:
+        List of documents
+    """
+    documents = [*SAMPLE_INCIDENTS, *SAMPLE_REGULATIONS, *SAMPLE_NEWS]
+
+    if csv_file:
+        loader = NTSBLoader(data_dir=Path(csv_file).parent)
+        for doc in loader.to_documents(loader.load_csv(Path(csv_file))):
+            documents.append(doc)
+            if limit and len(documents) >= limit:
+                break
+
+    return documents[:limit] if limit else documents
+
+
+def load_source_corpus(csv_file: str | Path | None = None, limit: int | None = None) -> dict[SourceType, list[dict]]:
+    """
+    Load benchmark documents per source.
+
+    Args:
+        csv_file: Optional NTSB CSV export to add to the sample incidents
+        limit: Maximum number of incidents read from the CSV
+    """
+    incidents = list(SAMPLE_INCIDENTS)
+    if csv_file:
+        loader = NTSBLoader(data_dir=Path(csv_file).parent)
+        for doc in loader.to_documents(loader.load_csv(Path(csv_file))):
+            incidents.append(doc)
+            if limit and len(incidents) >= limit:
+                break
+
+    return {
+        SourceType.INCIDENTS: incidents,
+        SourceType.REGULATIONS: list(SAMPLE_REGULATIONS),
+        SourceType.NEWS: list(SAMPLE_NEWS),
+    }
+
+
+def load_queries(documents: list[dict], max_queries: int = 50) -> list[str]:
+    """Benchmark queries: the fixed set plus the first line of sampled documents."""
+    queries = list(BENCHMARK_QUERIES)
+    step = max(1, len(documents) // max(1, max_queries - len(queries)))
+    for doc in documents[::step]:
+        first_line = doc["text"].strip().splitlines()[0].lstrip("# ").strip()
+        if first_line:
+            queries.append(first_line)
+        if len(queries) >= max_queries:
+            break
+    return queries
@@ -0,0 +1,160 @@
+# csv_loading.py
+"""
+NTSB CSV loading throughput: csv.DictReader versus pyarrow record batches.
+
+Times, in rows/s, from file to what each consumer indexes:
+- loader csv:    NTSBLoader.to_documents(load_csv())
+- loader arrow:  NTSBLoader.load_document_batches()
+- indexer csv:   NTSBIndexer.load_from_csv(engine="csv")
+- indexer arrow: NTSBIndexer.load_from_csv(engine="arrow")
+
+Embedding and upserts are excluded. Without --csv-file a synthetic export
+in the CAROL column layout is generated (narratives include commas, quotes
+and newlines). The loader outputs are compared document by document.
+
+Usage:
+    python -m agentic_rag.benchmarks.csv_loading --rows 200000
+    python -m agentic_rag.benchmarks.csv_loading --csv-file ./AviationData.csv --encoding latin-1
+"""
+
+import argparse
+import csv
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from agentic_rag.data.loaders import NTSBLoader
+from agentic_rag.indexers.ntsb_indexer import NTSBConfig, NTSBIndexer
+
+COLUMNS = [
+    "EventId", "EventDate", "Location", "Country", "Make", "Model", "RegistrationNumber",
+    "InjurySeverity", "TotalFatalInjuries", "TotalSeriousInjuries", "TotalMinorInjuries",
+    "WeatherCondition", "BroadPhaseOfFlight", "ProbableCause", "Narrative",
+]
+
+_AIRCRAFT = [("Cessna", "172S"), ("Piper", "PA-28-181"), ("Beech", "A36"), ("Cirrus", "SR22"), ("Boeing", "737-800")]
+_PHASES = ["Takeoff", "Climb", "Cruise", "Approach", "Landing", "Taxi"]
+_CAUSES = [
+    "The pilot's failure to maintain adequate airspeed, which resulted in an aerodynamic stall.",
+    "A total loss of engine power due to fuel exhaustion, caused by inadequate preflight planning.",
+    "",
+]
+
+
+def write_synthetic_csv(path: Path, rows: int, seed: int = 0) -> None:
+    """Write a CAROL-style NTSB export with `rows` events."""
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for i in range(rows):
+            make, model = rng.choice(_AIRCRAFT)
+            narrative = " ".join(
+                f"Sentence {j} of the \"narrative\", with commas, for event {i}."
+                for j in range(rng.randint(5, 40))
+            )
+            writer.writerow([
+                f"{2000 + i % 24:04d}{i:08d}",
+                f"{2000 + i % 24}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+                f"City {i % 500}, ST",
+                "United States",
+                make,
+                model,
+                f"N{rng.randint(100, 99999)}",
+                rng.choice(["Fatal", "Serious", "Minor", "None"]),
+                rng.choice(["", "0", "1", "2"]),
+                rng.choice(["", "0", "1"]),
+                str(rng.randint(0, 3)),
+                rng.choice(["VMC", "IMC", ""]),
+                rng.choice(_PHASES),
+                rng.choice(_CAUSES),
+                narrative if i % 3 else f"{narrative}\nSecond paragraph.\n\nThird.",
+            ])
+
+
+def _rows_per_second(name: str, batches) -> dict:
+    start = time.perf_counter()
+    rows = sum(len(batch) for batch in batches)
+    seconds = time.perf_counter() - start
+    result = {"rows": rows, "seconds": seconds, "rows_per_s": rows / seconds if seconds else 0.0}
+    print(f"  {name:<16}{rows:>10}{seconds:>10.2f}{result['rows_per_s']:>14,.0f}")
+    return result
+
+
+def _in_batches(documents, size: int = 1000):
+    batch = []
+    for doc in documents:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def check_equivalence(loader: NTSBLoader, csv_path: Path, encoding: str, limit: int = 5000) -> int:
+    """Number of the first `limit` documents that differ between the two loaders."""
+    row_docs = loader.to_documents(loader.load_csv(csv_path, encoding=encoding))
+    columnar_docs = (doc for batch in loader.load_document_batches(csv_path, encoding=encoding) for doc in batch)
+    mismatches = 0
+    for i, (expected, actual) in enumerate(zip(row_docs, columnar_docs)):
+        if i >= limit:
+            break
+        mismatches += expected != actual
+    return mismatches
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark NTSB CSV loading throughput")
+    parser.add_argument("--csv-file", help="NTSB CSV export (default: generate a synthetic one)")
+    parser.add_argument("--rows", type=int, default=100000, help="Rows in the synthetic export")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.csv_file:
+            csv_path = Path(args.csv_file)
+        else:
+            csv_path = Path(tmp) / "accidents.csv"
+            write_synthetic_csv(csv_path, args.rows, args.seed)
+        size_mb = csv_path.stat().st_size / 1e6
+
+        loader = NTSBLoader(data_dir=Path(tmp))
+        # Loading needs no embedder; skip __init__ so no model is loaded
+        indexer = NTSBIndexer.__new__(NTSBIndexer)
+        indexer.config = NTSBConfig()
+
+        print(f"\n{csv_path} ({size_mb:.0f} MB)")
+        print(f"  {'reader':<16}{'rows':>10}{'seconds':>10}{'rows/s':>14}")
+        report = {"csv_file": str(csv_path), "size_mb": size_mb}
+        report["loader_csv"] = _rows_per_second(
+            "loader csv", _in_batches(loader.to_documents(loader.load_csv(csv_path, encoding=args.encoding)))
+        )
+        report["loader_arrow"] = _rows_per_second(
+            "loader arrow", loader.load_document_batches(csv_path, encoding=args.encoding)
+        )
+        report["indexer_csv"] = _rows_per_second(
+            "indexer csv", indexer.load_from_csv(str(csv_path), engine="csv", encoding=args.encoding)
+        )
+        report["indexer_arrow"] = _rows_per_second(
+            "indexer arrow", indexer.load_from_csv(str(csv_path), engine="arrow", encoding=args.encoding)
+        )
+
+        report["loader_mismatches"] = check_equivalence(loader, csv_path, args.encoding)
+        print(f"\nLoader speedup: {report['loader_arrow']['rows_per_s'] / report['loader_csv']['rows_per_s']:.1f}x, "
+              f"indexer speedup: {report['indexer_arrow']['rows_per_s'] / report['indexer_csv']['rows_per_s']:.1f}x, "
+              f"documents differing: {report['loader_mismatches']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+# evaluation.py
+"""
+Offline retrieval quality and speed over a configuration grid.
+
+For every combination of embedder model, top_k, RerankingMode and
+RefinementMode, runs each gold query through retrieval (every source),
+reranking and refinement, and scores the resulting ranked documents
+against the gold relevant ids:
+- recall@k, MRR and nDCG@k (binary relevance) per source and overall
+- p50/p95 latency per query, plus p50 per stage
+
+The corpus (sample documents plus an optional NTSB CSV) is indexed into
+scratch collections per embedder on a reachable Qdrant. SYNTHESIZE
+replaces documents with a summary, so it is scored on its input documents.
+LLM refinement modes use the configured LLM provider.
+
+Results are written as CSV (one row per configuration and source) and,
+with --mlflow, as an MLflow table. --min-recall picks the fastest
+configuration whose overall recall meets the bar.
+
+Gold file format (JSON list or JSONL), defaults to LABELLED_QUERIES:
+    {"question": "...", "relevant": {"incidents": ["ERA23FA001"], "regulations": ["91.103"]}}
+
+Usage:
+    python -m agentic_rag.benchmarks.evaluation
+    python -m agentic_rag.benchmarks.evaluation --top-k 5 10 20 --reranking-modes none cross_encoder \\
+        --refinement-modes none local_filter --embedders BAAI/bge-small-en-v1.5 BAAI/bge-base-en-v1.5
+    python -m agentic_rag.benchmarks.evaluation --gold-file gold.jsonl --min-recall 0.8 --mlflow
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from agentic_rag.config import get_settings
+from agentic_rag.data.indexers.vector_store import VectorStore
+from agentic_rag.indexers import get_shared_embedder
+from agentic_rag.models import Document, RefinementMode, RerankingMode, SourceType
+from agentic_rag.refinement import ContextRefiner
+from agentic_rag.reranking.reranker import CrossEncoderReranker, get_reranker
+
+from .corpus import LABELLED_QUERIES, load_source_corpus
+from .pipeline import percentiles
+
+ALL_SOURCES = "all"
+
+CSV_FIELDS = [
+    "embedder", "top_k", "reranking_mode", "refinement_mode", "source", "queries",
+    "recall_at_k", "mrr", "ndcg_at_k",
+    "latency_p50_ms", "latency_p95_ms", "retrieval_p50_ms", "rerank_p50_ms", "refine_p50_ms",
+]
+
+
+@dataclass(frozen=True)
+class EvalConfig:
+    """One point of the evaluation grid."""
+    embedder: str
+    top_k: int
+    reranking_mode: RerankingMode
+    refinement_mode: RefinementMode
+
+    def to_dict(self) -> dict:
+        return {
+            "embedder": self.embedder,
+            "top_k": self.top_k,
+            "reranking_mode": self.reranking_mode.value,
+            "refinement_mode": self.refinement_mode.value,
+        }
+
+
+# ==================== METRICS ====================
+
+def recall_at_k(ranked_ids: list[str], relevant: set[str], k: int) -> float:
+    """Fraction of relevant ids in the top k."""
+    if not relevant:
+        return 0.0
+    return len(relevant.intersection(ranked_ids[:k])) / len(relevant)
+
+
+def reciprocal_rank(ranked_ids: list[str], relevant: set[str]) -> float:
+    """1 / rank of the first relevant id (0 if none is ranked)."""
+    for rank, doc_id in enumerate(ranked_ids, start=1):
+        if doc_id in relevant:
+            return 1.0 / rank
+    return 0.0
+
+
+def ndcg_at_k(ranked_ids: list[str], relevant: set[str], k: int) -> float:
+    """Normalized discounted cumulative gain at k with binary relevance."""
+    dcg = sum(1.0 / math.log2(rank + 1) for rank, doc_id in enumerate(ranked_ids[:k], start=1) if doc_id in relevant)
+    ideal = sum(1.0 / math.log2(rank + 1) for rank in range(1, min(len(relevant), k) + 1))
+    return dcg / ideal if ideal else 0.0
+
+
+def load_gold_set(path: str | Path | None) -> list[dict]:
+    """Gold queries from a JSON list or JSONL file (default: LABELLED_QUERIES)."""
+    if not path:
+        return LABELLED_QUERIES
+    text = Path(path).read_text()
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+# ==================== RUNNER ====================
+
+class RetrievalEvaluator:
+    """Evaluate retrieval, reranking and refinement configurations on a gold set."""
+
+    def __init__(self, corpus: dict[SourceType, list[dict]], gold: list[dict]):
+        self.corpus = corpus
+        self.gold = gold
+        self.settings = get_settings()
+        self._stores: dict[str, dict[SourceType, VectorStore]] = {}
+        self._refiner: ContextRefiner | None = None
+
+    def stores_for(self, embedding_model: str) -> dict[SourceType, VectorStore]:
+        """Scratch collections per source for an embedder, indexed on first use."""
+        if embedding_model not in self._stores:
+            embedder = get_shared_embedder(self.settings.embedder, embedding_model)
+            slug = re.sub(r"[^a-z0-9]+", "_", embedding_model.lower()).strip("_")
+            stores = {}
+            for source, documents in self.corpus.items():
+                store = VectorStore(
+                    collection_name=f"eval_{source.value}_{slug}",
+                    source_type=source,
+                    embedder=embedder,
+                )
+                store.create_collection(recreate=True)
+                store.index_documents(iter(documents))
+                stores[source] = store
+            self._stores[embedding_model] = stores
+        return self._stores[embedding_model]
+
+    @property
+    def refiner(self) -> ContextRefiner:
+        if self._refiner is None:
+            self._refiner = ContextRefiner()
+        return self._refiner
+
+    def run_query(self, config: EvalConfig, question: str, stores: dict[SourceType, VectorStore], reranker) -> dict:
+        """Retrieve, rerank and refine one query; return final documents and stage timings."""
+        start = time.perf_counter()
+        candidates: list[Document] = []
+        for store in stores.values():
+            candidates.extend(store.search(question, top_k=config.top_k))
+        candidates.sort(key=lambda doc: doc.score, reverse=True)
+        retrieved = time.perf_counter()
+
+        documents = reranker.rerank(question, candidates, top_k=config.top_k).documents
+        reranked = time.perf_counter()
+
+        if config.refinement_mode != RefinementMode.SYNTHESIZE:
+            documents = self.refiner.refine(documents, question, config.refinement_mode).documents
+        else:
+            self.refiner.refine(documents, question, config.refinement_mode)
+        refined = time.perf_counter()
+
+        return {
+            "documents": documents,
+            "total_ms": (refined - start) * 1000,
+            "retrieval_ms": (retrieved - start) * 1000,
+            "rerank_ms": (reranked - retrieved) * 1000,
+            "refine_ms": (refined - reranked) * 1000,
+        }
+
+    def evaluate(self, config: EvalConfig) -> list[dict]:
+        """Rows of mean metrics per source (and overall) for one configuration."""
+        stores = self.stores_for(config.embedder)
+        reranker = get_reranker(config.reranking_mode)
+
+        # Warm up lazy model loads, then start from a cold score cache
+        self.run_query(config, self.gold[0]["question"], stores, reranker)
+        if isinstance(reranker, CrossEncoderReranker):
+            reranker.scorer.cache.clear()
+
+        scores: dict[str, dict[str, list[float]]] = {}
+        timings: dict[str, list[float]] = {"total_ms": [], "retrieval_ms": [], "rerank_ms": [], "refine_ms": []}
+        for item in self.gold:
+            result = self.run_query(config, item["question"], stores, reranker)
+            for key in timings:
+                timings[key].append(result[key])
+
+            relevant_by_source = {source: set(ids) for source, ids in item["relevant"].items() if ids}
+            ranked = {
+                source: [doc.id for doc in result["documents"] if doc.source.value == source]
+                for source in relevant_by_source
+            }
+            ranked[ALL_SOURCES] = [f"{doc.source.value}:{doc.id}" for doc in result["documents"]]
+            relevant_by_source[ALL_SOURCES] = {
+                f"{source}:{doc_id}" for source, ids in item["relevant"].items() for doc_id in ids
+            }
+
+            for source, relevant in relevant_by_source.items():
+                metrics = scores.setdefault(source, {"recall_at_k": [], "mrr": [], "ndcg_at_k": []})
+                metrics["recall_at_k"].append(recall_at_k(ranked[source], relevant, config.top_k))
+                metrics["mrr"].append(reciprocal_rank(ranked[source], relevant))
+                metrics["ndcg_at_k"].append(ndcg_at_k(ranked[source], relevant, config.top_k))
+
+        latency = percentiles(timings["total_ms"])
+        latency_fields = {
+            "latency_p50_ms": latency["p50_ms"],
+            "latency_p95_ms": latency["p95_ms"],
+            "retrieval_p50_ms": percentiles(timings["retrieval_ms"])["p50_ms"],
+            "rerank_p50_ms": percentiles(timings["rerank_ms"])["p50_ms"],
+            "refine_p50_ms": percentiles(timings["refine_ms"])["p50_ms"],
+        }
+        return [
+            {
+                **config.to_dict(),
+                "source": source,
+                "queries": len(metrics["mrr"]),
+                **{name: sum(values) / len(values) for name, values in metrics.items()},
+                **latency_fields,
+            }
+            for source, metrics in sorted(scores.items())
+        ]
+
+
+def fastest_meeting_bar(rows: list[dict], min_recall: float) -> dict | None:
+    """Overall row with the lowest p50 latency among those with recall_at_k >= min_recall."""
+    passing = [r for r in rows if r["source"] == ALL_SOURCES and r["recall_at_k"] >= min_recall]
+    return min(passing, key=lambda r: r["latency_p50_ms"], default=None)
+
+
+def write_csv(rows: list[dict], path: str | Path) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def log_to_mlflow(rows: list[dict], csv_path: str, params: dict, best: dict | None) -> None:
+    """Log the results table, CSV and best configuration as an MLflow run."""
+    try:
+        import mlflow
+    except ImportError:
+        print("MLflow not installed; skipping MLflow logging")
+        return
+
+    settings = get_settings()
+    mlflow.set_tracking_uri(settings.mlflow_tracking_uri)
+    mlflow.set_experiment(settings.mlflow_experiment_name)
+    with mlflow.start_run(run_name="retrieval-eval"):
+        mlflow.log_params({k: json.dumps(v) if isinstance(v, list) else v for k, v in params.items()})
+        mlflow.log_table(data={field: [row[field] for row in rows] for field in CSV_FIELDS}, artifact_file="retrieval_eval.json")
+        mlflow.log_artifact(csv_path)
+        if best:
+            mlflow.log_params({f"best_{k}": best[k] for k in ("embedder", "top_k", "reranking_mode", "refinement_mode")})
+            mlflow.log_metrics({f"best_{k}": best[k] for k in ("recall_at_k", "mrr", "ndcg_at_k", "latency_p50_ms")})
+
+
+def main():
+    """CLI entry point."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Evaluate retrieval quality and speed over a configuration grid")
+    parser.add_argument("--gold-file", help="Gold queries (JSON list or JSONL); default: bundled labelled queries")
+    parser.add_argument("--csv-file", help="NTSB CSV export to add to the sample incidents")
+    parser.add_argument("--limit", type=int, help="Maximum incidents read from --csv-file")
+    parser.add_argument("--embedders", nargs="+", default=[settings.embedding_model])
+    parser.add_argument("--top-k", type=int, nargs="+", default=[5, 10])
+    parser.add_argument("--reranking-modes", nargs="+", default=["none", "cross_encoder"],
+                        choices=[m.value for m in RerankingMode])
+    parser.add_argument("--refinement-modes", nargs="+", default=["none", "local_filter"],
+                        choices=[m.value for m in RefinementMode])
+    parser.add_argument("--min-recall", type=float, help="Report the fastest configuration with overall recall >= this")
+    parser.add_argument("--output", default="retrieval_eval.csv", help="CSV output path")
+    parser.add_argument("--mlflow", action="store_true", help="Log results to MLflow")
+    args = parser.parse_args()
+
+    evaluator = RetrievalEvaluator(load_source_corpus(args.csv_file, limit=args.limit), load_gold_set(args.gold_file))
+    grid = [
+        EvalConfig(embedder, top_k, RerankingMode(reranking), RefinementMode(refinement))
+        for embedder, top_k, reranking, refinement in itertools.product(
+            args.embedders, args.top_k, args.reranking_modes, args.refinement_modes
+        )
+    ]
+
+    rows = []
+    print(f"{'embedder':<28}{'k':>4}{'rerank':>15}{'refine':>14}{'recall':>8}{'mrr':>7}{'ndcg':>7}{'p50 ms':>9}")
+    for config in grid:
+        config_rows = evaluator.evaluate(config)
+        rows.extend(config_rows)
+        overall = next(r for r in config_rows if r["source"] == ALL_SOURCES)
+        print(
+            f"{config.embedder[-28:]:<28}{config.top_k:>4}{config.reranking_mode.value:>15}"
+            f"{config.refinement_mode.value:>14}{overall['recall_at_k']:>8.3f}{overall['mrr']:>7.3f}"
+            f"{overall['ndcg_at_k']:>7.3f}{overall['latency_p50_ms']:>9.1f}"
+        )
+
+    write_csv(rows, args.output)
+    print(f"\nResults written to {args.output}")
+
+    best = None
+    if args.min_recall is not None:
+        best = fastest_meeting_bar(rows, args.min_recall)
+        if best:
+            print(
+                f"Fastest configuration with recall@k >= {args.min_recall}: "
+                f"embedder={best['embedder']} top_k={best['top_k']} reranking={best['reranking_mode']} "
+                f"refinement={best['refinement_mode']} (p50 {best['latency_p50_ms']:.1f}ms)"
+            )
+        else:
+            print(f"No configuration reached recall@k >= {args.min_recall}")
+
+    if args.mlflow:
+        log_to_mlflow(rows, args.output, vars(args), best)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# fakes.py
+"""In-process stand-ins for the LLM provider and Qdrant.
+
+Latency is sampled from a log-normal distribution per call, so pipeline
+benchmarks measure the pipeline's own overhead and its behaviour under
+realistic (and configurable) provider latency without network access,
+API keys or a vector database.
+
+- FakeLLMClient answers each prompt type with a well-formed response;
+  intent classification uses the labelled intent of the question
+- FakeVectorStore ranks an in-memory corpus by term overlap; filters are
+  accepted but not applied and no embedding model is run
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+from agentic_rag.llm import LLMClient, TokenUsage
+from agentic_rag.models import Document, SourceType
+from agentic_rag.orchestration.constraint_validator import EXTRACTION_SYSTEM_PROMPT
+from agentic_rag.orchestration.context_evaluator import EVALUATE_SYSTEM_PROMPT
+from agentic_rag.orchestration.intent_classifier import INTENT_SYSTEM_PROMPT
+from agentic_rag.generation.prompts import GENERATION_SYSTEM_PROMPT, TRADITIONAL_RAG_SYSTEM_PROMPT
+from agentic_rag.refinement.deduplicator import DEDUP_SYSTEM_PROMPT
+from agentic_rag.refinement.filter import FILTER_SYSTEM_PROMPT
+from agentic_rag.refinement.pruner import PRUNE_SYSTEM_PROMPT
+from agentic_rag.refinement.synthesizer import SYNTHESIZE_SYSTEM_PROMPT
+from agentic_rag.retrieval import IncidentRetriever, RegulationRetriever, NewsRetriever
+
+# Rough characters per token for reported usage
+CHARS_PER_TOKEN = 4
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class LatencyDistribution:
+    """Log-normal latency: median_ms with spread sigma (0 gives a constant)."""
+    median_ms: float
+    sigma: float = 0.5
+
+    def sample_ms(self, rng: random.Random | None = None) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        if self.sigma <= 0:
+            return self.median_ms
+        return (rng or random).lognormvariate(math.log(self.median_ms), self.sigma)
+
+
+class FakeLLMClient(LLMClient):
+    """LLM client returning canned, well-formed responses after a sampled delay."""
+
+    def __init__(
+        self,
+        labels: dict[str, str] | None = None,
+        latency: LatencyDistribution | None = None,
+        generation_latency: LatencyDistribution | None = None,
+        generation_models: set[str] | None = None,
+        seed: int | None = None,
+    ):
+        """
+        Args:
+            labels: Question -> intent value for intent classification
+            latency: Latency of refinement-model calls (intent, evaluation, refinement)
+            generation_latency: Latency of calls to a generation model
+            generation_models: Models whose calls use generation_latency
+            seed: Seed for latency sampling
+        """
+        self.labels = labels or {}
+        self.latency = latency or LatencyDistribution(400)
+        self.generation_latency = generation_latency or LatencyDistribution(2000)
+        self.generation_models = generation_models or set()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._responders = {
+            INTENT_SYSTEM_PROMPT: self._intent,
+            EXTRACTION_SYSTEM_PROMPT: lambda user: json.dumps({"keywords": []}),
+            EVALUATE_SYSTEM_PROMPT: lambda user: json.dumps({"is_sufficient": True, "confidence": "high"}),
+            DEDUP_SYSTEM_PROMPT: lambda user: json.dumps({"keep": [], "drop": []}),
+            PRUNE_SYSTEM_PROMPT: lambda user: json.dumps({"keep": [], "drop": []}),
+            FILTER_SYSTEM_PROMPT: lambda user: json.dumps([7] * 50),  # Trimmed to the document count
+            SYNTHESIZE_SYSTEM_PROMPT: lambda user: user[-2000:],
+            GENERATION_SYSTEM_PROMPT: self._structured_answer,
+            TRADITIONAL_RAG_SYSTEM_PROMPT: lambda user: "Benchmark answer. " * 40,
+        }
+
+    def _intent(self, user: str) -> str:
+        intent = next((label for question, label in self.labels.items() if question in user), "factual")
+        return json.dumps({"intent": intent, "confidence": "high", "suggested_refinement": "dedup"})
+
+    @staticmethod
+    def _structured_answer(user: str) -> str:
+        return json.dumps({
+            "summary": "Benchmark summary answering the question from the retrieved context.",
+            "key_findings": [
+                {"finding": f"Finding {i}", "source": "incidents", "confidence": "medium"} for i in range(3)
+            ],
+            "regulatory_context": [{"regulation": "14 CFR 91.103", "relevance": "Preflight action"}],
+            "causal_chain": ["Step 1", "Step 2"],
+            "caveats": ["Generated by the benchmark fake LLM"],
+        })
+
+    def chat(
+        self,
+        messages: list[dict],
+        model: str,
+        temperature: float = 0,
+        json_output: bool = False,
+        max_tokens: int = 4096,
+    ) -> str:
+        system = messages[0]["content"] if messages[0]["role"] == "system" else ""
+        user = messages[-1]["content"]
+        responder = self._responders.get(system, lambda user: "{}")
+        response = responder(user)
+
+        latency = self.generation_latency if model in self.generation_models else self.latency
+        with self._rng_lock:
+            latency_ms = latency.sample_ms(self._rng)
+        time.sleep(latency_ms / 1000)
+
+        self._set_usage(TokenUsage(
+            input_tokens=(len(system) + len(user)) // CHARS_PER_TOKEN,
+            output_tokens=len(response) // CHARS_PER_TOKEN,
+        ))
+        return response
+
+
+class FakeVectorStore:
+    """In-memory stand-in for VectorStore: term-overlap ranking after a sampled delay."""
+
+    def __init__(
+        self,
+        source_type: SourceType,
+        documents: list[dict],
+        latency: LatencyDistribution | None = None,
+        seed: int | None = None,
+    ):
+        self.source_type = source_type
+        self.latency = latency or LatencyDistribution(20)
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._documents = [
+            (doc, set(_WORD_RE.findall(doc["text"].lower())))
+            for doc in documents
+        ]
+
+    def search(self, query: str, top_k: int = 10, filters=None) -> list[Document]:
+        with self._rng_lock:
+            latency_ms = self.latency.sample_ms(self._rng)
+        time.sleep(latency_ms / 1000)
+
+        terms = set(_WORD_RE.findall(query.lower()))
+        scored = sorted(
+            ((len(terms & words) / (len(terms) or 1), doc) for doc, words in self._documents),
+            key=lambda pair: pair[0],
+            reverse=True,
+        )
+        return [
+            Document(
+                id=doc["id"],
+                text=doc["text"],
+                source=self.source_type,
+                metadata=doc.get("metadata", {}),
+                score=score,
+            )
+            for score, doc in scored[:top_k]
+        ]
+
+    def hybrid_search(self, query: str, header_filters=None, top_k: int = 10) -> list[Document]:
+        return self.search(query, top_k=top_k)
+
+
+def build_fake_retrievers(
+    corpus: dict[SourceType, list[dict]],
+    latency: LatencyDistribution,
+    seed: int | None = None,
+) -> dict:
+    """Retrievers per source backed by FakeVectorStore."""
+    retriever_classes = {
+        SourceType.INCIDENTS: IncidentRetriever,
+        SourceType.REGULATIONS: RegulationRetriever,
+        SourceType.NEWS: NewsRetriever,
+    }
+    return {
+        source: retriever_class(store=FakeVectorStore(source, corpus.get(source, []), latency, seed))
+        for source, retriever_class in retriever_classes.items()
+    }
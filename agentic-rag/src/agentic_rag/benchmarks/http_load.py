@@ -0,0 +1,202 @@
+# http_load.py
+"""
+HTTP load test: find the concurrency at which the API saturates.
+
+Drives the FastAPI app over HTTP with closed-loop clients at increasing
+concurrency levels (default 1, 2, 4, ... 64). Each level sends the
+labelled queries round-robin and reports throughput, p50/p95/p99 latency
+and errors. The saturation point is the last level whose throughput grew
+by at least --min-gain over the previous one without errors; past it,
+extra concurrency only adds queueing delay.
+
+Targets a running API (--url), or starts the app in process with the fake
+LLM and Qdrant from fakes.py (--serve-fakes) so the measurement isolates
+the app itself: event loop, middleware, worker threads and serialization.
+
+Usage:
+    python -m agentic_rag.benchmarks.http_load --url http://localhost:8888
+    python -m agentic_rag.benchmarks.http_load --serve-fakes --llm-ms 300 --generation-ms 1500
+    python -m agentic_rag.benchmarks.http_load --serve-fakes --endpoint /api/query/baseline --levels 1 4 16 64
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import threading
+import time
+
+import httpx
+
+from .corpus import LABELLED_QUERIES
+from .pipeline import percentiles
+
+DEFAULT_LEVELS = [1, 2, 4, 8, 16, 32, 64]
+
+
+def _serve_fakes(args: argparse.Namespace) -> tuple[str, object]:
+    """Start the app in a background thread with fake-backed pipelines; returns (url, server)."""
+    import uvicorn
+
+    from .pipeline import PipelineBenchmark
+
+    bench = PipelineBenchmark(args)
+    # The route module builds its default pipelines at import (loading the
+    # embedding model once); replace them before serving
+    from agentic_rag.endpoints.app import app
+    from agentic_rag.endpoints.routes import query
+
+    query.orchestrator = bench.orchestrator
+    query.traditional_rag = bench.traditional
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+    threading.Thread(target=server.run, name="benchmark-api", daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{args.port}", server
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    url: str,
+    payloads: list[dict],
+    concurrency: int,
+    requests: int,
+) -> dict:
+    """Send `requests` requests from `concurrency` closed-loop clients."""
+    source = itertools.cycle(payloads)
+    remaining = requests
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            payload = next(source)
+            start = time.perf_counter()
+            try:
+                response = await client.post(url, json=payload)
+                key = None if response.status_code == 200 else f"HTTP {response.status_code}"
+            except httpx.HTTPError as e:
+                key = type(e).__name__
+            if key is None:
+                latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                errors[key] = errors.get(key, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall_s = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "wall_s": wall_s,
+        "throughput_rps": len(latencies) / wall_s if wall_s else 0.0,
+        "latency": percentiles(latencies),
+    }
+
+
+def find_saturation(levels: list[dict], min_gain: float) -> int | None:
+    """Last concurrency level whose throughput still grew by min_gain, error-free."""
+    saturation = None
+    previous = None
+    for level in levels:
+        if level["errors"]:
+            break
+        if previous is not None and level["throughput_rps"] < previous["throughput_rps"] * (1 + min_gain):
+            break
+        saturation = level["concurrency"]
+        previous = level
+    return saturation
+
+
+async def run(args: argparse.Namespace, base_url: str) -> dict:
+    url = f"{base_url.rstrip('/')}{args.endpoint}"
+    if args.endpoint.endswith("/baseline"):
+        payloads = [{"question": item["question"], "top_k": args.top_k} for item in LABELLED_QUERIES]
+    else:
+        payloads = [
+            {
+                "question": item["question"],
+                "top_k": args.top_k,
+                "refinement_mode": args.refinement_mode,
+                "include_trace": False,
+            }
+            for item in LABELLED_QUERIES
+        ]
+
+    levels = []
+    limits = httpx.Limits(max_connections=max(args.levels), max_keepalive_connections=max(args.levels))
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        print(f"\n{url}")
+        print(f"  {'concurrency':>11}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'errors':>8}")
+        for concurrency in args.levels:
+            requests = max(args.requests_per_level, concurrency * 2)
+            level = await run_level(client, url, payloads, concurrency, requests)
+            levels.append(level)
+            lat = level["latency"]
+            error_count = sum(level["errors"].values())
+            if lat.get("count"):
+                print(
+                    f"  {concurrency:>11}{level['throughput_rps']:>9.2f}{lat['p50_ms']:>9.0f}"
+                    f"{lat['p95_ms']:>9.0f}{lat['p99_ms']:>9.0f}{error_count:>8}"
+                )
+            else:
+                print(f"  {concurrency:>11}  all requests failed: {level['errors']}")
+            if error_count > requests // 2:
+                print("  Stopping: most requests failed")
+                break
+
+    saturation = find_saturation(levels, args.min_gain)
+    print(f"\nSaturation point: concurrency {saturation}" if saturation else "\nSaturation point: not reached")
+    return {"url": url, "levels": levels, "saturation_concurrency": saturation}
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Find the API's saturation point over HTTP")
+    parser.add_argument("--url", default="http://localhost:8888", help="Base URL of a running API")
+    parser.add_argument("--serve-fakes", action="store_true", help="Start the app in process with fake backends")
+    parser.add_argument("--port", type=int, default=8899, help="Port for --serve-fakes")
+    parser.add_argument("--endpoint", default="/api/query", help="/api/query or /api/query/baseline")
+    parser.add_argument("--levels", type=int, nargs="+", default=DEFAULT_LEVELS)
+    parser.add_argument("--requests-per-level", type=int, default=40)
+    parser.add_argument("--min-gain", type=float, default=0.10, help="Throughput gain that counts as scaling")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--refinement-mode", default="dedup")
+    # Fake backend latencies (--serve-fakes), as in benchmarks.pipeline
+    parser.add_argument("--reranking-mode", default="none")
+    parser.add_argument("--llm-ms", type=float, default=400)
+    parser.add_argument("--generation-ms", type=float, default=2000)
+    parser.add_argument("--qdrant-ms", type=float, default=20)
+    parser.add_argument("--sigma", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv-file")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--mlflow", action="store_true")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if args.serve_fakes:
+        base_url, server = _serve_fakes(args)
+
+    try:
+        report = asyncio.run(run(args, base_url))
+    finally:
+        if server is not None:
+            server.should_exit = True
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+# pipeline.py
+"""
+End-to-end latency and throughput of the agentic and traditional pipelines.
+
+Replays the labelled query set against Orchestrator and TraditionalRAG in
+process, with the LLM provider and Qdrant replaced by fakes with log-normal
+latency (see fakes.py). Reports per pipeline and concurrency level:
+- throughput (queries/s) at that fixed concurrency
+- end-to-end p50/p95/p99 and CPU time per query
+- p50/p95/p99 per pipeline stage and per LLM call step
+- with --memory: peak Python allocation per query (sequential tracemalloc pass)
+
+Usage:
+    python -m agentic_rag.benchmarks.pipeline
+    python -m agentic_rag.benchmarks.pipeline --concurrency 1 4 16 --llm-ms 300 --generation-ms 1500
+    python -m agentic_rag.benchmarks.pipeline --pipelines agentic --refinement-mode filter --memory
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import resource
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from agentic_rag.config import get_settings
+from agentic_rag.llm import set_llm_client
+from agentic_rag.models import QueryRequest, RefinementMode, RerankingMode
+from agentic_rag.orchestration import Orchestrator
+from agentic_rag.pipelines.traditional_rag import TraditionalRAG
+from agentic_rag.tracing.mlflow_tracer import get_mlflow_tracer
+
+from .corpus import LABELLED_QUERIES, load_source_corpus
+from .fakes import FakeLLMClient, LatencyDistribution, build_fake_retrievers
+
+PIPELINES = ["agentic", "traditional"]
+
+
+@dataclass
+class QueryRecord:
+    """Measurements of one replayed query."""
+    duration_ms: float
+    cpu_ms: float
+    stages: dict[str, float] = field(default_factory=dict)  # Stage name -> ms (summed over iterations)
+    llm_calls: dict[str, float] = field(default_factory=dict)  # LLM call step -> ms
+    error: str | None = None
+
+
+def percentiles(values: list[float]) -> dict:
+    """Nearest-rank p50/p95/p99 and mean."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def rank(q: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+    return {
+        "count": len(ordered),
+        "p50_ms": rank(0.50),
+        "p95_ms": rank(0.95),
+        "p99_ms": rank(0.99),
+        "mean_ms": sum(ordered) / len(ordered),
+    }
+
+
+def _stage_name(step_name: str) -> str:
+    """Merge per-iteration steps: "Retrieval (iteration 2)" -> "Retrieval"."""
+    return re.sub(r" \(iteration \d+\)$", "", step_name)
+
+
+class PipelineBenchmark:
+    """Runs labelled queries through the pipelines with fake backends."""
+
+    def __init__(self, args: argparse.Namespace):
+        settings = get_settings()
+        set_llm_client(FakeLLMClient(
+            labels={item["question"]: item["intent"] for item in LABELLED_QUERIES},
+            latency=LatencyDistribution(args.llm_ms, args.sigma),
+            generation_latency=LatencyDistribution(args.generation_ms, args.sigma),
+            generation_models={settings.generation_model},
+            seed=args.seed,
+        ))
+        if not args.mlflow:
+            get_mlflow_tracer().enabled = False
+
+        retrievers = build_fake_retrievers(
+            load_source_corpus(args.csv_file, limit=args.limit),
+            LatencyDistribution(args.qdrant_ms, args.sigma),
+            seed=args.seed,
+        )
+        # Components take the LLM client when constructed, so build them after set_llm_client
+        self.orchestrator = Orchestrator(retrievers=retrievers)
+        self.traditional = TraditionalRAG(retrievers=retrievers)
+        self.refinement_mode = RefinementMode(args.refinement_mode)
+        self.reranking_mode = RerankingMode(args.reranking_mode)
+        self.top_k = args.top_k
+
+    def run_query(self, pipeline: str, question: str) -> QueryRecord:
+        """Run one query in the calling thread (as the API's worker threads do)."""
+        start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            if pipeline == "agentic":
+                response = asyncio.run(self.orchestrator.query(QueryRequest(
+                    question=question,
+                    refinement_mode=self.refinement_mode,
+                    reranking_mode=self.reranking_mode,
+                    top_k=self.top_k,
+                    include_trace=True,
+                )))
+                trace = response.trace
+            else:
+                _, _, trace = asyncio.run(self.traditional.query(question, top_k=self.top_k, include_trace=True))
+        except Exception as e:
+            return QueryRecord(
+                duration_ms=(time.perf_counter() - start) * 1000,
+                cpu_ms=(time.thread_time() - cpu_start) * 1000,
+                error=str(e),
+            )
+
+        record = QueryRecord(
+            duration_ms=(time.perf_counter() - start) * 1000,
+            cpu_ms=(time.thread_time() - cpu_start) * 1000,
+        )
+        for step in trace.steps:
+            name = _stage_name(step["name"])
+            record.stages[name] = record.stages.get(name, 0.0) + (step.get("duration_ms") or 0.0)
+        for call in trace.llm_calls:
+            if call.duration_ms is not None:
+                record.llm_calls[call.step] = record.llm_calls.get(call.step, 0.0) + call.duration_ms
+        return record
+
+    def run_level(self, pipeline: str, questions: list[str], concurrency: int) -> dict:
+        """Replay all questions with `concurrency` queries in flight."""
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            records = list(pool.map(lambda q: self.run_query(pipeline, q), questions))
+        wall_s = time.perf_counter() - start
+
+        ok = [r for r in records if r.error is None]
+        stages, llm_calls = defaultdict(list), defaultdict(list)
+        for record in ok:
+            for name, ms in record.stages.items():
+                stages[name].append(ms)
+            for step, ms in record.llm_calls.items():
+                llm_calls[step].append(ms)
+
+        return {
+            "concurrency": concurrency,
+            "queries": len(records),
+            "errors": len(records) - len(ok),
+            "first_error": next((r.error for r in records if r.error), None),
+            "wall_s": wall_s,
+            "throughput_qps": len(ok) / wall_s if wall_s else 0.0,
+            "latency": percentiles([r.duration_ms for r in ok]),
+            "cpu": percentiles([r.cpu_ms for r in ok]),
+            "stages": {name: percentiles(values) for name, values in stages.items()},
+            "llm_calls": {step: percentiles(values) for step, values in llm_calls.items()},
+        }
+
+    def run_memory(self, pipeline: str, questions: list[str]) -> dict:
+        """Peak Python allocation per query, measured sequentially under tracemalloc."""
+        peaks = []
+        tracemalloc.start()
+        try:
+            for question in questions:
+                baseline = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                self.run_query(pipeline, question)
+                peaks.append((tracemalloc.get_traced_memory()[1] - baseline) / 1024)
+        finally:
+            tracemalloc.stop()
+        summary = percentiles(peaks)
+        # Same shape as the latency summaries, but in KiB
+        return {k.replace("_ms", "_kib"): v for k, v in summary.items()}
+
+
+def _print_level(result: dict) -> None:
+    lat, cpu = result["latency"], result["cpu"]
+    if not lat.get("count"):
+        print(f"  {result['concurrency']:>11}  all {result['queries']} queries failed: {result['first_error']}")
+        return
+    print(
+        f"  {result['concurrency']:>11}{result['throughput_qps']:>9.2f}"
+        f"{lat['p50_ms']:>9.0f}{lat['p95_ms']:>9.0f}{lat['p99_ms']:>9.0f}"
+        f"{cpu['mean_ms']:>10.1f}{result['errors']:>8}"
+    )
+
+
+def _print_breakdown(title: str, summaries: dict[str, dict]) -> None:
+    print(f"  {title:<32}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, s in summaries.items():
+        print(f"  {name:<32}{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}{s['p99_ms']:>9.1f}")
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark agentic and traditional pipeline latency")
+    parser.add_argument("--pipelines", nargs="+", default=PIPELINES, choices=PIPELINES)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--repeats", type=int, default=3, help="Passes over the labelled query set per level")
+    parser.add_argument("--refinement-mode", default="dedup", choices=[m.value for m in RefinementMode])
+    parser.add_argument("--reranking-mode", default="none", choices=[m.value for m in RerankingMode])
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--llm-ms", type=float, default=400, help="Median latency of refinement-model calls")
+    parser.add_argument("--generation-ms", type=float, default=2000, help="Median latency of generation calls")
+    parser.add_argument("--qdrant-ms", type=float, default=20, help="Median latency of vector searches")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Log-normal spread of all latencies (0: constant)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv-file", help="NTSB CSV export to add to the sample incidents")
+    parser.add_argument("--limit", type=int, help="Maximum incidents read from --csv-file")
+    parser.add_argument("--memory", action="store_true", help="Also measure peak allocation per query")
+    parser.add_argument("--mlflow", action="store_true", help="Keep MLflow tracing enabled")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    bench = PipelineBenchmark(args)
+    questions = [item["question"] for item in LABELLED_QUERIES] * args.repeats
+
+    report = {"config": vars(args), "pipelines": {}}
+    for pipeline in args.pipelines:
+        bench.run_query(pipeline, questions[0])  # Warm up lazy loads (tokenizers, clients)
+
+        print(f"\n{pipeline}  llm={args.llm_ms:.0f}ms generation={args.generation_ms:.0f}ms "
+              f"qdrant={args.qdrant_ms:.0f}ms sigma={args.sigma}")
+        print(f"  {'concurrency':>11}{'q/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'cpu ms':>10}{'errors':>8}")
+        levels = []
+        for concurrency in args.concurrency:
+            result = bench.run_level(pipeline, questions, concurrency)
+            levels.append(result)
+            _print_level(result)
+
+        # Stage breakdown at the lowest concurrency, where queries don't contend
+        print()
+        _print_breakdown("stage (ms)", levels[0]["stages"])
+        if levels[0]["llm_calls"]:
+            _print_breakdown("llm call (ms)", levels[0]["llm_calls"])
+
+        report["pipelines"][pipeline] = {"levels": levels}
+        if args.memory:
+            memory = bench.run_memory(pipeline, questions[:len(LABELLED_QUERIES)])
+            report["pipelines"][pipeline]["memory"] = memory
+            print(f"  peak allocation per query: p50 {memory['p50_kib']:.0f} KiB, p95 {memory['p95_kib']:.0f} KiB")
+
+    # ru_maxrss is KiB on Linux
+    report["max_rss_kib"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"\nProcess max RSS: {report['max_rss_kib'] / 1024:.0f} MiB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# quantization.py
+"""
+Measure float16 / int8 vector storage against float32.
+
+For each precision reports vector memory, REST upsert payload size, search
+latency and recall@k relative to exact float32 search. The offline pass
+simulates Qdrant's storage in NumPy; --qdrant repeats the comparison against
+a live Qdrant using VectorStore with each vector_precision.
+
+Usage:
+    # Bundled sample corpus, offline only
+    python -m agentic_rag.benchmarks.quantization
+
+    # NTSB export, plus live Qdrant collections (created and dropped)
+    python -m agentic_rag.benchmarks.quantization --csv-file ./ntsb_data.csv --qdrant
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import numpy as np
+
+from agentic_rag.config import get_settings
+from agentic_rag.indexers.embeddings import get_embedder
+from agentic_rag.models import SourceType
+
+from .corpus import load_corpus, load_queries
+
+
+PRECISIONS = ["float32", "float16", "int8"]
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def _top_k(queries: np.ndarray, vectors: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ vectors.T
+    k = min(k, vectors.shape[0])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(scores, top, axis=1).argsort(axis=1)[:, ::-1]
+    return np.take_along_axis(top, order, axis=1)
+
+
+def _scalar_quantize(vectors: np.ndarray, quantile: float = 0.99) -> np.ndarray:
+    """Int8 scalar quantization as done by Qdrant, returned dequantized for scoring."""
+    tail = (1 - quantile) / 2
+    low, high = np.quantile(vectors, [tail, 1 - tail])
+    scale = (high - low) / 255
+    codes = np.round((np.clip(vectors, low, high) - low) / scale).astype(np.uint8)
+    return codes.astype(np.float32) * scale + low
+
+
+def _recall(found: np.ndarray, expected: np.ndarray) -> float:
+    hits = [len(set(f) & set(e)) / len(e) for f, e in zip(found.tolist(), expected.tolist())]
+    return float(np.mean(hits))
+
+
+def _timed_search(queries: np.ndarray, search) -> tuple[np.ndarray, list[float]]:
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(search(query[None, :])[0])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(results), latencies
+
+
+def benchmark_offline(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    top_k: int,
+    oversampling: float,
+) -> dict[str, dict]:
+    """Compare precisions with brute-force NumPy search."""
+    dim = vectors.shape[1]
+    exact, exact_latencies = _timed_search(queries, lambda q: _top_k(q, vectors, top_k))
+
+    float16 = vectors.astype(np.float16).astype(np.float32)
+    int8 = _scalar_quantize(vectors)
+    candidates = max(top_k, int(top_k * oversampling))
+
+    def int8_rescored(q: np.ndarray) -> np.ndarray:
+        shortlist = _top_k(q, int8, candidates)[0]
+        rescored = _top_k(q, vectors[shortlist], top_k)[0]
+        return shortlist[rescored][None, :]
+
+    sample = vectors[: min(len(vectors), 100)]
+    payload = {
+        "float32": len(json.dumps(sample.tolist())) / len(sample),
+        "float16": len(json.dumps(sample.astype(np.float16).tolist())) / len(sample),
+    }
+    # int8 collections still receive float32 vectors; Qdrant quantizes server-side
+    payload["int8"] = payload["float32"]
+
+    results = {
+        "float32": {"latencies": exact_latencies, "recall": 1.0, "ram_bytes": 4 * dim, "disk_bytes": 0},
+    }
+    found, latencies = _timed_search(queries, lambda q: _top_k(q, float16, top_k))
+    results["float16"] = {"latencies": latencies, "recall": _recall(found, exact), "ram_bytes": 2 * dim, "disk_bytes": 0}
+    found, latencies = _timed_search(queries, lambda q: _top_k(q, int8, top_k))
+    results["int8 (no rescore)"] = {"latencies": latencies, "recall": _recall(found, exact), "ram_bytes": dim, "disk_bytes": 4 * dim}
+    found, latencies = _timed_search(queries, int8_rescored)
+    results["int8"] = {"latencies": latencies, "recall": _recall(found, exact), "ram_bytes": dim, "disk_bytes": 4 * dim}
+
+    for name, result in results.items():
+        result["payload_bytes"] = payload[name.split(" ")[0]]
+    return results
+
+
+def benchmark_qdrant(documents: list[dict], queries: list[str], top_k: int) -> dict[str, dict]:
+    """Index the corpus once per precision into scratch collections and search them."""
+    from agentic_rag.data.indexers.vector_store import VectorStore
+
+    results, baseline = {}, None
+    for precision in PRECISIONS:
+        store = VectorStore(
+            collection_name=f"bench_quantization_{precision}",
+            source_type=SourceType.INCIDENTS,
+            vector_precision=precision,
+        )
+        store.create_collection(recreate=True)
+        try:
+            start = time.perf_counter()
+            store.index_documents(iter(documents))
+            index_seconds = time.perf_counter() - start
+
+            latencies, found = [], []
+            for query in queries:
+                start = time.perf_counter()
+                hits = store.search(query, top_k=top_k)
+                latencies.append((time.perf_counter() - start) * 1000)
+                found.append([d.id for d in hits])
+
+            if baseline is None:
+                baseline = found
+            recall = float(np.mean([
+                len(set(f) & set(b)) / max(1, len(b)) for f, b in zip(found, baseline)
+            ]))
+            results[precision] = {
+                "latencies": latencies,
+                "recall": recall,
+                "index_seconds": index_seconds,
+                "collection": store.get_collection_info(),
+            }
+        finally:
+            store.client.delete_collection(store.collection_name)
+    return results
+
+
+def _print_table(title: str, results: dict[str, dict]) -> None:
+    print(f"\n{title}")
+    print(f"  {'precision':<20}{'recall@k':>10}{'p50 ms':>10}{'p95 ms':>10}{'RAM B/vec':>12}{'JSON B/vec':>12}")
+    for name, r in results.items():
+        latencies = sorted(r["latencies"])
+        p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+        ram = r.get("ram_bytes")
+        payload = r.get("payload_bytes")
+        print(
+            f"  {name:<20}{r['recall']:>10.3f}{statistics.median(latencies):>10.2f}{p95:>10.2f}"
+            f"{ram if ram is not None else '-':>12}{f'{payload:.0f}' if payload else '-':>12}"
+        )
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark quantized vector storage")
+    parser.add_argument("--csv-file", help="NTSB CSV export to add to the sample corpus")
+    parser.add_argument("--limit", type=int, default=5000, help="Maximum corpus size")
+    parser.add_argument("--queries", type=int, default=50, help="Number of benchmark queries")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--oversampling", type=float, help="int8 oversampling (default: settings)")
+    parser.add_argument("--qdrant", action="store_true", help="Also benchmark against live Qdrant")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    oversampling = args.oversampling or settings.quantization_oversampling
+
+    documents = load_corpus(args.csv_file, args.limit)
+    queries = load_queries(documents, args.queries)
+    print(f"Corpus: {len(documents)} documents, {len(queries)} queries, top_k={args.top_k}")
+
+    embedder = get_embedder(settings.embedder, settings.embedding_model)
+    vectors = _normalize(np.asarray(embedder.embed_batch([d["text"] for d in documents]), dtype=np.float32))
+    query_vectors = _normalize(np.asarray(embedder.embed_batch(queries), dtype=np.float32))
+
+    report = {"offline": benchmark_offline(vectors, query_vectors, args.top_k, oversampling)}
+    _print_table(f"Offline (NumPy, oversampling={oversampling})", report["offline"])
+
+    if args.qdrant:
+        report["qdrant"] = benchmark_qdrant(documents, queries, args.top_k)
+        _print_table(f"Qdrant ({settings.qdrant_url}, recall vs float32 collection)", report["qdrant"])
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
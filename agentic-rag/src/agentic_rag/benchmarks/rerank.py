@@ -0,0 +1,114 @@
+# rerank.py
+"""
+Cross-encoder rerank latency versus candidate count.
+
+For each backend and candidate count (default 20/50/100/200), times a cold
+rerank (empty score cache) and a warm rerank (same query, all cache hits).
+
+Usage:
+    python -m agentic_rag.benchmarks.rerank
+    python -m agentic_rag.benchmarks.rerank --backends torch onnx onnx-int8 --batch-size 64
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from agentic_rag.models import Document, SourceType
+from agentic_rag.reranking.cross_encoder import CrossEncoderScorer
+
+from .corpus import load_corpus, load_queries
+
+
+def _candidates(documents: list[dict], count: int) -> list[Document]:
+    """Build `count` candidate Documents, cycling the corpus with distinct ids."""
+    return [
+        Document(
+            id=f"{documents[i % len(documents)]['id']}-{i}",
+            text=documents[i % len(documents)]["text"],
+            source=SourceType.INCIDENTS,
+        )
+        for i in range(count)
+    ]
+
+
+def benchmark_backend(
+    scorer: CrossEncoderScorer,
+    documents: list[dict],
+    queries: list[str],
+    counts: list[int],
+    repeats: int,
+) -> dict[int, dict]:
+    """Time cold and warm scoring for each candidate count."""
+    scorer.predict([("warmup", documents[0]["text"])])
+
+    results = {}
+    for count in counts:
+        candidates = _candidates(documents, count)
+        cold, warm = [], []
+        for query in queries[:repeats]:
+            scorer.cache.clear()
+            start = time.perf_counter()
+            scorer.score(query, candidates)
+            cold.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            scorer.score(query, candidates)
+            warm.append((time.perf_counter() - start) * 1000)
+
+        results[count] = {
+            "cold_p50_ms": statistics.median(cold),
+            "cold_max_ms": max(cold),
+            "warm_p50_ms": statistics.median(warm),
+            "per_pair_ms": statistics.median(cold) / count,
+        }
+    return results
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark cross-encoder rerank latency")
+    parser.add_argument("--csv-file", help="NTSB CSV export to add to the sample corpus")
+    parser.add_argument("--counts", type=int, nargs="+", default=[20, 50, 100, 200])
+    parser.add_argument("--backends", nargs="+", default=["torch"], choices=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--batch-size", type=int, help="Default: settings.reranker_batch_size")
+    parser.add_argument("--max-length", type=int, help="Default: settings.reranker_max_length")
+    parser.add_argument("--repeats", type=int, default=5, help="Queries per candidate count")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    documents = load_corpus(args.csv_file, limit=max(args.counts))
+    queries = load_queries(documents, max_queries=args.repeats)
+
+    report = {}
+    for backend in args.backends:
+        scorer = CrossEncoderScorer(
+            backend=backend,
+            batch_size=args.batch_size,
+            max_length=args.max_length,
+        )
+        try:
+            results = benchmark_backend(scorer, documents, queries, args.counts, args.repeats)
+        except ImportError as e:
+            print(f"{backend}: skipped ({e})")
+            continue
+
+        report[backend] = {"load_ms": scorer.load_duration_ms, "counts": results}
+        print(f"\n{scorer.model_label}  batch={scorer.batch_size} max_length={scorer.max_length} "
+              f"load={scorer.load_duration_ms:.0f}ms")
+        print(f"  {'candidates':>10}{'cold p50':>11}{'cold max':>11}{'warm p50':>11}{'ms/pair':>10}")
+        for count, r in results.items():
+            print(
+                f"  {count:>10}{r['cold_p50_ms']:>11.1f}{r['cold_max_ms']:>11.1f}"
+                f"{r['warm_p50_ms']:>11.2f}{r['per_pair_ms']:>10.2f}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
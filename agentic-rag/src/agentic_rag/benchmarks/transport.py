@@ -0,0 +1,151 @@
+# transport.py
+"""
+Compare Qdrant transports: Bearer REST wrapper, QdrantClient REST and gRPC.
+
+Upserts random unit vectors into a scratch collection per transport and
+times upsert batches and searches. Runs against any reachable Qdrant, e.g.
+a local container:
+
+    docker run -p 6333:6333 -p 6334:6334 qdrant/qdrant
+
+Usage:
+    python -m agentic_rag.benchmarks.transport --points 5000 --dim 768
+
+With DOMINO_API_PROXY set, the Bearer transports fetch real tokens, so the
+same command measures the Domino reverse-proxy path.
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import Distance, VectorParams
+
+from agentic_rag.config import get_settings
+from agentic_rag.data.indexers.vector_store import BearerAuthQdrantClient, GrpcBearerAuthQdrantClient
+
+
+def _clients(url: str, grpc_port: int, domino: bool) -> dict:
+    clients = {
+        "rest-bearer": BearerAuthQdrantClient(url=url),
+        "rest": QdrantClient(url=url),
+        "grpc": QdrantClient(url=url, prefer_grpc=True, grpc_port=grpc_port),
+    }
+    if domino:
+        clients["grpc-bearer"] = GrpcBearerAuthQdrantClient(url=url, grpc_port=grpc_port)
+    return clients
+
+
+def _summary(latencies: list[float]) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "p50_ms": statistics.median(ordered),
+        "p95_ms": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        "mean_ms": statistics.fmean(ordered),
+    }
+
+
+def benchmark_transport(
+    client,
+    name: str,
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    batch_size: int,
+    top_k: int,
+) -> dict:
+    """Time batched upserts and single-vector searches for one client."""
+    collection = f"bench_transport_{name.replace('-', '_')}"
+    try:
+        client.delete_collection(collection)
+    except Exception:
+        pass
+    client.create_collection(
+        collection_name=collection,
+        vectors_config=VectorParams(size=vectors.shape[1], distance=Distance.COSINE),
+    )
+
+    try:
+        upserts = []
+        for start in range(0, len(vectors), batch_size):
+            batch = vectors[start:start + batch_size]
+            ids = list(range(start, start + len(batch)))
+            began = time.perf_counter()
+            client.upload_collection(
+                collection_name=collection,
+                vectors=batch,
+                payload=[{"n": i} for i in ids],
+                ids=ids,
+                batch_size=len(ids),
+                wait=True,
+            )
+            upserts.append((time.perf_counter() - began) * 1000)
+
+        searches = []
+        for query in queries:
+            began = time.perf_counter()
+            client.query_points(collection_name=collection, query=query, limit=top_k)
+            searches.append((time.perf_counter() - began) * 1000)
+    finally:
+        client.delete_collection(collection)
+
+    upsert_seconds = sum(upserts) / 1000
+    return {
+        "upsert": {**_summary(upserts), "points_per_s": len(vectors) / upsert_seconds if upsert_seconds else 0.0},
+        "search": _summary(searches),
+    }
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark Qdrant REST vs gRPC transports")
+    parser.add_argument("--qdrant-url", help="Qdrant URL (default: settings.qdrant_url)")
+    parser.add_argument("--grpc-port", type=int, help="gRPC port (default: settings.qdrant_grpc_port)")
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--transports", nargs="+", help="Subset of transports to run")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    url = args.qdrant_url or settings.qdrant_url
+    grpc_port = args.grpc_port or settings.qdrant_grpc_port
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.points, args.dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = vectors[rng.choice(args.points, size=min(args.queries, args.points), replace=False)]
+
+    clients = _clients(url, grpc_port, domino=bool(settings.domino_api_proxy))
+    if args.transports:
+        clients = {k: v for k, v in clients.items() if k in args.transports}
+
+    print(f"Qdrant: {url} (gRPC port {grpc_port}), {args.points} x {args.dim} vectors")
+    print(f"  {'transport':<14}{'upsert p50':>12}{'upsert p95':>12}{'points/s':>11}{'search p50':>12}{'search p95':>12}")
+
+    results = {}
+    for name, client in clients.items():
+        try:
+            r = benchmark_transport(client, name, vectors, queries, args.batch_size, args.top_k)
+        except Exception as e:
+            print(f"  {name:<14}failed: {e}")
+            continue
+        results[name] = r
+        print(
+            f"  {name:<14}{r['upsert']['p50_ms']:>12.1f}{r['upsert']['p95_ms']:>12.1f}"
+            f"{r['upsert']['points_per_s']:>11.0f}{r['search']['p50_ms']:>12.2f}{r['search']['p95_ms']:>12.2f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -33,9 +33,14 @@ class Settings(BaseSettings):
     # Vector DB
     qdrant_url: str = "http://localhost:6333"
     qdrant_api_key: str | None = None
+    # gRPC transport for bulk upserts/searches (vectors sent as packed floats, not JSON)
+    qdrant_prefer_grpc: bool = False
+    qdrant_grpc_port: int = 6334
 
     # Domino API Proxy (for fetching access tokens)
     domino_api_proxy: str | None = None
+    # How long the gRPC client reuses a Domino token (tokens expire after 5 minutes)
+    domino_token_ttl_seconds: int = 60
 
     # Collections
     incidents_collection: str = "ntsb_incidents"
@@ -50,8 +55,32 @@ class Settings(BaseSettings):
     # OpenAI models: text-embedding-3-small, text-embedding-3-large
     embedding_model: str = "BAAI/bge-base-en-v1.5"
 
+    # Vector storage precision
+    # "float32": full-precision vectors (default)
+    # "float16": half-precision vectors stored by Qdrant (half the vector memory)
+    # "int8": scalar-quantized int8 copy in RAM, float32 originals on disk;
+    #         searched with oversampling + full-precision rescoring
+    vector_precision: Literal["float32", "float16", "int8"] = "float32"
+    quantization_oversampling: float = 2.0
+    quantization_rescore: bool = True
+
+    # Chunking of long documents before embedding (see data/loaders/chunker.py)
+    # Opt-in: documents longer than chunk_max_chars (e.g. 1500) are split by
+    # structure (FAR paragraphs, narrative sentences) into overlapping
+    # chunks; 0 disables. Changing it requires re-indexing the collections.
+    # Searches fetch top_k * chunk_search_overfetch chunks and collapse them
+    # back to top_k parent documents.
+    chunk_max_chars: int = 0
+    chunk_overlap_chars: int = 200
+    chunk_search_overfetch: int = 3
+
     # LLM Provider: "openai" or "anthropic"
     llm_provider: Literal["openai", "anthropic"] = "anthropic"
+    # Opt-in: mark static system prompts for Anthropic prompt caching. The
+    # current static prefixes (~60-350 tokens) are below the provider minimum
+    # (1024 tokens; 2048 for Haiku), so this has no effect until they grow.
+    # OpenAI caches prefixes of 1024+ tokens automatically.
+    llm_prompt_caching: bool = False
 
     # LLM Models - set via environment variables or use provider-appropriate defaults
     # OpenAI: gpt-4o, gpt-4o-mini
@@ -59,6 +88,7 @@ class Settings(BaseSettings):
     # Empty string means "use provider default"
     refinement_model: str = ""
     generation_model: str = ""
+    fallback_generation_model: str = ""  # Smaller model used when a deadline is tight
 
     @model_validator(mode="after")
     def set_model_defaults(self) -> "Settings":
@@ -69,9 +99,66 @@ class Settings(BaseSettings):
             object.__setattr__(self, "refinement_model", defaults["refinement"])
         if not self.generation_model:
             object.__setattr__(self, "generation_model", defaults["generation"])
+        if not self.fallback_generation_model:
+            object.__setattr__(self, "fallback_generation_model", defaults["refinement"])
 
         return self
 
+    # Cross-encoder reranking
+    cross_encoder_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    # reranker_backend: "torch" (sentence-transformers), "onnx" (ONNX Runtime),
+    # or "onnx-int8" (ONNX Runtime with the int8-quantized model, CPU)
+    reranker_backend: Literal["torch", "onnx", "onnx-int8"] = "torch"
+    reranker_onnx_file: str = "onnx/model_quint8_avx2.onnx"  # used by onnx-int8
+    reranker_batch_size: int = 32
+    reranker_max_length: int = 512  # Max tokens per query-document pair
+    reranker_cache_size: int = 10000  # (query, doc id) -> score entries; 0 disables
+    # local_filter refinement: logit -> 1-10 calibration, 1 + 9 * sigmoid((logit - center) / scale)
+    local_filter_logit_center: float = 0.0
+    local_filter_logit_scale: float = 2.0
+
+    # Startup warmup: load and exercise models before reporting ready
+    warmup_enabled: bool = True
+    warmup_cross_encoder: bool = True
+    warmup_llm_ping: bool = False  # Send a 1-token request to each LLM model (costs a call)
+
+    # Dedup pre-pass: word-shingle Jaccard similarity thresholds
+    # >= duplicate threshold: dropped without an LLM call
+    # between the two: ambiguous, judged by the LLM
+    dedup_duplicate_threshold: float = 0.8
+    dedup_ambiguous_threshold: float = 0.5
+
+    # Iterative retrieval: cheap sufficiency score in [0, 1]
+    # >= accept: stop without an LLM evaluation; < reject: widen retrieval without one;
+    # in between: ask the LLM evaluator
+    sufficiency_accept_threshold: float = 0.75
+    sufficiency_reject_threshold: float = 0.35
+    # Fraction of skipped evaluations still run through the LLM (result not acted on)
+    # to measure agreement between the cheap score and the LLM evaluator
+    sufficiency_shadow_rate: float = 0.0
+
+    # Generation model routing: small model (fallback_generation_model) for simple
+    # queries, generation_model for everything else
+    model_routing_enabled: bool = True
+    routing_small_intents: list[str] = ["factual", "regulatory"]
+    routing_small_max_context_tokens: int = 2500
+    routing_small_max_constraints: int = 2
+
+    # Request deadlines (X-Request-Deadline-Ms header or QueryRequest.deadline_ms)
+    # Expected stage durations; a stage is degraded when the time left can't
+    # cover it plus the stages after it
+    default_deadline_ms: int | None = None  # None: no deadline unless the request sets one
+    deadline_iteration_ms: float = 4000  # Extra retrieval iteration incl. sufficiency evaluation
+    deadline_reranking_ms: float = 1500  # Cross-encoder reranking
+    deadline_refinement_ms: float = 5000  # LLM refinement (dedup, filter, synthesize, prune)
+    deadline_generation_ms: float = 12000  # Generation with generation_model
+    deadline_fallback_generation_ms: float = 5000  # Generation with fallback_generation_model
+
+    # Token budgets (tiktoken for OpenAI; ~3.5 chars/token estimate for Anthropic)
+    generation_context_budget_tokens: int = 6000  # Document text packed into the generation prompt
+    generation_min_document_tokens: int = 64  # Drop rather than trim a document below this
+    refinement_passage_max_tokens: int = 350  # Per-passage cap in refinement prompts
+
     # Retrieval defaults
     default_top_k: int = 10
     default_refinement_mode: str = "dedup"
@@ -80,6 +167,31 @@ class Settings(BaseSettings):
     mlflow_tracking_uri: str = "http://localhost:5001"
     mlflow_enabled: bool = True
     mlflow_experiment_name: str = "agentic-rag-aviation"
+    # Export runs from a background thread (bounded queue, batched log_batch calls)
+    # instead of blocking requests on MLflow HTTP calls
+    mlflow_async_export: bool = True
+    mlflow_export_queue_size: int = 10000  # Operations beyond this are dropped and counted
+    mlflow_export_flush_interval_s: float = 2.0
+    # Sampling: keep this fraction of queries with full spans (head sampling);
+    # of the rest, export only errors and queries at/over the slow threshold (tail sampling)
+    mlflow_sample_rate: float = 1.0
+    mlflow_slow_request_ms: float = 15000
+    # Payload limits: longer strings are truncated with a sha256 of the full value
+    mlflow_span_max_chars: int = 2000
+    mlflow_artifact_max_chars: int = 8000  # trace.json / answer.json
+    mlflow_redact_fields: list[str] = []  # Keys replaced by a hash, e.g. ["question", "prompt"]
+
+    # Telemetry: Prometheus metrics at /metrics; OTLP span export when an endpoint is set
+    metrics_enabled: bool = True
+    otel_exporter_otlp_endpoint: str | None = None  # e.g. http://otel-collector:4318 (OTLP/HTTP)
+    otel_service_name: str = "agentic-rag"
+
+    # Profiling: opt-in per request (X-Debug-Profile header) or for a sampled fraction
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.0
+    profiling_backend: Literal["cprofile", "pyinstrument"] = "cprofile"
+    profiling_output_dir: Path | None = None  # Also log to the MLflow run when MLflow is enabled
+    profiling_top_n: int = 15  # Hot functions summarized in trace.profile
 
     # Paths
     data_dir: Path = Path(__file__).parent.parent.parent.parent / "data" / "aviation"
@@ -3,10 +3,25 @@
 Vector store abstraction using Qdrant.
 
 Supports hybrid search: metadata filtering + semantic similarity.
+
+Filters are plain dicts evaluated server-side by Qdrant:
+
+    {"aircraft": "Cessna 172"}                       # exact match
+    {"header_l3": {"$contains": "Cessna"}}           # full-text match
+    {"fatal_count": {"$gte": 1}}                     # numeric range
+    {"event_date": {"$gte": "2022-01-01", "$lt": "2023-01-01"}}  # datetime range
+    {"category": {"$in": ["safety", "regulatory"]}}  # match any
+    {"category": {"$ne": "opinion"}}                 # exclusion
+    {"$should": [{...}, {...}], "$must_not": {...}}  # boolean clauses
 """
 
-from typing import Any, Iterator
+import hashlib
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Iterator, Literal
 from urllib.parse import urljoin
+import numpy as np
 import requests
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qdrant_models
@@ -14,7 +29,9 @@ from qdrant_client.http.models import Distance, VectorParams, PointStruct
 
 from agentic_rag.config import get_settings, get_domino_access_token
 from agentic_rag.models import Document, SourceType
-from agentic_rag.indexers.embeddings import get_embedder, Embedder
+from agentic_rag.data.loaders.chunker import Chunker, collapse_chunks
+from agentic_rag.data.loaders.dates import normalize_date
+from agentic_rag.indexers.embeddings import get_shared_embedder, Embedder
 
 
 class BearerAuthQdrantClient:
@@ -78,14 +95,32 @@ class BearerAuthQdrantClient:
             "status": type("Status", (), {"value": info.get("status", "unknown")})(),
         })()
 
-    def create_collection(self, collection_name: str, vectors_config: VectorParams):
+    def create_collection(
+        self,
+        collection_name: str,
+        vectors_config: VectorParams,
+        quantization_config: qdrant_models.ScalarQuantization | None = None,
+    ):
         """Create a collection."""
-        data = {
-            "vectors": {
-                "size": vectors_config.size,
-                "distance": vectors_config.distance.value,
-            }
+        vectors = {
+            "size": vectors_config.size,
+            "distance": vectors_config.distance.value,
         }
+        if vectors_config.datatype:
+            vectors["datatype"] = vectors_config.datatype.value
+        if vectors_config.on_disk is not None:
+            vectors["on_disk"] = vectors_config.on_disk
+
+        data = {"vectors": vectors}
+        if quantization_config:
+            scalar = quantization_config.scalar
+            data["quantization_config"] = {
+                "scalar": {
+                    "type": scalar.type.value,
+                    "quantile": scalar.quantile,
+                    "always_ram": scalar.always_ram,
+                }
+            }
         return self._request("PUT", f"/collections/{collection_name}", data)
 
     def delete_collection(self, collection_name: str):
@@ -106,21 +141,55 @@ class BearerAuthQdrantClient:
         }
         return self._request("PUT", f"/collections/{collection_name}/points", data)
 
+    def delete(self, collection_name: str, points_selector: qdrant_models.FilterSelector, wait: bool = True):
+        """Delete the points matching a filter selector."""
+        data = {"filter": self._convert_filter(points_selector.filter)}
+        return self._request("POST", f"/collections/{collection_name}/points/delete?wait={str(wait).lower()}", data)
+
+    def upload_collection(
+        self,
+        collection_name: str,
+        vectors: np.ndarray,
+        payload: list[dict],
+        ids: list[int],
+        batch_size: int = 64,
+        wait: bool = True,
+    ):
+        """Upload an (n, dim) vector array; rows become JSON lists only here."""
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            data = {
+                "batch": {
+                    "ids": ids[start:end],
+                    "vectors": vectors[start:end].tolist(),
+                    "payloads": payload[start:end],
+                }
+            }
+            self._request("PUT", f"/collections/{collection_name}/points?wait={str(wait).lower()}", data)
+
     def query_points(
         self,
         collection_name: str,
         query: list[float],
         query_filter: qdrant_models.Filter = None,
         limit: int = 10,
+        search_params: qdrant_models.SearchParams | None = None,
     ):
         """Search for similar vectors."""
         data = {
-            "vector": query,
+            "vector": query.tolist() if isinstance(query, np.ndarray) else query,
             "limit": limit,
             "with_payload": True,
         }
         if query_filter:
             data["filter"] = self._convert_filter(query_filter)
+        if search_params and search_params.quantization:
+            data["params"] = {
+                "quantization": {
+                    "rescore": search_params.quantization.rescore,
+                    "oversampling": search_params.quantization.oversampling,
+                }
+            }
 
         result = self._request("POST", f"/collections/{collection_name}/points/search", data)
 
@@ -140,59 +209,266 @@ class BearerAuthQdrantClient:
     def _convert_filter(self, filter_obj: qdrant_models.Filter) -> dict:
         """Convert qdrant filter object to dict for REST API."""
         result = {}
-        if filter_obj.must:
-            result["must"] = []
-            for condition in filter_obj.must:
-                if hasattr(condition, "key"):
-                    cond = {"key": condition.key}
-                    if hasattr(condition, "match"):
-                        if hasattr(condition.match, "value"):
-                            cond["match"] = {"value": condition.match.value}
-                        elif hasattr(condition.match, "text"):
-                            cond["match"] = {"text": condition.match.text}
-                    result["must"].append(cond)
+        for clause in ("must", "should", "must_not"):
+            conditions = getattr(filter_obj, clause, None)
+            if conditions:
+                result[clause] = [self._convert_condition(c) for c in conditions]
         return result
 
+    def _convert_condition(self, condition) -> dict:
+        """Convert a single filter condition (or nested filter) to a dict."""
+        # Nested filter, e.g. a `should` group inside `must_not`
+        if isinstance(condition, qdrant_models.Filter):
+            return self._convert_filter(condition)
+
+        cond = {"key": condition.key}
+        match = getattr(condition, "match", None)
+        if match is not None:
+            if hasattr(match, "value"):
+                cond["match"] = {"value": match.value}
+            elif hasattr(match, "text"):
+                cond["match"] = {"text": match.text}
+            elif hasattr(match, "any"):
+                cond["match"] = {"any": list(match.any)}
+            elif hasattr(match, "except_"):
+                cond["match"] = {"except": list(match.except_)}
+
+        range_ = getattr(condition, "range", None)
+        if range_ is not None:
+            cond["range"] = {
+                op: value.isoformat() if isinstance(value, (datetime, date)) else value
+                for op in ("gt", "gte", "lt", "lte")
+                if (value := getattr(range_, op, None)) is not None
+            }
+        return cond
+
+
+class DominoTokenProvider:
+    """
+    Thread-safe Domino access token cache for gRPC metadata.
+
+    The REST wrapper fetches a token per request; a gRPC channel calls this
+    provider per RPC, so tokens are reused for `ttl_seconds` (well inside
+    the 5 minute validity) instead of adding a proxy round-trip to every call.
+    """
+
+    def __init__(self, ttl_seconds: int = 60):
+        self.ttl_seconds = ttl_seconds
+        self._token = ""
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> str:
+        with self._lock:
+            if not self._token or time.monotonic() - self._fetched_at > self.ttl_seconds:
+                self._token = get_domino_access_token() or ""
+                self._fetched_at = time.monotonic()
+            return self._token
+
+
+class GrpcBearerAuthQdrantClient(QdrantClient):
+    """
+    gRPC Qdrant client for Domino deployments.
+
+    Bearer tokens are injected as `authorization` metadata on every RPC by
+    qdrant-client's auth interceptor, fed by DominoTokenProvider. Being a
+    QdrantClient it returns the native response models, and it adds
+    health_check() so it is a drop-in for BearerAuthQdrantClient.
+    """
+
+    def __init__(self, url: str, grpc_port: int = 6334, token_ttl_seconds: int = 60):
+        super().__init__(
+            url=url,
+            prefer_grpc=True,
+            grpc_port=grpc_port,
+            auth_token_provider=DominoTokenProvider(ttl_seconds=token_ttl_seconds),
+        )
+
+    def health_check(self) -> str:
+        """Check Qdrant health (server title and version)."""
+        info = self.info()
+        return f"{info.title} {info.version}"
+
+
+_RANGE_OPERATORS = {"$gt": "gt", "$gte": "gte", "$lt": "lt", "$lte": "lte"}
+
+
+def _datetime_bound(value: Any) -> datetime | date | None:
+    """
+    A range bound as a date/datetime, or None when it is not one.
+
+    Strings count only if they are ISO datetimes or dates normalize_date
+    understands ("2020-01-05", "01/05/2020"); "1" stays a numeric bound.
+    """
+    if isinstance(value, (datetime, date)):
+        return value
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.strip())
+    except ValueError:
+        pass
+    try:
+        return date.fromisoformat(normalize_date(value) or "")
+    except ValueError:
+        return None
+
+
+def _field_conditions(key: str, value: Any) -> tuple[list, list]:
+    """Translate one `key: value` filter entry to (must, must_not) conditions."""
+    if value is None:
+        return [], []
+    if not isinstance(value, dict):
+        return [
+            qdrant_models.FieldCondition(key=key, match=qdrant_models.MatchValue(value=value))
+        ], []
+
+    must, must_not = [], []
+
+    if "$contains" in value:
+        must.append(
+            qdrant_models.FieldCondition(key=key, match=qdrant_models.MatchText(text=value["$contains"]))
+        )
+    if "$in" in value:
+        must.append(
+            qdrant_models.FieldCondition(key=key, match=qdrant_models.MatchAny(any=list(value["$in"])))
+        )
+    if "$nin" in value:
+        must.append(
+            qdrant_models.FieldCondition(key=key, match=qdrant_models.MatchExcept(**{"except": list(value["$nin"])}))
+        )
+    if "$ne" in value:
+        must_not.append(
+            qdrant_models.FieldCondition(key=key, match=qdrant_models.MatchValue(value=value["$ne"]))
+        )
+
+    bounds = {_RANGE_OPERATORS[op]: v for op, v in value.items() if op in _RANGE_OPERATORS and v is not None}
+    if bounds:
+        dates = {op: _datetime_bound(v) for op, v in bounds.items()}
+        if all(v is not None for v in dates.values()):
+            range_ = qdrant_models.DatetimeRange(**dates)
+        else:
+            range_ = qdrant_models.Range(**bounds)
+        must.append(qdrant_models.FieldCondition(key=key, range=range_))
+
+    return must, must_not
+
+
+def build_qdrant_filter(filters: dict[str, Any] | qdrant_models.Filter) -> qdrant_models.Filter | None:
+    """
+    Build a Qdrant payload filter from a filter dict (see module docstring).
+
+    Args:
+        filters: Mapping of payload keys to values or operator dicts, plus the
+            optional boolean clauses "$should" (list of filter dicts, at least
+            one must match) and "$must_not" (filter dict or list of them).
+            A ready-made qdrant Filter is passed through unchanged.
+
+    Returns:
+        Qdrant Filter, or None if no conditions were produced
+    """
+    if isinstance(filters, qdrant_models.Filter):
+        return filters
+
+    must, should, must_not = [], [], []
+
+    for key, value in filters.items():
+        if key == "$should":
+            should.extend(f for f in (build_qdrant_filter(v) for v in value) if f)
+        elif key == "$must_not":
+            for sub in value if isinstance(value, list) else [value]:
+                sub_filter = build_qdrant_filter(sub)
+                if sub_filter:
+                    must_not.append(sub_filter)
+        else:
+            field_must, field_must_not = _field_conditions(key, value)
+            must.extend(field_must)
+            must_not.extend(field_must_not)
+
+    if not (must or should or must_not):
+        return None
+
+    return qdrant_models.Filter(
+        must=must or None,
+        should=should or None,
+        must_not=must_not or None,
+    )
+
 
 def create_qdrant_client() -> QdrantClient | BearerAuthQdrantClient:
     """
     Create Qdrant client with appropriate authentication.
 
     - If DOMINO_API_PROXY is set, uses BearerAuthQdrantClient for reverse proxy
-      (fetches fresh token per request since tokens expire in 5 minutes)
-    - Otherwise uses standard QdrantClient
+      (fetches fresh token per request since tokens expire in 5 minutes),
+      or GrpcBearerAuthQdrantClient if QDRANT_PREFER_GRPC is set
+    - Otherwise uses standard QdrantClient, over gRPC if QDRANT_PREFER_GRPC is set
     """
     settings = get_settings()
 
     # Check for Domino environment (reverse proxy with Bearer auth)
     if settings.domino_api_proxy:
+        if settings.qdrant_prefer_grpc:
+            return GrpcBearerAuthQdrantClient(
+                url=settings.qdrant_url,
+                grpc_port=settings.qdrant_grpc_port,
+                token_ttl_seconds=settings.domino_token_ttl_seconds,
+            )
         return BearerAuthQdrantClient(url=settings.qdrant_url)
 
     # Standard connection (local or with API key)
     return QdrantClient(
         url=settings.qdrant_url,
         api_key=settings.qdrant_api_key,
+        prefer_grpc=settings.qdrant_prefer_grpc,
+        grpc_port=settings.qdrant_grpc_port,
     )
 
 
+VectorPrecision = Literal["float32", "float16", "int8"]
+
+
 class VectorStore:
-    """Vector store interface using Qdrant."""
+    """
+    Vector store interface using Qdrant.
+
+    Vector precision (settings.vector_precision) controls storage:
+    - float32: full-precision vectors
+    - float16: vectors stored as float16 by Qdrant; embeddings are rounded to
+      float16 before upsert so the stored and sent values match
+    - int8: Qdrant scalar quantization; int8 vectors stay in RAM, float32
+      originals on disk, and searches oversample then rescore at full precision
+
+    With settings.chunk_max_chars set, longer documents are indexed as
+    overlapping chunks (one point each, carrying parent_id and the parent's
+    metadata); search collapses chunk hits back to one Document per parent.
+    """
 
     def __init__(
         self,
         collection_name: str,
         source_type: SourceType,
         embedding_dim: int | None = None,  # Auto-detected from embedder if not provided
+        vector_precision: VectorPrecision | None = None,  # Defaults to settings.vector_precision
+        embedder: Embedder | None = None,  # Defaults to the shared embedder from settings
     ):
         settings = get_settings()
         self.collection_name = collection_name
         self.source_type = source_type
+        self.vector_precision = vector_precision or settings.vector_precision
+        self.quantization_oversampling = settings.quantization_oversampling
+        self.quantization_rescore = settings.quantization_rescore
+        self.chunker = (
+            Chunker(settings.chunk_max_chars, settings.chunk_overlap_chars)
+            if settings.chunk_max_chars > 0 else None
+        )
+        self.chunk_search_overfetch = max(1, settings.chunk_search_overfetch)
 
         # Initialize Qdrant client
         self.client = create_qdrant_client()
 
-        # Initialize embedder (local or openai based on config)
-        self.embedder: Embedder = get_embedder(
+        # Initialize embedder (local or openai based on config), shared across stores
+        self.embedder: Embedder = embedder or get_shared_embedder(
             provider=settings.embedder,
             model_name=settings.embedding_model,
         )
@@ -210,19 +486,57 @@ class VectorStore:
         if not exists:
             self.client.create_collection(
                 collection_name=self.collection_name,
-                vectors_config=VectorParams(
-                    size=self.embedding_dim,
-                    distance=Distance.COSINE,
-                ),
+                vectors_config=self._vectors_config(),
+                quantization_config=self._quantization_config(),
+            )
+            print(f"Created collection: {self.collection_name} ({self.vector_precision})")
+
+    def _vectors_config(self) -> VectorParams:
+        """Vector params for the configured precision."""
+        return VectorParams(
+            size=self.embedding_dim,
+            distance=Distance.COSINE,
+            datatype=qdrant_models.Datatype.FLOAT16 if self.vector_precision == "float16" else None,
+            # int8: quantized copy lives in RAM, originals only needed for rescoring
+            on_disk=True if self.vector_precision == "int8" else None,
+        )
+
+    def _quantization_config(self) -> qdrant_models.ScalarQuantization | None:
+        """Scalar int8 quantization config, if enabled."""
+        if self.vector_precision != "int8":
+            return None
+        return qdrant_models.ScalarQuantization(
+            scalar=qdrant_models.ScalarQuantizationConfig(
+                type=qdrant_models.ScalarType.INT8,
+                quantile=0.99,
+                always_ram=True,
+            )
+        )
+
+    def _search_params(self) -> qdrant_models.SearchParams | None:
+        """Oversampling + full-precision rescoring for quantized collections."""
+        if self.vector_precision != "int8":
+            return None
+        return qdrant_models.SearchParams(
+            quantization=qdrant_models.QuantizationSearchParams(
+                rescore=self.quantization_rescore,
+                oversampling=self.quantization_oversampling,
             )
-            print(f"Created collection: {self.collection_name}")
+        )
+
+    def _prepare_vectors(self, embeddings: np.ndarray) -> np.ndarray:
+        """Round embeddings to the stored precision before upsert."""
+        if self.vector_precision != "float16":
+            return embeddings
+        # float16 values have short exact decimal forms, which also shrinks REST bodies
+        return embeddings.astype(np.float16).astype(np.float32)
 
-    def embed_text(self, text: str) -> list[float]:
+    def embed_text(self, text: str) -> np.ndarray:
         """Generate embedding for text using configured embedder."""
         return self.embedder.embed(text)
 
-    def embed_batch(self, texts: list[str], batch_size: int = 100) -> list[list[float]]:
-        """Generate embeddings for multiple texts."""
+    def embed_batch(self, texts: list[str], batch_size: int = 100) -> np.ndarray:
+        """Generate embeddings for multiple texts as an (n, dim) float32 array."""
         return self.embedder.embed_batch(texts)
 
     def index_documents(self, documents: Iterator[dict], batch_size: int = 100) -> int:
@@ -249,37 +563,85 @@ class VectorStore:
         print(f"Total indexed: {total_indexed} documents")
         return total_indexed
 
+    def index_document_batches(self, batches: Iterator[list[dict]]) -> int:
+        """Index pre-batched documents (e.g. NTSBLoader.load_document_batches), one embed call per batch."""
+        self.create_collection()
+
+        total_indexed = 0
+        for batch in batches:
+            self._index_batch(batch)
+            total_indexed += len(batch)
+            print(f"Indexed {total_indexed} documents...")
+
+        print(f"Total indexed: {total_indexed} documents")
+        return total_indexed
+
     def _index_batch(self, documents: list[dict]) -> None:
-        """Index a batch of documents."""
+        """Index a batch of documents (as chunks, when chunking is enabled)."""
+        if self.chunker:
+            structure = "far" if self.source_type == SourceType.REGULATIONS else "narrative"
+            documents = list(self.chunker.chunk_documents(documents, structure))
+
         texts = [doc["text"] for doc in documents]
-        embeddings = self.embed_batch(texts)
-
-        points = [
-            PointStruct(
-                id=hash(doc["id"]) % (2**63),  # Convert string ID to int
-                vector=embedding,
-                payload={
-                    "id": doc["id"],
-                    "text": doc["text"],
-                    "source": self.source_type.value,
-                    **doc.get("metadata", {}),
-                },
-            )
-            for doc, embedding in zip(documents, embeddings)
+        embeddings = self._prepare_vectors(self.embed_batch(texts))
+
+        # The first chunk keeps its parent's point ID (as in the indexers), so
+        # re-indexing an unchunked collection overwrites its points
+        ids = [
+            self._point_id(doc["metadata"]["parent_id"] if doc.get("metadata", {}).get("chunk_index") == 0 else doc["id"])
+            for doc in documents
+        ]
+        payloads = [
+            {
+                "id": doc["id"],
+                "text": doc["text"],
+                "source": self.source_type.value,
+                **doc.get("metadata", {}),
+            }
+            for doc in documents
         ]
 
-        self.client.upsert(
+        # Drop the documents' existing chunks first: a document that now has
+        # fewer chunks would otherwise keep its stale ones. Without a chunker
+        # no chunk points are written, so there is nothing to delete.
+        if self.chunker:
+            parent_ids = list(dict.fromkeys(str(doc["metadata"]["parent_id"]) for doc in documents))
+            self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=qdrant_models.FilterSelector(
+                    filter=qdrant_models.Filter(must=[
+                        qdrant_models.FieldCondition(key="parent_id", match=qdrant_models.MatchAny(any=parent_ids)),
+                    ])
+                ),
+                wait=True,
+            )
+
+        # Hand the embedding array to the client as-is instead of building
+        # PointStructs here. The Bearer REST wrapper converts rows to lists
+        # only for the JSON body; qdrant-client's uploaders still convert
+        # each row with .tolist() (and, over gRPC, build a grpc.PointStruct
+        # per point), so there the saving is only the extra copy we skip.
+        self.client.upload_collection(
             collection_name=self.collection_name,
-            points=points,
+            vectors=embeddings,
+            payload=payloads,
+            ids=ids,
+            batch_size=len(ids),
+            wait=True,
         )
 
+    @staticmethod
+    def _point_id(key: str) -> int:
+        """Stable integer point ID for a document or chunk ID (same scheme as the indexers)."""
+        return int(hashlib.md5(str(key).encode()).hexdigest()[:16], 16)
+
     def search(
         self,
         query: str,
         top_k: int = 10,
-        filters: dict[str, Any] | None = None,
+        filters: dict[str, Any] | qdrant_models.Filter | None = None,
     ) -> list[Document]:
-        """Search for similar documents with optional filtering."""
+        """Search for similar documents with optional server-side filtering."""
         # Check if collection exists
         try:
             collections = self.client.get_collections().collections
@@ -290,35 +652,18 @@ class VectorStore:
 
         query_embedding = self.embed_text(query)
 
-        # Build filter conditions
-        filter_conditions = None
-        if filters:
-            must_conditions = []
-            for key, value in filters.items():
-                if isinstance(value, str):
-                    must_conditions.append(
-                        qdrant_models.FieldCondition(
-                            key=key,
-                            match=qdrant_models.MatchValue(value=value),
-                        )
-                    )
-                elif isinstance(value, dict) and "$contains" in value:
-                    must_conditions.append(
-                        qdrant_models.FieldCondition(
-                            key=key,
-                            match=qdrant_models.MatchText(text=value["$contains"]),
-                        )
-                    )
-
-            if must_conditions:
-                filter_conditions = qdrant_models.Filter(must=must_conditions)
+        filter_conditions = build_qdrant_filter(filters) if filters else None
+
+        # Several chunks of one parent can match; fetch extra so top_k parents remain
+        limit = top_k * self.chunk_search_overfetch if self.chunker else top_k
 
         # Execute search using query_points (new API)
         results = self.client.query_points(
             collection_name=self.collection_name,
             query=query_embedding,
             query_filter=filter_conditions,
-            limit=top_k,
+            limit=limit,
+            search_params=self._search_params(),
         )
 
         # Convert to Document objects
@@ -335,7 +680,8 @@ class VectorStore:
                 )
             )
 
-        return documents
+        # Unchunked collections pass through unchanged
+        return collapse_chunks(documents)[:top_k]
 
     def hybrid_search(
         self,
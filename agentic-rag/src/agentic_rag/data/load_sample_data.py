@@ -43,6 +43,7 @@ The aircraft was on approach to runway 27 when witnesses observed it flying unus
             "aircraft": "Cessna 172S",
             "registration": "N12345",
             "injury_severity": "Fatal",
+            "fatal_count": 2,
             "weather_condition": "VMC",
             "phase_of_flight": "Landing",
         },
@@ -80,6 +81,7 @@ Shortly after takeoff, the engine lost power at approximately 500 feet AGL. The
             "aircraft": "Piper PA-28-180",
             "registration": "N67890",
             "injury_severity": "Minor",
+            "fatal_count": 0,
             "weather_condition": "VMC",
             "phase_of_flight": "Takeoff",
         },
@@ -117,6 +119,7 @@ The pilot filed a VFR flight plan for a cross-country flight. Weather briefing i
             "aircraft": "Beechcraft Bonanza A36",
             "registration": "N33456",
             "injury_severity": "Fatal",
+            "fatal_count": 4,
             "weather_condition": "IMC",
             "phase_of_flight": "Cruise",
         },
@@ -4,5 +4,6 @@
 from .ntsb_loader import NTSBLoader
 from .far_loader import FARLoader
 from .news_loader import NewsLoader
+from .chunker import Chunker, collapse_chunks
 
-__all__ = ["NTSBLoader", "FARLoader", "NewsLoader"]
+__all__ = ["NTSBLoader", "FARLoader", "NewsLoader", "Chunker", "collapse_chunks"]
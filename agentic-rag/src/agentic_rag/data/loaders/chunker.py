@@ -0,0 +1,243 @@
+# chunker.py
+"""
+Structure-aware chunking of long documents before embedding.
+
+Embedders used to truncate every text at 8000 characters, so long FAR
+sections and NTSB narratives lost their tail and one vector had to stand
+for the whole document. Documents are now split into chunks of at most
+max_chars:
+
+- units follow the structure: paragraphs (blank-line separated), then
+  sentences for paragraphs that don't fit, then word windows
+- FAR paragraphs "(a)", "(b)", ... and markdown "## " headings are
+  preferred chunk starts; sub-paragraphs "(1)", "(i)" stay with their parent
+- consecutive chunks share up to overlap_chars of whole units
+
+Each chunk is indexed as its own point with the parent's metadata
+(header_l1..l3 included) plus parent_id, chunk_index, chunk_count and the
+chunk's character span in the parent text. At query time collapse_chunks
+merges hits back into one Document per parent.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Literal
+
+from agentic_rag.models import Document
+
+DEFAULT_MAX_CHARS = 1500
+DEFAULT_OVERLAP_CHARS = 200
+
+# Metadata keys describing a chunk rather than its parent document
+CHUNK_KEYS = ("parent_id", "chunk_index", "chunk_count", "chunk_start", "chunk_end")
+
+Structure = Literal["far", "narrative"]
+
+_PARAGRAPH_RE = re.compile(r"\S(?:.*?\S)?(?=[ \t]*\n\s*\n|\s*\Z)", re.DOTALL)
+_SENTENCE_RE = re.compile(r"\S.*?(?:[.!?][\"')\]]*(?=\s+[A-Z0-9(\"'])|\Z)", re.DOTALL)
+_FAR_MARKER_RE = re.compile(r"\(([a-z]+|\d+)\)\s")  # (a), (1), (iv); not (A)
+_HEADING_RE = re.compile(r"#{1,3} ")
+
+
+@dataclass(slots=True)
+class _Unit:
+    """A span of the parent text that is never split further."""
+    start: int
+    end: int
+    boundary: bool = False  # Preferred chunk start (FAR top-level paragraph, heading)
+    label: str | None = None  # FAR paragraph letter
+
+
+class Chunker:
+    """Split documents into overlapping, structure-aligned chunks."""
+
+    def __init__(self, max_chars: int = DEFAULT_MAX_CHARS, overlap_chars: int = DEFAULT_OVERLAP_CHARS):
+        """
+        Args:
+            max_chars: Maximum chunk length; documents this short stay whole
+            overlap_chars: Maximum text shared by consecutive chunks (whole units only)
+        """
+        self.max_chars = max_chars
+        self.overlap_chars = min(overlap_chars, max_chars // 2)
+
+    def split(self, text: str, structure: Structure = "narrative") -> list[tuple[int, int]]:
+        """(start, end) character spans of the chunks of `text`."""
+        if not text.strip():
+            return []
+        if len(text) <= self.max_chars:
+            return [(0, len(text))]
+        return self._pack(self._units(text, structure))
+
+    def chunk_document(self, document: dict, structure: Structure = "narrative") -> list[dict]:
+        """
+        Chunks of a {"id", "text", "metadata"} document, in the same shape.
+
+        Chunk ids are "{id}#{index}". A document that fits in one chunk is
+        returned as a single chunk so every point carries parent_id. FAR
+        chunks also list the top-level paragraph letters they contain.
+        """
+        text = document["text"]
+        units = self._units(text, structure) if structure == "far" or len(text) > self.max_chars else []
+        if len(text) > self.max_chars and units:
+            spans = self._pack(units)
+        else:
+            spans = [(0, len(text))]
+        labels = [(unit.start, unit.label) for unit in units if unit.label]
+        metadata = document.get("metadata", {})
+
+        chunks = []
+        for index, (start, end) in enumerate(spans):
+            chunk_metadata = {
+                **metadata,
+                "parent_id": document["id"],
+                "chunk_index": index,
+                "chunk_count": len(spans),
+                "chunk_start": start,
+                "chunk_end": end,
+            }
+            paragraphs = [label for position, label in labels if start <= position < end]
+            if paragraphs:
+                chunk_metadata["paragraphs"] = paragraphs
+            chunks.append({"id": f"{document['id']}#{index}", "text": text[start:end], "metadata": chunk_metadata})
+        return chunks
+
+    def chunk_documents(self, documents: Iterable[dict], structure: Structure = "narrative") -> Iterator[dict]:
+        """Chunk each document in turn."""
+        for document in documents:
+            yield from self.chunk_document(document, structure)
+
+    def _pack(self, units: list[_Unit]) -> list[tuple[int, int]]:
+        """Group units into chunk spans of at most max_chars with unit-aligned overlap."""
+        spans = []
+        first = 0
+        while first < len(units):
+            # Fill up to max_chars, closing early at a preferred boundary once half full
+            last = first
+            while last + 1 < len(units):
+                candidate = units[last + 1]
+                if candidate.end - units[first].start > self.max_chars:
+                    break
+                if candidate.boundary and units[last].end - units[first].start >= self.max_chars // 2:
+                    break
+                last += 1
+            spans.append((units[first].start, units[last].end))
+            if last + 1 >= len(units):
+                break
+
+            # The next chunk repeats the trailing units that fit in the overlap,
+            # unless it starts a new top-level paragraph
+            next_first = last + 1
+            while (
+                next_first - 1 > first
+                and not units[next_first].boundary
+                and units[last].end - units[next_first - 1].start <= self.overlap_chars
+            ):
+                next_first -= 1
+            first = next_first
+        return spans
+
+    def _units(self, text: str, structure: Structure) -> list[_Unit]:
+        """Paragraphs, split into sentences and then word windows where too long."""
+        units = []
+        previous_letter = previous_marker = None
+        for paragraph in _PARAGRAPH_RE.finditer(text):
+            start, end = paragraph.span()
+            body = paragraph.group()
+            label = None
+            if structure == "far":
+                marker = _FAR_MARKER_RE.match(body)
+                marker = marker.group(1) if marker else None
+                label = self._far_letter(marker, previous_letter, previous_marker)
+                previous_letter = label or previous_letter
+                previous_marker = marker or previous_marker
+            boundary = label is not None or bool(_HEADING_RE.match(body))
+
+            if end - start <= self.max_chars:
+                units.append(_Unit(start, end, boundary, label))
+                continue
+            for i, sentence in enumerate(_SENTENCE_RE.finditer(body)):
+                s_start, s_end = start + sentence.start(), start + sentence.end()
+                for j, (w_start, w_end) in enumerate(self._windows(text, s_start, s_end)):
+                    first = i == 0 and j == 0
+                    units.append(_Unit(w_start, w_end, boundary and first, label if first else None))
+        return units
+
+    def _windows(self, text: str, start: int, end: int) -> Iterator[tuple[int, int]]:
+        """Split [start, end) at whitespace into pieces of at most max_chars."""
+        while end - start > self.max_chars:
+            cut = text.rfind(" ", start + self.max_chars // 2, start + self.max_chars)
+            if cut == -1:
+                cut = start + self.max_chars
+            yield start, cut
+            start = cut
+            while start < end and text[start].isspace():
+                start += 1
+        if start < end:
+            yield start, end
+
+    @staticmethod
+    def _far_letter(marker: str | None, previous_letter: str | None, previous_marker: str | None) -> str | None:
+        """
+        Letter of a top-level FAR paragraph "(a) ...", else None.
+
+        "(i)", "(v)" and "(x)" are usually roman sub-paragraphs; they count
+        as letters only when they follow "(h)", "(u)" and "(w)" and the
+        paragraph before is not itself numbered or roman (a nested list).
+        """
+        if marker is None or len(marker) != 1 or not marker.isalpha():
+            return None
+        if marker in "ivx":
+            follows_letter = previous_letter is not None and ord(marker) - ord(previous_letter) == 1
+            nested = previous_marker is not None and previous_marker != previous_letter
+            if not follows_letter or nested:
+                return None
+        return marker
+
+
+def collapse_chunks(documents: list[Document]) -> list[Document]:
+    """
+    Merge chunk hits into one Document per parent, in best-hit order.
+
+    The parent's text is its matched chunks in document order, with the
+    overlap between adjacent chunks removed and "..." between gaps. The
+    score is the best chunk score; metadata lists matched_chunks.
+    Documents without parent_id (unchunked collections) pass through.
+    """
+    groups: dict[str, list[Document]] = {}
+    for doc in documents:
+        groups.setdefault(str(doc.metadata.get("parent_id", doc.id)), []).append(doc)
+
+    collapsed = []
+    for parent_id, hits in groups.items():
+        if "parent_id" not in hits[0].metadata:
+            collapsed.extend(hits)
+            continue
+
+        best = max(hits, key=lambda doc: doc.score)
+        hits = sorted(hits, key=lambda doc: doc.metadata.get("chunk_index", 0))
+        parts = [hits[0].text]
+        for previous, doc in zip(hits, hits[1:]):
+            end, start = previous.metadata.get("chunk_end"), doc.metadata.get("chunk_start")
+            adjacent = doc.metadata.get("chunk_index") == previous.metadata.get("chunk_index", -2) + 1
+            if adjacent and end is not None and start is not None and start < end:
+                parts.append(doc.text[end - start:])  # Drop the overlap shared with the previous chunk
+            elif adjacent:
+                parts.append(f"\n\n{doc.text}")  # Chunks only separated by whitespace
+            else:
+                parts.append(f"\n...\n{doc.text}")
+
+        metadata = {k: v for k, v in best.metadata.items() if k not in CHUNK_KEYS and k != "paragraphs"}
+        metadata["matched_chunks"] = [doc.metadata.get("chunk_index") for doc in hits]
+        metadata["chunk_count"] = best.metadata.get("chunk_count")
+        paragraphs = [label for doc in hits for label in doc.metadata.get("paragraphs", [])]
+        if paragraphs:
+            metadata["paragraphs"] = list(dict.fromkeys(paragraphs))
+
+        collapsed.append(Document(
+            id=parent_id,
+            text="".join(parts),
+            source=best.source,
+            metadata=metadata,
+            score=best.score,
+        ))
+    return collapsed
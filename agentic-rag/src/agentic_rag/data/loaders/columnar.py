@@ -0,0 +1,180 @@
+# columnar.py
+"""
+Streaming columnar CSV reading with pyarrow.
+
+Large exports (the NTSB avall dump has hundreds of thousands of rows) are
+parsed in C++ in record batches of a few MB, with every column kept as a
+string, instead of one Python dict per row. Callers resolve column aliases
+once from the header and build derived columns (document text, headers)
+with pyarrow.compute over whole batches.
+"""
+
+import csv
+from pathlib import Path
+from typing import Iterator
+
+from .dates import DATE_FORMATS, TIME_SUFFIX_RE
+
+# Lazy import to avoid requiring pyarrow for the row-based loaders
+_pyarrow = None
+
+
+def _get_pyarrow():
+    global _pyarrow
+    if _pyarrow is None:
+        try:
+            import pyarrow
+            import pyarrow.compute  # noqa: F401
+            import pyarrow.csv  # noqa: F401
+            _pyarrow = pyarrow
+        except ImportError:
+            raise ImportError(
+                "pyarrow not installed. "
+                "Install with: pip install pyarrow"
+            )
+    return _pyarrow
+
+
+def pyarrow_available() -> bool:
+    """Whether the columnar loaders can be used."""
+    try:
+        _get_pyarrow()
+        return True
+    except ImportError:
+        return False
+
+
+def _is_utf8(encoding: str) -> bool:
+    return encoding.lower().replace("-", "").replace("_", "") in ("utf8", "utf8sig")
+
+
+def read_header(path: str | Path, encoding: str = "utf-8") -> list[str]:
+    """Column names from the first CSV line (a UTF-8 BOM is dropped)."""
+    if _is_utf8(encoding):
+        encoding = "utf-8-sig"
+    with open(path, "r", encoding=encoding, errors="replace", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def iter_csv_batches(
+    path: str | Path,
+    columns: list[str] | None = None,
+    encoding: str = "utf-8",
+    block_size: int = 4 << 20,
+) -> Iterator:
+    """
+    Stream a CSV as pyarrow RecordBatches of string columns.
+
+    Empty cells are empty strings (as with csv.DictReader), and quoted
+    values may span lines. Bytes that are invalid in `encoding` become
+    U+FFFD, as with open(..., errors="replace") in the row-based loaders.
+
+    Args:
+        path: CSV file
+        columns: Columns to read (default: all)
+        encoding: File encoding
+        block_size: Bytes parsed per batch
+
+    Yields:
+        pyarrow.RecordBatch per block
+    """
+    pa = _get_pyarrow()
+    header = read_header(path, encoding)
+    names = columns if columns is not None else header
+
+    # Cells are read as raw bytes and decoded per column, since pyarrow's own
+    # decoding fails the whole file on one bad byte. The header is the one
+    # read_header decoded, so non-UTF-8 column names match.
+    reader = pa.csv.open_csv(
+        path,
+        read_options=pa.csv.ReadOptions(block_size=block_size, column_names=header, skip_rows=1),
+        parse_options=pa.csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa.csv.ConvertOptions(
+            column_types={name: pa.binary() for name in names},
+            include_columns=names,
+            strings_can_be_null=False,
+        ),
+    )
+    for batch in reader:
+        if batch.num_rows:
+            yield pa.RecordBatch.from_arrays(
+                [_decode(column, encoding) for column in batch.columns],
+                names=batch.schema.names,
+            )
+
+
+def _decode(column, encoding: str):
+    """A binary column as strings; undecodable bytes become U+FFFD."""
+    pa = _get_pyarrow()
+    if _is_utf8(encoding):
+        try:
+            return column.cast(pa.string())  # Validated in C++; fails only on invalid UTF-8
+        except pa.ArrowInvalid:
+            pass
+    return pa.array(
+        [value.decode(encoding, errors="replace") for value in column.to_pylist()],
+        type=pa.string(),
+    )
+
+
+def string_column(batch, column: str | None, default: str = ""):
+    """A batch column as a string array, or `default` repeated when the file lacks it."""
+    pa = _get_pyarrow()
+    if column is None:
+        return pa.array([default] * batch.num_rows, type=pa.string())
+    return batch.column(column)
+
+
+def int_column(batch, column: str | None):
+    """A batch column parsed as integers; empty or non-integer cells become 0."""
+    pa = _get_pyarrow()
+    pc = pa.compute
+    if column is None:
+        return pa.array([0] * batch.num_rows, type=pa.int64())
+    values = pc.utf8_trim_whitespace(batch.column(column))
+    is_int = pc.match_substring_regex(values, r"^[+-]?\d+$")
+    return pc.cast(pc.if_else(is_int, values, "0"), pa.int64())
+
+
+def date_column(values):
+    """
+    Dates normalized to ISO YYYY-MM-DD (see dates.normalize_date).
+
+    Each format is parsed over the whole column with pyarrow strptime;
+    cells no format accepts keep their trimmed value.
+    """
+    pc = _get_pyarrow().compute
+    values = pc.utf8_trim_whitespace(values)
+    days = pc.replace_substring_regex(values, TIME_SUFFIX_RE, "")
+    parsed = pc.coalesce(*(pc.strptime(days, format=fmt, unit="s", error_is_null=True) for fmt in DATE_FORMATS))
+    return pc.coalesce(pc.strftime(parsed, format="%Y-%m-%d"), values)
+
+
+def join_strings(*parts):
+    """Concatenate string arrays and scalars element-wise."""
+    return _get_pyarrow().compute.binary_join_element_wise(*parts, "")
+
+
+def prefix_nonempty(prefix: str, values):
+    """prefix + value where the value is non-empty, else ""."""
+    pc = _get_pyarrow().compute
+    return pc.if_else(pc.equal(values, ""), "", join_strings(prefix, values))
+
+
+def to_strings(values):
+    """Cast an array (e.g. from int_column) to strings."""
+    return _get_pyarrow().compute.cast(values, "string")
+
+
+def rechunk(batches: Iterator[list], size: int) -> Iterator[list]:
+    """Regroup an iterator of lists into lists of exactly `size` (the last may be shorter)."""
+    pending: list = []
+    for batch in batches:
+        pending.extend(batch)
+        if len(pending) >= size:
+            cut = len(pending) - len(pending) % size
+            for start in range(0, cut, size):
+                yield pending[start:start + size]
+            pending = pending[cut:]
+    if pending:
+        yield pending
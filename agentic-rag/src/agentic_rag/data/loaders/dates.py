@@ -0,0 +1,33 @@
+# dates.py
+"""
+Event date normalization shared by the NTSB loaders and indexer.
+
+NTSB exports write dates as MM/DD/YYYY (CAROL) or "MM/DD/YYYY hh:mm:ss"
+(avall). Qdrant DatetimeRange filters need ISO dates, so event_date is
+stored as YYYY-MM-DD; values in no known format are kept as they are.
+"""
+
+import re
+from datetime import datetime
+
+# Tried in order; %y before %Y so "12/31/99" is 1999 (%y rejects 4-digit years)
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%y", "%m/%d/%Y", "%Y/%m/%d")
+
+# Time of day after the date: "01/05/2020 00:00:00", "2020-01-05T00:00:00"
+TIME_SUFFIX_RE = r"[ T].*$"
+
+_TIME_SUFFIX = re.compile(TIME_SUFFIX_RE)
+
+
+def normalize_date(value: str | None) -> str | None:
+    """An event date as ISO YYYY-MM-DD; None when empty, unchanged when unparseable."""
+    if not value:
+        return None
+    value = value.strip()
+    day = _TIME_SUFFIX.sub("", value)
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(day, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return value or None
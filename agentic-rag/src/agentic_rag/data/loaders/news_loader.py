@@ -113,6 +113,7 @@ class NewsLoader:
                 "source": "news",
                 "news_source": article.source,
                 "date": article.date,
+                "publish_date": article.date,
                 "url": article.url,
                 "header_l1": article.header_l1,
                 "header_l2": article.header_l2,
@@ -224,6 +225,7 @@ Aviation safety experts emphasize that attempting to fly VFR into IMC conditions
                 "source": "news",
                 "news_source": article.source,
                 "date": article.date,
+                "publish_date": article.date,
                 "url": article.url,
                 "header_l1": article.header_l1,
                 "header_l2": article.header_l2,
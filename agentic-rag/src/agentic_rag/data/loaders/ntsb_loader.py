@@ -19,6 +19,18 @@ from typing import Iterator
 from dataclasses import dataclass
 
 from agentic_rag.config import get_settings
+from .columnar import (
+    date_column,
+    int_column,
+    iter_csv_batches,
+    join_strings,
+    prefix_nonempty,
+    read_header,
+    rechunk,
+    string_column,
+    to_strings,
+)
+from .dates import normalize_date
 
 
 @dataclass
@@ -61,6 +73,28 @@ class NTSBLoader:
     # NTSB data download URL (requires form submission, so we use cached data)
     NTSB_API_URL = "https://data.ntsb.gov/avdata"
 
+    # Record field -> CSV columns in order of preference (CAROL export, then avall);
+    # same lookups as _parse_row, resolved once per file by the columnar loader
+    COLUMN_ALIASES = {
+        "event_id": ("EventId", "ev_id"),
+        "event_date": ("EventDate", "ev_date"),
+        "location": ("Location", "ev_city"),
+        "country": ("Country", "ev_country"),
+        "aircraft_make": ("Make", "acft_make"),
+        "aircraft_model": ("Model", "acft_model"),
+        "registration": ("RegistrationNumber", "regis_no"),
+        "injury_severity": ("InjurySeverity", "ev_highest_injury"),
+        "fatal_injuries": ("TotalFatalInjuries", "inj_tot_f"),
+        "serious_injuries": ("TotalSeriousInjuries", "inj_tot_s"),
+        "minor_injuries": ("TotalMinorInjuries", "inj_tot_m"),
+        "weather_condition": ("WeatherCondition", "wx_cond_basic"),
+        "broad_phase_of_flight": ("BroadPhaseOfFlight", "phase_flt_spec"),
+        "probable_cause": ("ProbableCause", "narr_cause"),
+        "narrative": ("Narrative", "narr_accp"),
+    }
+    COLUMN_DEFAULTS = {"country": "USA"}
+    COUNT_FIELDS = ("fatal_injuries", "serious_injuries", "minor_injuries")
+
     def __init__(self, data_dir: Path | None = None):
         settings = get_settings()
         self.data_dir = data_dir or settings.data_dir / "ntsb"
@@ -83,20 +117,129 @@ class NTSBLoader:
             )
         return output_path
 
-    def load_csv(self, csv_path: Path | None = None) -> Iterator[NTSBRecord]:
+    def load_csv(self, csv_path: Path | None = None, encoding: str = "utf-8") -> Iterator[NTSBRecord]:
         """Load and parse NTSB CSV data."""
         csv_path = csv_path or self.data_dir / "accidents.csv"
 
-        with open(csv_path, "r", encoding="utf-8") as f:
+        with open(csv_path, "r", encoding=encoding) as f:
             reader = csv.DictReader(f)
             for row in reader:
                 yield self._parse_row(row)
 
+    def resolve_columns(self, header: list[str]) -> dict[str, str | None]:
+        """Map each record field to the first of its aliases present in the header."""
+        present = set(header)
+        return {
+            field: next((column for column in aliases if column in present), None)
+            for field, aliases in self.COLUMN_ALIASES.items()
+        }
+
+    def load_document_batches(
+        self,
+        csv_path: Path | None = None,
+        batch_size: int = 1000,
+        encoding: str = "utf-8",
+    ) -> Iterator[list[dict]]:
+        """
+        Load documents with the columnar (pyarrow) reader, in batches.
+
+        Produces the same documents as to_documents(load_csv()), but parses
+        the CSV in record batches, resolves column aliases once and builds
+        document texts and headers per batch with pyarrow.compute. Batches
+        can go straight to VectorStore.index_document_batches.
+
+        Args:
+            csv_path: CSV file (default: data_dir/accidents.csv)
+            batch_size: Documents per yielded batch
+            encoding: File encoding
+
+        Yields:
+            Lists of {"id", "text", "metadata"} documents
+        """
+        csv_path = csv_path or self.data_dir / "accidents.csv"
+        columns = self.resolve_columns(read_header(csv_path, encoding))
+        needed = sorted({column for column in columns.values() if column})
+
+        batches = iter_csv_batches(csv_path, columns=needed, encoding=encoding)
+        yield from rechunk((self._batch_documents(batch, columns) for batch in batches), batch_size)
+
+    def _batch_documents(self, batch, columns: dict[str, str | None]) -> list[dict]:
+        """Build the documents of one record batch (see _format_document_text)."""
+        values = {
+            field: string_column(batch, columns[field], self.COLUMN_DEFAULTS.get(field, ""))
+            for field in self.COLUMN_ALIASES
+            if field not in self.COUNT_FIELDS
+        }
+        values["event_date"] = date_column(values["event_date"])
+        counts = {field: int_column(batch, columns[field]) for field in self.COUNT_FIELDS}
+        count_text = {field: to_strings(array) for field, array in counts.items()}
+
+        aircraft = join_strings(values["aircraft_make"], " ", values["aircraft_model"])
+        text = join_strings(
+            "# NTSB Accident Report: ", values["event_id"],
+            "\nDate: ", values["event_date"],
+            "\nLocation: ", values["location"], ", ", values["country"],
+            "\n\n## Aircraft Information\nMake/Model: ", aircraft,
+            "\nRegistration: ", values["registration"],
+            "\n\n## Conditions\nWeather: ", values["weather_condition"],
+            "\nPhase of Flight: ", values["broad_phase_of_flight"],
+            "\n\n## Injuries\nSeverity: ", values["injury_severity"],
+            "\nFatal: ", count_text["fatal_injuries"],
+            ", Serious: ", count_text["serious_injuries"],
+            ", Minor: ", count_text["minor_injuries"],
+            prefix_nonempty("\n\n## Probable Cause\n", values["probable_cause"]),
+            prefix_nonempty("\n\n## Narrative\n", values["narrative"]),
+        )
+        header_l1 = join_strings("NTSB Report ", values["event_id"])
+        header_l2 = join_strings(values["event_date"], " - ", values["location"])
+        header_l3 = join_strings(aircraft, " (", values["registration"], ")")
+
+        rows = zip(
+            values["event_id"].to_pylist(),
+            text.to_pylist(),
+            values["event_date"].to_pylist(),
+            header_l1.to_pylist(),
+            header_l2.to_pylist(),
+            header_l3.to_pylist(),
+            values["location"].to_pylist(),
+            aircraft.to_pylist(),
+            values["registration"].to_pylist(),
+            values["injury_severity"].to_pylist(),
+            counts["fatal_injuries"].to_pylist(),
+            values["weather_condition"].to_pylist(),
+            values["broad_phase_of_flight"].to_pylist(),
+        )
+        return [
+            {
+                "id": event_id,
+                "text": doc_text,
+                "metadata": {
+                    "source": "ntsb",
+                    "event_id": event_id,
+                    "event_date": event_date,
+                    "header_l1": l1,
+                    "header_l2": l2,
+                    "header_l3": l3,
+                    "location": location,
+                    "aircraft": aircraft_name,
+                    "registration": registration,
+                    "injury_severity": severity,
+                    "fatal_count": fatal,
+                    "weather_condition": weather,
+                    "phase_of_flight": phase,
+                },
+            }
+            for (
+                event_id, doc_text, event_date, l1, l2, l3, location,
+                aircraft_name, registration, severity, fatal, weather, phase,
+            ) in rows
+        ]
+
     def _parse_row(self, row: dict) -> NTSBRecord:
         """Parse a CSV row into an NTSBRecord."""
         return NTSBRecord(
             event_id=row.get("EventId", row.get("ev_id", "")),
-            event_date=row.get("EventDate", row.get("ev_date", "")),
+            event_date=normalize_date(row.get("EventDate", row.get("ev_date", ""))) or "",
             location=row.get("Location", row.get("ev_city", "")),
             country=row.get("Country", row.get("ev_country", "USA")),
             latitude=self._parse_float(row.get("Latitude")),
@@ -150,6 +293,7 @@ class NTSBLoader:
                 "aircraft": f"{record.aircraft_make} {record.aircraft_model}",
                 "registration": record.registration,
                 "injury_severity": record.injury_severity,
+                "fatal_count": record.fatal_injuries,
                 "weather_condition": record.weather_condition,
                 "phase_of_flight": record.broad_phase_of_flight,
             }
@@ -1,21 +1,44 @@
 # app.py
 """Main FastAPI application."""
 
+import asyncio
 import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .routes import query, retrieval, health
+from agentic_rag.config import get_settings
+from agentic_rag.tracing.mlflow_tracer import get_mlflow_tracer
+from agentic_rag.tracing.telemetry import get_telemetry
+from .middleware.tracing import TracingMiddleware
+from .routes import query, retrieval, health, metrics
+from .warmup import run_warmup, warmup_state
 
 # Root path for reverse proxy (e.g., "/apps/airline-disaster")
 # This makes Swagger docs work correctly behind a proxy
 ROOT_PATH = os.environ.get("ROOT_PATH", "")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Preload and warm models in the background; flush MLflow and OTLP exports on shutdown."""
+    if get_settings().warmup_enabled:
+        app.state.warmup_task = asyncio.create_task(asyncio.to_thread(run_warmup, warmup_state))
+    else:
+        warmup_state.status = "ready"
+    yield
+    # Give queued MLflow exports a chance to reach the server
+    await asyncio.to_thread(get_mlflow_tracer().flush, 10.0)
+    await asyncio.to_thread(get_telemetry().shutdown)
+
+
 app = FastAPI(
     title="Agentic RAG Aviation Safety",
     description="Demonstrates agentic retrieval vs traditional RAG using aviation safety data",
     version="0.1.0",
     root_path=ROOT_PATH,
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -27,8 +50,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request IDs, X-Duration-MS and HTTP latency metrics
+app.add_middleware(TracingMiddleware)
+
 # Include routers
 app.include_router(health.router, tags=["Health"])
+app.include_router(metrics.router, tags=["Health"])
 app.include_router(query.router, prefix="/api", tags=["Query"])
 app.include_router(retrieval.router, prefix="/retrieve", tags=["Retrieval"])
 
@@ -47,6 +74,7 @@ async def root():
             "retrieve_regulations": "/retrieve/regulations",
             "retrieve_news": "/retrieve/news",
             "health": "/health",
+            "metrics": "/metrics",
         },
     }
 
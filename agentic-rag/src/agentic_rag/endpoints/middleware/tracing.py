@@ -6,6 +6,8 @@ import uuid
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 
+from agentic_rag.tracing.telemetry import get_telemetry
+
 
 class TracingMiddleware(BaseHTTPMiddleware):
     """Add tracing to all requests."""
@@ -27,4 +29,14 @@ class TracingMiddleware(BaseHTTPMiddleware):
         response.headers["X-Request-ID"] = request_id
         response.headers["X-Duration-MS"] = str(round(duration_ms, 2))
 
+        # Label by path template, not raw path, to keep metric cardinality bounded
+        # (streaming responses are timed to their first byte)
+        route = request.scope.get("route")
+        get_telemetry().observe_http(
+            request.method,
+            getattr(route, "path", "unmatched"),
+            response.status_code,
+            duration_ms,
+        )
+
         return response
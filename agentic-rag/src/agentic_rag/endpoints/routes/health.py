@@ -5,6 +5,8 @@ from fastapi import APIRouter
 
 from agentic_rag.config import get_settings
 from agentic_rag.data.indexers.vector_store import create_qdrant_client
+from agentic_rag.endpoints.warmup import warmup_state
+from agentic_rag.tracing.mlflow_tracer import get_mlflow_tracer
 
 router = APIRouter()
 
@@ -25,14 +27,26 @@ async def health_check():
         qdrant_status = f"unhealthy: {str(e)}"
         collection_count = 0
 
+    # "ready" only once startup warmup has succeeded (see endpoints/warmup.py);
+    # a failed warmup means models did not load, so the replica is not ready
+    if qdrant_status != "healthy" or warmup_state.status == "failed":
+        status = "degraded"
+    elif warmup_state.status in ("pending", "warming_up"):
+        status = "warming_up"
+    else:
+        status = "ready"
+
     return {
-        "status": "healthy" if qdrant_status == "healthy" else "degraded",
+        "status": status,
+        "ready": status == "ready",
         "components": {
             "qdrant": {
                 "status": qdrant_status,
                 "url": settings.qdrant_url,
                 "collections": collection_count,
             },
+            "warmup": warmup_state.to_dict(),
+            "mlflow_export": get_mlflow_tracer().export_stats(),
         },
         "config": {
             "embedding_model": settings.embedding_model,
@@ -0,0 +1,21 @@
+# metrics.py
+"""Prometheus metrics endpoint."""
+
+from fastapi import APIRouter, HTTPException, Response
+
+from agentic_rag.tracing.telemetry import get_telemetry
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def metrics():
+    """Stage, LLM and HTTP latency histograms and cache/retry/degradation counters."""
+    rendered = get_telemetry().render_metrics()
+    if rendered is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Metrics are disabled (METRICS_ENABLED=false or prometheus-client not installed)",
+        )
+    body, content_type = rendered
+    return Response(content=body, media_type=content_type)
@@ -1,14 +1,18 @@
 # query.py
 """Main query endpoints: agentic and baseline."""
 
+import asyncio
+import json
 import logging
+import threading
 import traceback
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from agentic_rag.models import QueryRequest, QueryResponse, RefinementMode, RerankingMode, LLMCall
-from agentic_rag.orchestration import Orchestrator
+from agentic_rag.orchestration import Orchestrator, QueryCancelled
 from agentic_rag.pipelines.traditional_rag import TraditionalRAG
 
 logger = logging.getLogger(__name__)
@@ -21,8 +25,26 @@ orchestrator = Orchestrator()
 traditional_rag = TraditionalRAG()
 
 
+def _with_deadline(request: QueryRequest, deadline_ms: int | None) -> QueryRequest:
+    """Apply an X-Request-Deadline-Ms header; it takes precedence over the body field."""
+    if deadline_ms is None:
+        return request
+    return request.model_copy(update={"deadline_ms": deadline_ms})
+
+
+def _with_profile(request: QueryRequest, profile: bool | None) -> QueryRequest:
+    """Apply an X-Debug-Profile header; it takes precedence over the body field."""
+    if profile is None:
+        return request
+    return request.model_copy(update={"profile": profile})
+
+
 @router.post("/query", response_model=QueryResponse)
-async def agentic_query(request: QueryRequest):
+async def agentic_query(
+    request: QueryRequest,
+    x_request_deadline_ms: int | None = Header(default=None, gt=0),
+    x_debug_profile: bool | None = Header(default=None),
+):
     """
     Execute an agentic RAG query.
 
@@ -33,9 +55,16 @@ async def agentic_query(request: QueryRequest):
     4. Refines context (dedup/synthesize)
     5. Evaluates sufficiency
     6. Generates structured answer
+
+    With a deadline (X-Request-Deadline-Ms header or deadline_ms), stages
+    degrade to cheaper paths when time runs short; see trace.deadline.
+
+    With PROFILING_ENABLED, X-Debug-Profile: true (or profile) profiles
+    the query; the hottest functions are returned in trace.profile.
     """
+    request = _with_profile(request, x_debug_profile)
     try:
-        response = await orchestrator.query(request)
+        response = await orchestrator.query(_with_deadline(request, x_request_deadline_ms))
         return response
     except Exception as e:
         logger.error(f"Error in agentic_query: {e}")
@@ -43,6 +72,77 @@ async def agentic_query(request: QueryRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/query/stream")
+async def agentic_query_stream(
+    request: QueryRequest,
+    x_request_deadline_ms: int | None = Header(default=None, gt=0),
+    x_debug_profile: bool | None = Header(default=None),
+):
+    """
+    Execute an agentic RAG query, streaming progress as Server-Sent Events.
+
+    Events:
+    - step: a pipeline step finished (same shape as trace.steps entries)
+    - token: the next piece of the answer summary as plain text
+      ({"text": ...}), decoded from the model's JSON response; the other
+      answer fields arrive with the answer event
+    - answer: the final QueryResponse
+    - error: the query failed ({"detail": ...})
+
+    The pipeline makes blocking model calls, so it runs in a worker thread
+    and hands events back to the event loop as they happen. If the client
+    disconnects, the query is cancelled at its next step or token, so no
+    further model calls are made for it.
+    """
+    request = _with_profile(_with_deadline(request, x_request_deadline_ms), x_debug_profile)
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+
+    def emit(event: str | None, data: dict | None = None):
+        if cancelled.is_set() and event is not None:
+            raise QueryCancelled("client disconnected")
+        loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+    def run():
+        try:
+            response = asyncio.run(orchestrator.query(request, on_event=emit, cancelled=cancelled))
+            emit("answer", response.model_dump(mode="json"))
+        except QueryCancelled as e:
+            logger.info(f"agentic_query_stream stopped: {e}")
+        except Exception as e:
+            logger.error(f"Error in agentic_query_stream: {e}")
+            logger.error(traceback.format_exc())
+            if not cancelled.is_set():
+                emit("error", {"detail": str(e)})
+        finally:
+            emit(None)
+
+    async def stream():
+        worker = asyncio.create_task(asyncio.to_thread(run))
+        try:
+            while True:
+                event, data = await events.get()
+                if event is None:
+                    break
+                yield _sse(event, data)
+            await worker
+        finally:
+            # Client disconnects cancel this generator; stop the worker's query too
+            cancelled.set()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 class BaselineRequest(BaseModel):
     """Request for baseline traditional RAG."""
     question: str
@@ -65,6 +165,7 @@ class BaselineTrace(BaseModel):
     total_duration_ms: float | None = None
     sources_used: list[str] = []
     mlflow_run_id: str | None = None
+    mlflow_query_id: str | None = None
     llm_calls: list[LLMCall] = []
 
 
@@ -103,6 +204,7 @@ async def baseline_query(request: BaselineRequest):
                 total_duration_ms=trace.total_duration_ms,
                 sources_used=trace.sources_used,
                 mlflow_run_id=trace.mlflow_run_id,
+                mlflow_query_id=trace.mlflow_query_id,
                 llm_calls=trace.llm_calls,
             )
 
@@ -143,6 +245,11 @@ async def get_refinement_modes():
                 "name": "Filter (Recommended)",
                 "description": "Score relevance, keep top documents with original text - no rewriting",
             },
+            {
+                "value": RefinementMode.LOCAL_FILTER.value,
+                "name": "Local Filter (Fast)",
+                "description": "Filter scored by the local cross-encoder - no LLM call",
+            },
         ]
     }
 
@@ -164,3 +271,14 @@ async def get_reranking_modes():
             },
         ]
     }
+
+
+@router.get("/query/model-routes")
+async def get_model_routes():
+    """Get generation model routing configuration and per-route stats since startup."""
+    model_router = orchestrator.model_router
+    return {
+        "enabled": model_router.enabled,
+        "models": {"small": model_router.small_model, "large": model_router.large_model},
+        "stats": model_router.stats(),
+    }
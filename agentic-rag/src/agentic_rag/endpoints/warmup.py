@@ -0,0 +1,123 @@
+# warmup.py
+"""Model preload and warmup run at service startup.
+
+Loads the embedder, cross-encoder and LLM clients and runs one inference
+through each, so the first user request doesn't pay model load and
+first-call overhead. /health reports ready once this has succeeded, and
+"degraded" (not ready) if any component failed to load.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+
+from agentic_rag.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+WARMUP_TEXT = "Engine failure during takeoff in a Cessna 172"
+
+
+@dataclass
+class WarmupState:
+    """Progress and timings of startup warmup."""
+    status: str = "pending"  # pending, warming_up, ready, failed
+    timings_ms: dict[str, float] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+    started_at: float | None = None
+    finished_at: float | None = None
+    _done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until warmup finishes (successfully or not)."""
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> dict:
+        total = (
+            (self.finished_at - self.started_at) * 1000
+            if self.started_at and self.finished_at else None
+        )
+        return {
+            "status": self.status,
+            "timings_ms": self.timings_ms,
+            "total_ms": total,
+            "errors": self.errors,
+        }
+
+
+warmup_state = WarmupState()
+
+
+def _timed(state: WarmupState, name: str, fn) -> None:
+    """Run one warmup step, recording its duration or error."""
+    start_time = time.time()
+    try:
+        fn()
+        state.timings_ms[name] = (time.time() - start_time) * 1000
+        logger.info(f"Warmup {name}: {state.timings_ms[name]:.0f}ms")
+    except Exception as e:
+        state.errors[name] = str(e)
+        logger.warning(f"Warmup {name} failed: {e}")
+
+
+def _warm_embedder(state: WarmupState) -> None:
+    from agentic_rag.indexers.embeddings import get_shared_embedder
+
+    settings = get_settings()
+    embedder = get_shared_embedder(settings.embedder, settings.embedding_model)
+    load_ms = getattr(embedder, "load_duration_ms", None)
+    if load_ms is not None:
+        state.timings_ms["embedder_load"] = load_ms
+    embedder.embed(WARMUP_TEXT)
+
+
+def _warm_cross_encoder(state: WarmupState) -> None:
+    from agentic_rag.reranking.cross_encoder import get_cross_encoder_scorer
+
+    scorer = get_cross_encoder_scorer()
+    scorer.predict([(WARMUP_TEXT, WARMUP_TEXT)])
+    if scorer.load_duration_ms is not None:
+        state.timings_ms["cross_encoder_load"] = scorer.load_duration_ms
+
+
+def _warm_llm() -> None:
+    from agentic_rag.llm import get_llm_client
+
+    settings = get_settings()
+    client = get_llm_client()
+    if settings.warmup_llm_ping:
+        for model in {settings.refinement_model, settings.generation_model}:
+            client.chat(
+                messages=[{"role": "user", "content": "ping"}],
+                model=model,
+                max_tokens=1,
+            )
+
+
+def run_warmup(state: WarmupState = warmup_state) -> WarmupState:
+    """
+    Load and warm all models, recording per-component timings.
+
+    Failures are recorded per component and mark the state "failed": the
+    service still serves requests, loading lazily as before, but /health
+    reports it as not ready.
+    """
+    settings = get_settings()
+    state.status = "warming_up"
+    state.started_at = time.time()
+
+    _timed(state, "embedder", lambda: _warm_embedder(state))
+    if settings.warmup_cross_encoder:
+        _timed(state, "cross_encoder", lambda: _warm_cross_encoder(state))
+    _timed(state, "llm_client", _warm_llm)
+
+    state.finished_at = time.time()
+    state.status = "failed" if state.errors else "ready"
+    state._done.set()
+    logger.info(f"Warmup {state.status} in {(state.finished_at - state.started_at) * 1000:.0f}ms")
+    return state
@@ -318,6 +318,10 @@ function renderBaselineTraceVisualization(trace) {
                     <div class="trace-mlflow-link">
                         <small>MLflow Run: ${trace.mlflow_run_id.substring(0, 8)}...</small>
                     </div>
+                ` : trace.mlflow_query_id ? `
+                    <div class="trace-mlflow-link">
+                        <small>MLflow query_id: ${trace.mlflow_query_id.substring(0, 8)}...</small>
+                    </div>
                 ` : ''}
             </div>
 
@@ -573,6 +577,10 @@ function renderTraceVisualization(trace) {
                     <div class="trace-mlflow-link">
                         <small>MLflow Run: ${trace.mlflow_run_id.substring(0, 8)}...</small>
                     </div>
+                ` : trace.mlflow_query_id ? `
+                    <div class="trace-mlflow-link">
+                        <small>MLflow query_id: ${trace.mlflow_query_id.substring(0, 8)}...</small>
+                    </div>
                 ` : ''}
             </div>
 
@@ -1,7 +1,9 @@
 # generation package
 """Answer generation from retrieved context."""
 
+from .context_packer import ContextPacker, PackedContext
 from .generator import AnswerGenerator
-from .prompts import GENERATION_PROMPT
+from .model_router import ModelRouter, RouteDecision
+from .prompts import GENERATION_PROMPT, GENERATION_SYSTEM_PROMPT
 
-__all__ = ["AnswerGenerator", "GENERATION_PROMPT"]
+__all__ = ["AnswerGenerator", "ContextPacker", "PackedContext", "ModelRouter", "RouteDecision", "GENERATION_PROMPT", "GENERATION_SYSTEM_PROMPT"]
@@ -0,0 +1,93 @@
+# context_packer.py
+"""Token-budget-aware context packing.
+
+Replaces fixed character cuts with a token budget: documents are admitted
+greedily by relevance until the budget is spent, and a document that does
+not fit whole is trimmed at a sentence boundary. Emitted in input order.
+"""
+
+from dataclasses import dataclass, field
+
+from agentic_rag.models import Document
+from agentic_rag.tokens import TokenCounter, trim_to_tokens
+
+
+@dataclass
+class PackedContext:
+    """Documents selected for a prompt and the packing outcome."""
+    documents: list[Document]
+    tokens: int
+    budget: int
+    trimmed: list[str] = field(default_factory=list)  # ids of documents cut to fit
+    dropped: list[str] = field(default_factory=list)  # ids of documents left out
+
+    def summary(self) -> dict:
+        return {
+            "context_tokens": self.tokens,
+            "context_budget": self.budget,
+            "documents_packed": len(self.documents),
+            "documents_trimmed": len(self.trimmed),
+            "documents_dropped": len(self.dropped),
+            "trimmed_ids": self.trimmed,
+            "dropped_ids": self.dropped,
+        }
+
+
+def relevance(doc: Document) -> float:
+    """Relevance used for packing order: filter score if present, else retrieval/rerank score."""
+    return doc.metadata.get("relevance_score", doc.score)
+
+
+class ContextPacker:
+    """Pack documents into a token budget."""
+
+    def __init__(
+        self,
+        counter: TokenCounter,
+        budget_tokens: int,
+        min_document_tokens: int = 64,
+        header_tokens: int = 24,
+    ):
+        """Initialize the packer.
+
+        Args:
+            counter: Token counter for the target model
+            budget_tokens: Total tokens available for document text
+            min_document_tokens: Don't admit a trimmed document smaller than this
+            header_tokens: Per-document allowance for the "--- Document N ---" header
+        """
+        self.counter = counter
+        self.budget_tokens = budget_tokens
+        self.min_document_tokens = min_document_tokens
+        self.header_tokens = header_tokens
+
+    def pack(self, documents: list[Document]) -> PackedContext:
+        """Greedily fill the budget by relevance; return documents in input order."""
+        remaining = self.budget_tokens
+        selected: dict[int, Document] = {}
+        trimmed, dropped = [], []
+
+        order = sorted(range(len(documents)), key=lambda i: relevance(documents[i]), reverse=True)
+        for i in order:
+            doc = documents[i]
+            available = remaining - self.header_tokens
+            tokens = self.counter.count(doc.text)
+
+            if tokens <= available:
+                selected[i] = doc
+                remaining -= tokens + self.header_tokens
+            elif available >= self.min_document_tokens:
+                text = trim_to_tokens(doc.text, available, self.counter)
+                selected[i] = doc.model_copy(update={"text": text})
+                remaining -= self.counter.count(text) + self.header_tokens
+                trimmed.append(doc.id)
+            else:
+                dropped.append(doc.id)
+
+        return PackedContext(
+            documents=[selected[i] for i in sorted(selected)],
+            tokens=self.budget_tokens - remaining,
+            budget=self.budget_tokens,
+            trimmed=trimmed,
+            dropped=dropped,
+        )
@@ -2,11 +2,13 @@
 """Answer generation from retrieved context."""
 
 import json
+import re
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Callable
 
 from agentic_rag.config import get_settings
-from agentic_rag.llm import get_llm_client
+from agentic_rag.llm import extract_json, get_llm_client, prompt_messages
 from agentic_rag.models import (
     Document,
     IntentType,
@@ -15,8 +17,72 @@ from agentic_rag.models import (
     RegulatoryContext,
     LLMCall,
 )
+from agentic_rag.tokens import get_token_counter
 from agentic_rag.tracing.mlflow_tracer import get_mlflow_tracer
-from .prompts import GENERATION_PROMPT, TRADITIONAL_RAG_PROMPT
+from .context_packer import ContextPacker
+from .prompts import (
+    GENERATION_PROMPT,
+    GENERATION_SYSTEM_PROMPT,
+    TRADITIONAL_RAG_PROMPT,
+    TRADITIONAL_RAG_SYSTEM_PROMPT,
+)
+
+
+_SUMMARY_START = re.compile(r'"summary"\s*:\s*"')
+_JSON_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class SummaryStream:
+    """
+    Decode the "summary" string of a streamed JSON answer as it arrives.
+
+    The generation model answers in JSON, so raw stream chunks are
+    fragments of keys, quotes and escapes. feed() returns only the new
+    characters of the summary value, unescaped; an escape split across
+    chunks is held back until it is complete.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._position: int | None = None  # Next unread character of the summary value
+        self._done = False
+
+    def feed(self, chunk: str) -> str:
+        """Add a stream chunk; return the summary text it completes (may be "")."""
+        if self._done:
+            return ""
+        self._buffer += chunk
+        if self._position is None:
+            match = _SUMMARY_START.search(self._buffer)
+            if not match:
+                return ""
+            self._position = match.end()
+
+        buffer, i, text = self._buffer, self._position, []
+        while i < len(buffer):
+            char = buffer[i]
+            if char == '"':
+                self._done = True
+                break
+            if char != "\\":
+                text.append(char)
+                i += 1
+                continue
+            if i + 1 >= len(buffer):
+                break
+            if buffer[i + 1] == "u":
+                if i + 6 > len(buffer):
+                    break
+                try:
+                    text.append(chr(int(buffer[i + 2:i + 6], 16)))
+                except ValueError:
+                    pass
+                i += 6
+                continue
+            text.append(_JSON_ESCAPES.get(buffer[i + 1], buffer[i + 1]))
+            i += 2
+        self._position = i
+        return "".join(text)
 
 
 @dataclass
@@ -24,6 +90,7 @@ class GenerationResult:
     """Result from answer generation including raw LLM data."""
     answer: StructuredAnswer
     llm_call: LLMCall
+    context: dict = field(default_factory=dict)  # Context packing stats
 
 
 @dataclass
@@ -31,6 +98,7 @@ class TraditionalGenerationResult:
     """Result from traditional RAG generation including raw LLM data."""
     answer: str
     llm_call: LLMCall
+    context: dict = field(default_factory=dict)  # Context packing stats
 
 
 class AnswerGenerator:
@@ -40,15 +108,34 @@ class AnswerGenerator:
         settings = get_settings()
         self.llm = get_llm_client()
         self.model = settings.generation_model
+        self.packer = ContextPacker(
+            counter=get_token_counter(self.model),
+            budget_tokens=settings.generation_context_budget_tokens,
+            min_document_tokens=settings.generation_min_document_tokens,
+        )
 
     async def generate(
         self,
         question: str,
         intent: IntentType,
         documents: list[Document],
+        model: str | None = None,
+        on_token: Callable[[str], None] | None = None,
     ) -> GenerationResult:
-        """Generate a structured answer from documents."""
+        """
+        Generate a structured answer from documents.
+
+        Args:
+            question: User question
+            intent: Classified intent
+            documents: Context documents
+            model: Model override (default: settings.generation_model)
+            on_token: If given, the response is streamed from the LLM and
+                the answer summary text is passed to it as it arrives
+                (decoded from the JSON response, see SummaryStream)
+        """
         mlflow_tracer = get_mlflow_tracer()
+        model = model or self.model
 
         if not documents:
             return GenerationResult(
@@ -58,13 +145,13 @@ class AnswerGenerator:
                 ),
                 llm_call=LLMCall(
                     step="generation",
-                    model=self.model,
+                    model=model,
                     prompt="(skipped - no documents)",
                     response="(skipped - no documents)",
                 ),
             )
 
-        context = self._format_context(documents)
+        context, context_stats = self._format_context(documents)
         prompt = GENERATION_PROMPT.format(
             question=question,
             intent=intent.value,
@@ -75,17 +162,34 @@ class AnswerGenerator:
         with mlflow_tracer.span("generation_llm", span_type="LLM") as span:
             mlflow_tracer.set_span_inputs(span, {
                 "prompt": prompt,
-                "model": self.model,
+                "model": model,
                 "intent": intent.value,
                 "document_count": len(documents),
+                **context_stats,
             })
 
-            response = self.llm.chat(
-                messages=[{"role": "user", "content": prompt}],
-                model=self.model,
-                temperature=0,
-                json_output=True,
-            )
+            messages = prompt_messages(GENERATION_SYSTEM_PROMPT, prompt)
+            if on_token:
+                chunks = []
+                summary = SummaryStream()
+                for chunk in self.llm.stream_chat(
+                    messages=messages,
+                    model=model,
+                    temperature=0,
+                    json_output=True,
+                ):
+                    chunks.append(chunk)
+                    text = summary.feed(chunk)
+                    if text:
+                        on_token(text)
+                response = extract_json("".join(chunks))
+            else:
+                response = self.llm.chat(
+                    messages=messages,
+                    model=model,
+                    temperature=0,
+                    json_output=True,
+                )
             duration_ms = (time.time() - start_time) * 1000
 
             mlflow_tracer.set_span_outputs(span, {
@@ -95,10 +199,11 @@ class AnswerGenerator:
 
         llm_call = LLMCall(
             step="generation",
-            model=self.model,
-            prompt=prompt,
+            model=model,
+            prompt=f"{GENERATION_SYSTEM_PROMPT}\n\n{prompt}",
             response=response,
             duration_ms=duration_ms,
+            **self.llm.usage_fields(),
         )
 
         try:
@@ -131,6 +236,7 @@ class AnswerGenerator:
                     caveats=result.get("caveats", []),
                 ),
                 llm_call=llm_call,
+                context=context_stats,
             )
 
         except json.JSONDecodeError:
@@ -141,6 +247,7 @@ class AnswerGenerator:
                     caveats=["Response could not be parsed into structured format."],
                 ),
                 llm_call=llm_call,
+                context=context_stats,
             )
 
     async def generate_traditional(
@@ -162,7 +269,7 @@ class AnswerGenerator:
                 ),
             )
 
-        context = self._format_context(documents)
+        context, context_stats = self._format_context(documents)
         prompt = TRADITIONAL_RAG_PROMPT.format(
             question=question,
             context=context,
@@ -174,10 +281,11 @@ class AnswerGenerator:
                 "prompt": prompt,
                 "model": self.model,
                 "document_count": len(documents),
+                **context_stats,
             })
 
             response = self.llm.chat(
-                messages=[{"role": "user", "content": prompt}],
+                messages=prompt_messages(TRADITIONAL_RAG_SYSTEM_PROMPT, prompt),
                 model=self.model,
                 temperature=0,
             )
@@ -193,19 +301,26 @@ class AnswerGenerator:
             llm_call=LLMCall(
                 step="generation_traditional",
                 model=self.model,
-                prompt=prompt,
+                prompt=f"{TRADITIONAL_RAG_SYSTEM_PROMPT}\n\n{prompt}",
                 response=response,
                 duration_ms=duration_ms,
+                **self.llm.usage_fields(),
             ),
+            context=context_stats,
         )
 
-    def _format_context(self, documents: list[Document]) -> str:
-        """Format documents as context for generation."""
+    def _format_context(self, documents: list[Document]) -> tuple[str, dict]:
+        """Pack documents into the token budget and format them as context.
+
+        Returns:
+            Tuple of (context text, packing stats)
+        """
+        packed = self.packer.pack(documents)
         parts = []
-        for i, doc in enumerate(documents):
+        for i, doc in enumerate(packed.documents):
             source = doc.source.value
             header = doc.metadata.get("header_l3", doc.id)
             parts.append(f"--- Document {i+1} [{source}]: {header} ---")
             parts.append(doc.text)
             parts.append("")
-        return "\n".join(parts)
+        return "\n".join(parts), packed.summary()
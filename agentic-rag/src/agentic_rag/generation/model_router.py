@@ -0,0 +1,109 @@
+# model_router.py
+"""Route generation to a small or large model per query.
+
+Short factual lookups don't need the large generation model. The router
+picks the small model when the intent is a simple one, the packed context
+is short and the query has few constraints; anything else (and every
+CAUSAL / MULTI_SOURCE query) goes to the large model.
+"""
+
+import threading
+from dataclasses import dataclass
+
+from agentic_rag.config import get_settings
+from agentic_rag.models import Document, IntentType
+from agentic_rag.tokens import get_token_counter
+
+
+@dataclass
+class RouteDecision:
+    """Model chosen for one generation call."""
+    route: str  # "small" or "large"
+    model: str
+    reason: str
+    context_tokens: int
+
+    def to_dict(self) -> dict:
+        return {
+            "route": self.route,
+            "model": self.model,
+            "reason": self.reason,
+            "context_tokens": self.context_tokens,
+        }
+
+
+class ModelRouter:
+    """Pick the generation model from intent, context size and constraint count."""
+
+    def __init__(self):
+        settings = get_settings()
+        self.enabled = settings.model_routing_enabled
+        self.small_model = settings.fallback_generation_model
+        self.large_model = settings.generation_model
+        self.small_intents = {IntentType(i) for i in settings.routing_small_intents}
+        self.max_context_tokens = settings.routing_small_max_context_tokens
+        self.max_constraints = settings.routing_small_max_constraints
+        self.context_budget = settings.generation_context_budget_tokens
+        self.counter = get_token_counter(self.large_model)
+
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict] = {}
+
+    def route(
+        self,
+        intent: IntentType,
+        documents: list[Document],
+        constraint_count: int = 0,
+    ) -> RouteDecision:
+        """Choose the model for generating an answer over these documents."""
+        context_tokens = min(
+            sum(self.counter.count(doc.text) for doc in documents),
+            self.context_budget,
+        )
+
+        def decide(route: str, reason: str) -> RouteDecision:
+            model = self.small_model if route == "small" else self.large_model
+            return RouteDecision(route=route, model=model, reason=reason, context_tokens=context_tokens)
+
+        if not self.enabled:
+            return decide("large", "routing disabled")
+        if intent not in self.small_intents:
+            return decide("large", f"{intent.value} intent")
+        if context_tokens > self.max_context_tokens:
+            return decide("large", f"context {context_tokens} tokens > {self.max_context_tokens}")
+        if constraint_count > self.max_constraints:
+            return decide("large", f"{constraint_count} constraints > {self.max_constraints}")
+        return decide("small", f"{intent.value} intent, {context_tokens} context tokens")
+
+    def record(
+        self,
+        route: str,
+        duration_ms: float,
+        output_tokens: int | None,
+        cost_usd: float | None,
+    ) -> None:
+        """Accumulate per-route latency, output length and cost."""
+        with self._lock:
+            stats = self._stats.setdefault(route, {
+                "calls": 0,
+                "total_duration_ms": 0.0,
+                "total_output_tokens": 0,
+                "total_cost_usd": 0.0,
+            })
+            stats["calls"] += 1
+            stats["total_duration_ms"] += duration_ms
+            stats["total_output_tokens"] += output_tokens or 0
+            stats["total_cost_usd"] += cost_usd or 0.0
+
+    def stats(self) -> dict[str, dict]:
+        """Per-route totals and means since startup."""
+        with self._lock:
+            return {
+                route: {
+                    **s,
+                    "mean_duration_ms": s["total_duration_ms"] / s["calls"],
+                    "mean_output_tokens": s["total_output_tokens"] / s["calls"],
+                    "mean_cost_usd": s["total_cost_usd"] / s["calls"],
+                }
+                for route, s in self._stats.items()
+            }
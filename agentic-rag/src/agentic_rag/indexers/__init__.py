@@ -3,13 +3,14 @@
 from .ntsb_indexer import NTSBIndexer
 from .far_indexer import FARIndexer
 from .news_indexer import NewsIndexer
-from .embeddings import get_embedder, Embedder, LocalEmbedder, OpenAIEmbedder
+from .embeddings import get_embedder, get_shared_embedder, Embedder, LocalEmbedder, OpenAIEmbedder
 
 __all__ = [
     "NTSBIndexer",
     "FARIndexer",
     "NewsIndexer",
     "get_embedder",
+    "get_shared_embedder",
     "Embedder",
     "LocalEmbedder",
     "OpenAIEmbedder",
@@ -12,13 +12,21 @@ Usage:
     # OpenAI embeddings (requires API key)
     embedder = get_embedder("openai")
 
-    # Get embedding
+    # Get embedding (float32 NumPy array, shape (dimension,))
     vector = embedder.embed("Some text to embed")
+
+Embeddings are returned as C-contiguous float32 NumPy arrays: `embed` gives
+shape (dimension,), `embed_batch` gives shape (n, dimension). Convert with
+`.tolist()` only where a JSON body is built.
 """
 
+import threading
+import time
 from abc import ABC, abstractmethod
 from typing import Literal
 
+import numpy as np
+
 # Lazy imports to avoid requiring all dependencies
 _sentence_transformers = None
 _openai = None
@@ -62,13 +70,20 @@ class Embedder(ABC):
         pass
 
     @abstractmethod
-    def embed(self, text: str) -> list[float]:
-        """Generate embedding for a single text."""
+    def embed(self, text: str) -> np.ndarray:
+        """Generate embedding for a single text, shape (dimension,)."""
         pass
 
-    def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        """Generate embeddings for multiple texts. Override for batch optimization."""
-        return [self.embed(text) for text in texts]
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        """Generate embeddings for multiple texts, shape (n, dimension). Override for batch optimization."""
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        return np.stack([self.embed(text) for text in texts])
+
+
+def as_float32_array(vectors) -> np.ndarray:
+    """Return vectors as a C-contiguous float32 array, copying only if needed."""
+    return np.ascontiguousarray(vectors, dtype=np.float32)
 
 
 class LocalEmbedder(Embedder):
@@ -95,25 +110,27 @@ class LocalEmbedder(Embedder):
         self.model_name = model_name
         st = _get_sentence_transformers()
         print(f"Loading local embedding model: {model_name}...")
+        start_time = time.time()
         self.model = st.SentenceTransformer(model_name)
+        self.load_duration_ms = (time.time() - start_time) * 1000
         self._dimension = self.model.get_sentence_embedding_dimension()
-        print(f"Model loaded. Dimension: {self._dimension}")
+        print(f"Model loaded in {self.load_duration_ms:.0f}ms. Dimension: {self._dimension}")
 
     @property
     def dimension(self) -> int:
         return self._dimension
 
-    def embed(self, text: str) -> list[float]:
-        # Truncate very long texts
+    def embed(self, text: str) -> np.ndarray:
+        # Truncate very long texts (a safety net; indexing chunks documents first)
         text = text[:8000]
         embedding = self.model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        return as_float32_array(embedding)
 
-    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
         """Batch embedding is much faster with sentence-transformers."""
         texts = [t[:8000] for t in texts]
         embeddings = self.model.encode(texts, convert_to_numpy=True, show_progress_bar=True)
-        return embeddings.tolist()
+        return as_float32_array(embeddings)
 
 
 class OpenAIEmbedder(Embedder):
@@ -142,15 +159,15 @@ class OpenAIEmbedder(Embedder):
     def dimension(self) -> int:
         return self._dimension
 
-    def embed(self, text: str) -> list[float]:
+    def embed(self, text: str) -> np.ndarray:
         text = text[:8000]
         response = self.client.embeddings.create(
             model=self.model_name,
             input=text
         )
-        return response.data[0].embedding
+        return as_float32_array(response.data[0].embedding)
 
-    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
         """OpenAI supports batch embedding in a single API call."""
         texts = [t[:8000] for t in texts]
         response = self.client.embeddings.create(
@@ -159,7 +176,7 @@ class OpenAIEmbedder(Embedder):
         )
         # Sort by index to maintain order
         sorted_data = sorted(response.data, key=lambda x: x.index)
-        return [d.embedding for d in sorted_data]
+        return as_float32_array([d.embedding for d in sorted_data])
 
 
 def get_embedder(
@@ -196,3 +213,25 @@ def get_embedder(
         return OpenAIEmbedder(model_name=model, **kwargs)
     else:
         raise ValueError(f"Unknown provider: {provider}. Use 'local' or 'openai'.")
+
+
+_shared_embedders: dict[tuple[str, str | None], Embedder] = {}
+_shared_embedders_lock = threading.Lock()
+
+
+def get_shared_embedder(
+    provider: Literal["local", "openai"] = "local",
+    model_name: str | None = None,
+) -> Embedder:
+    """
+    Get a process-wide embedder for (provider, model_name).
+
+    Vector stores and the startup warmup share one instance, so each model
+    is loaded into memory once rather than once per store.
+    """
+    key = (provider, model_name)
+    if key not in _shared_embedders:
+        with _shared_embedders_lock:
+            if key not in _shared_embedders:
+                _shared_embedders[key] = get_embedder(provider, model_name)
+    return _shared_embedders[key]
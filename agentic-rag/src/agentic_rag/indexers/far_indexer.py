@@ -41,6 +41,8 @@ class FARConfig:
     qdrant_url: str = "http://localhost:6333"
     collection_name: str = "far_regulations"
     index_batch_size: int = 50
+    chunk_max_chars: int = 0  # Longer sections are split at paragraphs (a), (b), ... (e.g. 1500); 0 disables
+    chunk_overlap_chars: int = 200
     default_parts: list[str] = field(default_factory=lambda: ["1", "61", "91", "121", "135"])
     save_to: str | None = "./data/aviation/far"
     # Use current date for API requests (eCFR requires date in URL)
@@ -62,6 +64,8 @@ class FARIndexer:
         embedder: Literal["local", "openai"] | Embedder = "local",
         embedding_model: str | None = None,
         save_to: str | None = "./data/aviation/far",
+        chunk_max_chars: int | None = None,
+        chunk_overlap_chars: int | None = None,
     ):
         self.config = FARConfig()
         if qdrant_url:
@@ -69,6 +73,16 @@ class FARIndexer:
         if collection_name:
             self.config.collection_name = collection_name
         self.config.save_to = save_to
+        if chunk_max_chars is not None:
+            self.config.chunk_max_chars = chunk_max_chars
+        if chunk_overlap_chars is not None:
+            self.config.chunk_overlap_chars = chunk_overlap_chars
+
+        # Lazy import: the chunker lives with the app's loaders
+        self.chunker = None
+        if self.config.chunk_max_chars > 0:
+            from agentic_rag.data.loaders.chunker import Chunker
+            self.chunker = Chunker(self.config.chunk_max_chars, self.config.chunk_overlap_chars)
 
         # Set up embedder
         if isinstance(embedder, str):
@@ -193,8 +207,8 @@ class FARIndexer:
         yield from walk_structure(structure)
 
     def get_embedding(self, text: str) -> list[float]:
-        """Generate embedding for text."""
-        return self.embedder.embed(text)
+        """Generate embedding for text (as a list, for the JSON points body)."""
+        return self.embedder.embed(text).tolist()
 
     def index_to_qdrant(self, points: list[dict]) -> None:
         """Index points to Qdrant."""
@@ -205,6 +219,15 @@ class FARIndexer:
         )
         response.raise_for_status()
 
+    def delete_chunks(self, parent_ids: list[str]) -> None:
+        """Delete every chunk of these sections, so re-chunked sections leave no stale chunks."""
+        response = httpx.post(
+            f"{self.config.qdrant_url}/collections/{self.config.collection_name}/points/delete?wait=true",
+            json={"filter": {"must": [{"key": "parent_id", "match": {"any": parent_ids}}]}},
+            timeout=60
+        )
+        response.raise_for_status()
+
     def build_regulation_text(self, section_info: dict, content: str) -> str:
         """Build searchable text for a regulation section."""
         parts = [
@@ -228,6 +251,28 @@ class FARIndexer:
 
         return "\n".join(parts)
 
+    def build_chunks(self, section: dict) -> list[dict]:
+        """
+        Regulation text of a section as chunks with their Qdrant payloads.
+
+        Sections longer than chunk_max_chars are split at top-level
+        paragraphs (a), (b), ... with overlap; every chunk keeps the
+        section's part/title and header_l1..l3 plus parent_id (the section ID).
+        """
+        text = self.build_regulation_text(section, section.get("content", ""))
+        metadata = {
+            "part": section["part"],
+            "section": section["section_id"],
+            "title": section["title"],
+            "header_l1": f"14 CFR Part {section['part']}",
+            "header_l2": section["path"][0] if section.get("path") else "General",
+            "header_l3": f"§{section['section_id']} {section['title']}",
+        }
+        document = {"id": section["section_id"], "text": text, "metadata": metadata}
+        if self.chunker is None:
+            return [document]
+        return self.chunker.chunk_document(document, structure="far")
+
     def process_part(self, part: str, dry_run: bool = False) -> int:
         """Process a single CFR part and index to Qdrant."""
         print(f"\nProcessing Part {part}...")
@@ -271,47 +316,42 @@ class FARIndexer:
             return len(sections)
 
         points = []
-        indexed = 0
+        indexed_sections = set()
+        if sections_with_content:
+            self.delete_chunks([section["section_id"] for section in sections_with_content])
 
         for section in sections_with_content:
-            text = self.build_regulation_text(section, section.get("content", ""))
-
-            try:
-                embedding = self.get_embedding(text)
-            except Exception as e:
-                print(f"    Failed to embed §{section['section_id']}: {e}")
-                continue
-
-            # Convert section ID to integer for Qdrant
-            point_id = int(hashlib.md5(section["section_id"].encode()).hexdigest()[:16], 16)
-
-            point = {
-                "id": point_id,
-                "vector": embedding,
-                "payload": {
-                    "text": text,
-                    "part": section["part"],
-                    "section": section["section_id"],
-                    "title": section["title"],
-                    "header_l1": f"14 CFR Part {section['part']}",
-                    "header_l2": section["path"][0] if section.get("path") else "General",
-                    "header_l3": f"§{section['section_id']} {section['title']}",
+            for chunk in self.build_chunks(section):
+                try:
+                    embedding = self.get_embedding(chunk["text"])
+                except Exception as e:
+                    print(f"    Failed to embed §{chunk['id']}: {e}")
+                    continue
+
+                # Convert chunk ID to integer for Qdrant; the first chunk keeps the
+                # section's ID so re-indexing replaces unchunked points
+                metadata = chunk["metadata"]
+                point_key = metadata["section"] if metadata.get("chunk_index", 0) == 0 else chunk["id"]
+                point_id = int(hashlib.md5(point_key.encode()).hexdigest()[:16], 16)
+
+                point = {
+                    "id": point_id,
+                    "vector": embedding,
+                    "payload": {"id": chunk["id"], "text": chunk["text"], **metadata},
                 }
-            }
-            points.append(point)
+                points.append(point)
+                indexed_sections.add(metadata["section"])
 
-            if len(points) >= self.config.index_batch_size:
-                print(f"    Indexing batch of {len(points)} sections...")
-                self.index_to_qdrant(points)
-                indexed += len(points)
-                points = []
+                if len(points) >= self.config.index_batch_size:
+                    print(f"    Indexing batch of {len(points)} chunks...")
+                    self.index_to_qdrant(points)
+                    points = []
 
         if points:
-            print(f"    Indexing final batch of {len(points)} sections...")
+            print(f"    Indexing final batch of {len(points)} chunks...")
             self.index_to_qdrant(points)
-            indexed += len(points)
 
-        return indexed
+        return len(indexed_sections)
 
     def index(
         self,
@@ -377,6 +417,18 @@ def main():
         "--embedding-model",
         help="Embedding model name (default: all-MiniLM-L6-v2 for local, text-embedding-3-small for openai)"
     )
+    parser.add_argument(
+        "--chunk-max-chars",
+        type=int,
+        default=0,
+        help="Split sections longer than this (e.g. 1500) at paragraphs (a), (b), ... into overlapping chunks (default: 0, disabled)"
+    )
+    parser.add_argument(
+        "--chunk-overlap-chars",
+        type=int,
+        default=200,
+        help="Text shared by consecutive chunks"
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -404,6 +456,8 @@ def main():
         embedder=args.embedder,
         embedding_model=args.embedding_model,
         save_to=save_to,
+        chunk_max_chars=args.chunk_max_chars,
+        chunk_overlap_chars=args.chunk_overlap_chars,
     )
     indexer.index(parts=parts, dry_run=args.dry_run)
 
@@ -22,6 +22,8 @@ import json
 import time
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field
+from datetime import datetime
+from email.utils import parsedate_to_datetime
 from html import unescape
 from pathlib import Path
 from typing import Generator, Literal
@@ -136,6 +138,20 @@ class NewsIndexer:
         response.raise_for_status()
         print(f"Created collection '{self.config.collection_name}' (dim={self.embedder.dimension})")
 
+    def normalize_date(self, value: str | None) -> str | None:
+        """Convert RSS (RFC 822) or Atom (ISO 8601) dates to YYYY-MM-DD."""
+        if not value:
+            return None
+        value = value.strip()
+        try:
+            return parsedate_to_datetime(value).strftime("%Y-%m-%d")
+        except (TypeError, ValueError):
+            pass
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).strftime("%Y-%m-%d")
+        except ValueError:
+            return None
+
     def clean_html(self, text: str) -> str:
         """Remove HTML tags and clean up text."""
         if not text:
@@ -264,8 +280,8 @@ class NewsIndexer:
         return "\n".join(parts)
 
     def get_embedding(self, text: str) -> list[float]:
-        """Generate embedding for text."""
-        return self.embedder.embed(text)
+        """Generate embedding for text (as a list, for the JSON points body)."""
+        return self.embedder.embed(text).tolist()
 
     def index_to_qdrant(self, points: list[dict]) -> None:
         """Index points to Qdrant."""
@@ -313,6 +329,7 @@ class NewsIndexer:
                     "link": article.get("link"),
                     "description": article.get("description", "")[:500],
                     "pub_date": article.get("pub_date"),
+                    "publish_date": self.normalize_date(article.get("pub_date")),
                     "source_name": article["source_name"],
                     "category": article["category"],
                     "header_l1": "Aviation News",
@@ -13,6 +13,9 @@ Usage as CLI:
     # With OpenAI embeddings
     python -m agentic_rag.indexers.ntsb_indexer --csv-file ./ntsb_data.csv --embedder openai
 
+    # csv module instead of pyarrow record batches (the default when pyarrow is installed)
+    python -m agentic_rag.indexers.ntsb_indexer --csv-file ./ntsb_data.csv --engine csv
+
 Usage as module:
     from agentic_rag.indexers import NTSBIndexer
     indexer = NTSBIndexer(qdrant_url="http://localhost:6333", embedder="local")
@@ -22,6 +25,7 @@ Usage as module:
 import argparse
 import csv
 import hashlib
+import itertools
 import time
 from dataclasses import dataclass
 from datetime import datetime
@@ -30,6 +34,8 @@ from typing import Generator, Literal
 
 import httpx
 
+from agentic_rag.data.loaders.dates import normalize_date
+
 from .embeddings import get_embedder, Embedder
 
 
@@ -41,6 +47,8 @@ class NTSBConfig:
     collection_name: str = "ntsb_incidents"
     batch_size: int = 100  # NTSB API max per request
     index_batch_size: int = 50  # Qdrant upsert batch size
+    chunk_max_chars: int = 0  # Longer report texts are split into chunks (e.g. 1500); 0 disables
+    chunk_overlap_chars: int = 200
 
 
 class NTSBIndexer:
@@ -51,18 +59,71 @@ class NTSBIndexer:
     and indexes to a Qdrant collection.
     """
 
+    # Column name mappings (CSV column -> standard name)
+    # Keys are normalized: lowercase with spaces, underscores, dots removed
+    COLUMN_MAPPINGS = {
+        # Event ID
+        'eventid': 'EventId', 'evid': 'EventId', 'ntsbno': 'EventId',
+        'accidentnumber': 'EventId',
+        # Date
+        'eventdate': 'EventDate', 'evdate': 'EventDate',
+        # Location
+        'city': 'City', 'evcity': 'City',
+        'state': 'State', 'evstate': 'State',
+        'country': 'Country', 'evcountry': 'Country',
+        'location': 'Location',
+        # Aircraft
+        'make': 'Make', 'acftmake': 'Make',
+        'model': 'Model', 'acftmodel': 'Model',
+        'registrationnumber': 'RegistrationNumber', 'regisno': 'RegistrationNumber',
+        'aircraftcategory': 'AircraftCategory', 'acftcategory': 'AircraftCategory',
+        'aircraftdamage': 'AircraftDamage',
+        # Injuries
+        'injuryseverity': 'HighestInjuryLevel', 'highestinjurylevel': 'HighestInjuryLevel',
+        'totalfatalinjuries': 'FatalInjuryCount', 'fatalinjurycount': 'FatalInjuryCount',
+        'injtotf': 'FatalInjuryCount',
+        'totalseriousinjuries': 'SeriousInjuryCount',
+        'totalminorinjuries': 'MinorInjuryCount',
+        'totaluninjured': 'UninjuredCount',
+        # Conditions
+        'weathercondition': 'WeatherCondition', 'wxcondbasic': 'WeatherCondition',
+        'broadphaseofflight': 'BroadPhaseOfFlight', 'phasefltspec': 'BroadPhaseOfFlight',
+        # Narrative
+        'probablecause': 'ProbableCause', 'narrcause': 'ProbableCause',
+        # Other useful fields
+        'investigationtype': 'InvestigationType',
+        'numberofengines': 'NumberOfEngines',
+        'enginetype': 'EngineType',
+        'fardescription': 'FARDescription',
+        'purposeofflight': 'PurposeOfFlight',
+        'amateurbuilt': 'AmateurBuilt',
+        'reportstatus': 'ReportStatus',
+    }
+
     def __init__(
         self,
         qdrant_url: str | None = None,
         collection_name: str | None = None,
         embedder: Literal["local", "openai"] | Embedder = "local",
         embedding_model: str | None = None,
+        chunk_max_chars: int | None = None,
+        chunk_overlap_chars: int | None = None,
     ):
         self.config = NTSBConfig()
         if qdrant_url:
             self.config.qdrant_url = qdrant_url
         if collection_name:
             self.config.collection_name = collection_name
+        if chunk_max_chars is not None:
+            self.config.chunk_max_chars = chunk_max_chars
+        if chunk_overlap_chars is not None:
+            self.config.chunk_overlap_chars = chunk_overlap_chars
+
+        # Lazy import: the chunker lives with the app's loaders
+        self.chunker = None
+        if self.config.chunk_max_chars > 0:
+            from agentic_rag.data.loaders.chunker import Chunker
+            self.chunker = Chunker(self.config.chunk_max_chars, self.config.chunk_overlap_chars)
 
         # Set up embedder
         if isinstance(embedder, str):
@@ -191,8 +252,8 @@ class NTSBIndexer:
         return "\n".join(parts)
 
     def get_embedding(self, text: str) -> list[float]:
-        """Generate embedding for text."""
-        return self.embedder.embed(text)
+        """Generate embedding for text (as a list, for the JSON points body)."""
+        return self.embedder.embed(text).tolist()
 
     def index_to_qdrant(self, points: list[dict]) -> None:
         """Index points to Qdrant."""
@@ -203,72 +264,115 @@ class NTSBIndexer:
         )
         response.raise_for_status()
 
+    def delete_chunks(self, parent_ids: list[str]) -> None:
+        """Delete every chunk of these reports, so re-chunked reports leave no stale chunks."""
+        response = httpx.post(
+            f"{self.config.qdrant_url}/collections/{self.config.collection_name}/points/delete?wait=true",
+            json={"filter": {"must": [{"key": "parent_id", "match": {"any": parent_ids}}]}},
+            timeout=60
+        )
+        response.raise_for_status()
+
+    @staticmethod
+    def _parse_count(value: str | int | None) -> int:
+        """Parse an injury count; stored as int so `fatal_count >= N` filters work."""
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return 0
+
     def _make_point_id(self, event_id: str) -> int:
         """Convert event ID string to a valid Qdrant point ID (positive integer)."""
         # Hash the event ID and take first 16 hex chars to make a 64-bit integer
         hash_hex = hashlib.md5(event_id.encode()).hexdigest()[:16]
         return int(hash_hex, 16)
 
-    def process_and_index(self, records: list[dict]) -> int:
-        """Process records and index to Qdrant. Returns count indexed."""
-        points = []
-        indexed = 0
+    def build_chunks(self, record: dict) -> list[dict]:
+        """
+        Document text of a record as chunks with their Qdrant payloads.
 
-        for record in records:
-            event_id = record.get("EventId")
-            if not event_id:
-                continue
+        Long probable-cause narratives are split at sentences with overlap;
+        every chunk carries the record's fields and headers plus parent_id
+        (the event ID) so search results collapse back to one report.
+        """
+        event_id = record["EventId"]
+        text = self.build_document_text(record)
 
-            text = self.build_document_text(record)
+        # Handle location - may be combined or separate fields
+        location = record.get('Location') or f"{record.get('City', '')}, {record.get('State', '')}".strip(", ")
 
-            try:
-                embedding = self.get_embedding(text)
-            except Exception as e:
-                print(f"  Failed to embed {event_id}: {e}")
-                continue
+        metadata = {
+            "event_id": event_id,
+            "event_date": normalize_date(record.get("EventDate")),
+            "location": location,
+            "country": record.get("Country", "USA"),
+            "aircraft": f"{record.get('Make', '')} {record.get('Model', '')}".strip(),
+            "registration": record.get("RegistrationNumber"),
+            "injury_severity": record.get("HighestInjuryLevel"),
+            "fatal_count": self._parse_count(record.get("FatalInjuryCount")),
+            "weather_condition": record.get("WeatherCondition"),
+            "phase_of_flight": record.get("BroadPhaseOfFlight"),
+            "probable_cause": record.get("ProbableCause"),
+            "header_l1": "NTSB Aviation Accidents",
+            "header_l2": record.get("AircraftCategory", "General Aviation"),
+            "header_l3": f"{record.get('Make', '')} {record.get('Model', '')} - {record.get('BroadPhaseOfFlight', 'Unknown')}",
+        }
+        document = {"id": event_id, "text": text, "metadata": metadata}
+        if self.chunker is None:
+            return [document]
+        return self.chunker.chunk_document(document, structure="narrative")
 
-            # Handle location - may be combined or separate fields
-            location = record.get('Location') or f"{record.get('City', '')}, {record.get('State', '')}".strip(", ")
+    def process_and_index(self, records: list[dict]) -> int:
+        """Process records and index to Qdrant. Returns count of records indexed."""
+        points = []
+        indexed_events = set()
+
+        chunks = [chunk for record in records if record.get("EventId") for chunk in self.build_chunks(record)]
+        texts = [chunk["text"] for chunk in chunks]
+        if chunks:
+            self.delete_chunks(list({chunk["metadata"]["event_id"] for chunk in chunks}))
+
+        # One batched forward pass (or API call) per load batch
+        try:
+            embeddings = self.embedder.embed_batch(texts) if texts else []
+        except Exception as e:
+            print(f"  Batch embedding failed ({e}); embedding chunks one at a time")
+            embeddings = None
+
+        for i, chunk in enumerate(chunks):
+            if embeddings is not None:
+                embedding = embeddings[i].tolist()
+            else:
+                try:
+                    embedding = self.get_embedding(chunk["text"])
+                except Exception as e:
+                    print(f"  Failed to embed {chunk['id']}: {e}")
+                    continue
 
-            # Convert string event ID to integer for Qdrant
-            point_id = self._make_point_id(event_id)
+            # The first chunk keeps the event's point ID, so re-indexing an
+            # unchunked collection overwrites its points instead of duplicating them
+            metadata = chunk["metadata"]
+            point_key = metadata["event_id"] if metadata.get("chunk_index", 0) == 0 else chunk["id"]
 
             point = {
-                "id": point_id,
+                "id": self._make_point_id(point_key),
                 "vector": embedding,
-                "payload": {
-                    "text": text,
-                    "event_id": event_id,
-                    "event_date": record.get("EventDate"),
-                    "location": location,
-                    "country": record.get("Country", "USA"),
-                    "aircraft": f"{record.get('Make', '')} {record.get('Model', '')}".strip(),
-                    "registration": record.get("RegistrationNumber"),
-                    "injury_severity": record.get("HighestInjuryLevel"),
-                    "fatal_count": record.get("FatalInjuryCount"),
-                    "weather_condition": record.get("WeatherCondition"),
-                    "phase_of_flight": record.get("BroadPhaseOfFlight"),
-                    "probable_cause": record.get("ProbableCause"),
-                    "header_l1": "NTSB Aviation Accidents",
-                    "header_l2": record.get("AircraftCategory", "General Aviation"),
-                    "header_l3": f"{record.get('Make', '')} {record.get('Model', '')} - {record.get('BroadPhaseOfFlight', 'Unknown')}",
-                }
+                "payload": {"id": chunk["id"], "text": chunk["text"], **metadata},
             }
             points.append(point)
+            indexed_events.add(metadata["event_id"])
 
             if len(points) >= self.config.index_batch_size:
                 print(f"  Indexing batch of {len(points)} points...")
                 self.index_to_qdrant(points)
-                indexed += len(points)
                 points = []
                 time.sleep(0.1)
 
         if points:
             print(f"  Indexing final batch of {len(points)} points...")
             self.index_to_qdrant(points)
-            indexed += len(points)
 
-        return indexed
+        return len(indexed_events)
 
     def index(
         self,
@@ -312,7 +416,36 @@ class NTSBIndexer:
         print(f"Done! Indexed {total_indexed} records to '{self.config.collection_name}'")
         return total_indexed
 
-    def load_from_csv(self, csv_path: str) -> Generator[list[dict], None, None]:
+    def map_columns(self, fieldnames: list[str]) -> dict[str, str]:
+        """Map a CSV file's columns to standard names (unknown columns keep their name)."""
+        field_map = {}
+        mapped_cols = []
+        for col in fieldnames:
+            # Normalize: lowercase, remove spaces, underscores, and dots
+            col_lower = col.lower().replace(' ', '').replace('_', '').replace('.', '')
+            if col_lower in self.COLUMN_MAPPINGS:
+                field_map[col] = self.COLUMN_MAPPINGS[col_lower]
+                mapped_cols.append(f"{col} -> {self.COLUMN_MAPPINGS[col_lower]}")
+            elif col.lower().replace(' ', '_') in self.COLUMN_MAPPINGS:
+                field_map[col] = self.COLUMN_MAPPINGS[col.lower().replace(' ', '_')]
+                mapped_cols.append(f"{col} -> {self.COLUMN_MAPPINGS[col.lower().replace(' ', '_')]}")
+            else:
+                field_map[col] = col  # Keep original
+
+        print(f"  Mapped columns: {len(mapped_cols)}")
+        for m in mapped_cols[:10]:
+            print(f"    {m}")
+        if len(mapped_cols) > 10:
+            print(f"    ... and {len(mapped_cols) - 10} more")
+
+        return field_map
+
+    def load_from_csv(
+        self,
+        csv_path: str,
+        engine: Literal["auto", "arrow", "csv"] = "auto",
+        encoding: str = "utf-8",
+    ) -> Generator[list[dict], None, None]:
         """
         Load NTSB data from a CSV file.
 
@@ -331,6 +464,14 @@ class NTSBIndexer:
         - BroadPhaseOfFlight or phase_flt_spec
         - ProbableCause or narr_cause
 
+        Args:
+            csv_path: Path to CSV file
+            engine: "arrow" streams record batches with pyarrow and renames
+                columns once per batch; "csv" uses csv.DictReader; "auto"
+                uses arrow when pyarrow is installed and finishes the file
+                with csv if pyarrow cannot parse it (e.g. ragged rows)
+            encoding: File encoding
+
         Yields:
             Batches of records
         """
@@ -338,73 +479,33 @@ class NTSBIndexer:
         if not path.exists():
             raise FileNotFoundError(f"CSV file not found: {csv_path}")
 
-        # Column name mappings (CSV column -> standard name)
-        # Keys are normalized: lowercase with spaces, underscores, dots removed
-        column_mappings = {
-            # Event ID
-            'eventid': 'EventId', 'evid': 'EventId', 'ntsbno': 'EventId',
-            'accidentnumber': 'EventId',
-            # Date
-            'eventdate': 'EventDate', 'evdate': 'EventDate',
-            # Location
-            'city': 'City', 'evcity': 'City',
-            'state': 'State', 'evstate': 'State',
-            'country': 'Country', 'evcountry': 'Country',
-            'location': 'Location',
-            # Aircraft
-            'make': 'Make', 'acftmake': 'Make',
-            'model': 'Model', 'acftmodel': 'Model',
-            'registrationnumber': 'RegistrationNumber', 'regisno': 'RegistrationNumber',
-            'aircraftcategory': 'AircraftCategory', 'acftcategory': 'AircraftCategory',
-            'aircraftdamage': 'AircraftDamage',
-            # Injuries
-            'injuryseverity': 'HighestInjuryLevel', 'highestinjurylevel': 'HighestInjuryLevel',
-            'totalfatalinjuries': 'FatalInjuryCount', 'fatalinjurycount': 'FatalInjuryCount',
-            'injtotf': 'FatalInjuryCount',
-            'totalseriousinjuries': 'SeriousInjuryCount',
-            'totalminorinjuries': 'MinorInjuryCount',
-            'totaluninjured': 'UninjuredCount',
-            # Conditions
-            'weathercondition': 'WeatherCondition', 'wxcondbasic': 'WeatherCondition',
-            'broadphaseofflight': 'BroadPhaseOfFlight', 'phasefltspec': 'BroadPhaseOfFlight',
-            # Narrative
-            'probablecause': 'ProbableCause', 'narrcause': 'ProbableCause',
-            # Other useful fields
-            'investigationtype': 'InvestigationType',
-            'numberofengines': 'NumberOfEngines',
-            'enginetype': 'EngineType',
-            'fardescription': 'FARDescription',
-            'purposeofflight': 'PurposeOfFlight',
-            'amateurbuilt': 'AmateurBuilt',
-            'reportstatus': 'ReportStatus',
-        }
+        auto = engine == "auto"
+        if auto:
+            from agentic_rag.data.loaders.columnar import pyarrow_available
+            engine = "arrow" if pyarrow_available() else "csv"
+
+        loaded = 0
+        if engine == "arrow":
+            from pyarrow import ArrowInvalid
+            try:
+                for batch in self._load_from_csv_arrow(path, encoding):
+                    loaded += len(batch)
+                    yield batch
+                return
+            except ArrowInvalid as e:
+                if not auto:
+                    raise
+                print(f"  pyarrow could not parse {path.name} after {loaded} rows ({e}); continuing with csv")
 
         batch = []
-        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        with open(path, 'r', encoding=encoding, errors='replace') as f:
             reader = csv.DictReader(f)
 
             # Build mapping for this file's columns
-            field_map = {}
-            mapped_cols = []
-            for col in reader.fieldnames or []:
-                # Normalize: lowercase, remove spaces, underscores, and dots
-                col_lower = col.lower().replace(' ', '').replace('_', '').replace('.', '')
-                if col_lower in column_mappings:
-                    field_map[col] = column_mappings[col_lower]
-                    mapped_cols.append(f"{col} -> {column_mappings[col_lower]}")
-                elif col.lower().replace(' ', '_') in column_mappings:
-                    field_map[col] = column_mappings[col.lower().replace(' ', '_')]
-                    mapped_cols.append(f"{col} -> {column_mappings[col.lower().replace(' ', '_')]}")
-                else:
-                    field_map[col] = col  # Keep original
-
-            print(f"  Mapped columns: {len(mapped_cols)}")
-            for m in mapped_cols[:10]:
-                print(f"    {m}")
-            if len(mapped_cols) > 10:
-                print(f"    ... and {len(mapped_cols) - 10} more")
-
-            for row in reader:
+            field_map = self.map_columns(reader.fieldnames or [])
+
+            # Rows already yielded by the arrow engine before it failed
+            for row in itertools.islice(reader, loaded, None):
                 # Normalize row keys
                 record = {}
                 for orig_col, value in row.items():
@@ -420,10 +521,29 @@ class NTSBIndexer:
             if batch:
                 yield batch
 
+    def _load_from_csv_arrow(self, path: Path, encoding: str) -> Generator[list[dict], None, None]:
+        """load_from_csv with the columnar reader: columns are renamed once, rows built in C++."""
+        from agentic_rag.data.loaders.columnar import iter_csv_batches, read_header, rechunk
+
+        field_map = self.map_columns(read_header(path, encoding))
+
+        # When several columns map to one name the last wins, as in the row loop
+        source_by_name = {name: col for col, name in field_map.items()}
+        columns = list(source_by_name.values())
+        names = [field_map[col] for col in columns]
+
+        records = (
+            batch.rename_columns(names).to_pylist()
+            for batch in iter_csv_batches(path, columns=columns, encoding=encoding)
+        )
+        yield from rechunk(records, self.config.batch_size)
+
     def index_from_csv(
         self,
         csv_path: str,
         dry_run: bool = False,
+        engine: Literal["auto", "arrow", "csv"] = "auto",
+        encoding: str = "utf-8",
     ) -> int:
         """
         Index NTSB data from a CSV file to Qdrant.
@@ -431,6 +551,8 @@ class NTSBIndexer:
         Args:
             csv_path: Path to CSV file
             dry_run: If True, load but don't index
+            engine: CSV reader (see load_from_csv)
+            encoding: File encoding
 
         Returns:
             Number of records indexed
@@ -445,7 +567,7 @@ class NTSBIndexer:
             self.create_collection()
 
         total_indexed = 0
-        for batch in self.load_from_csv(csv_path):
+        for batch in self.load_from_csv(csv_path, engine=engine, encoding=encoding):
             if dry_run:
                 print(f"  [DRY RUN] Would index {len(batch)} records")
                 for record in batch[:3]:
@@ -493,6 +615,29 @@ Data sources:
         "--embedding-model",
         help="Embedding model name (default: all-MiniLM-L6-v2 for local, text-embedding-3-small for openai)"
     )
+    parser.add_argument(
+        "--engine",
+        choices=["auto", "arrow", "csv"],
+        default="auto",
+        help="CSV reader: 'arrow' (pyarrow record batches), 'csv' (csv module), 'auto' (arrow if installed)"
+    )
+    parser.add_argument(
+        "--encoding",
+        default="utf-8",
+        help="CSV file encoding, e.g. latin-1 for some Kaggle exports"
+    )
+    parser.add_argument(
+        "--chunk-max-chars",
+        type=int,
+        default=0,
+        help="Split report texts longer than this (e.g. 1500) into overlapping chunks (default: 0, disabled)"
+    )
+    parser.add_argument(
+        "--chunk-overlap-chars",
+        type=int,
+        default=200,
+        help="Text shared by consecutive chunks"
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -506,10 +651,14 @@ Data sources:
         collection_name=args.collection,
         embedder=args.embedder,
         embedding_model=args.embedding_model,
+        chunk_max_chars=args.chunk_max_chars,
+        chunk_overlap_chars=args.chunk_overlap_chars,
     )
     indexer.index_from_csv(
         csv_path=args.csv_file,
         dry_run=args.dry_run,
+        engine=args.engine,
+        encoding=args.encoding,
     )
 
 
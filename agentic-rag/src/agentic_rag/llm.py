@@ -2,15 +2,68 @@
 """LLM abstraction layer supporting OpenAI and Anthropic."""
 
 import json
+import threading
 from abc import ABC, abstractmethod
-from typing import Literal
+from dataclasses import asdict, dataclass
+from typing import Iterator, Literal
 
 from agentic_rag.config import get_settings
 
 
+def extract_json(text: str) -> str:
+    """Extract JSON from text that might have markdown formatting."""
+    text = text.strip()
+    # Remove markdown code blocks if present
+    if text.startswith("```json"):
+        text = text[7:]
+    elif text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return text.strip()
+
+
+def prompt_messages(system: str, user: str) -> list[dict]:
+    """
+    Build chat messages with static instructions first and variable input last.
+
+    Keeping the instructions as an unchanging system prefix lets providers
+    cache it once it reaches their minimum cacheable length (1024 tokens);
+    today's system prompts are shorter, so they are not cached yet.
+    """
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user},
+    ]
+
+
+@dataclass
+class TokenUsage:
+    """Provider-reported token usage of one call."""
+    input_tokens: int  # All prompt tokens, including cached ones
+    output_tokens: int
+    cached_input_tokens: int = 0  # Prompt tokens read from the provider's cache
+    cache_creation_input_tokens: int = 0  # Prompt tokens written to the cache (Anthropic)
+
+
 class LLMClient(ABC):
     """Abstract base class for LLM clients."""
 
+    _local = threading.local()
+
+    @property
+    def last_usage(self) -> TokenUsage | None:
+        """Usage of the most recent call made from this thread, if reported."""
+        return getattr(self._local, "usage", None)
+
+    def _set_usage(self, usage: TokenUsage | None) -> None:
+        self._local.usage = usage
+
+    def usage_fields(self) -> dict:
+        """Fields of the last call's usage, for building an LLMCall."""
+        usage = self.last_usage
+        return asdict(usage) if usage else {}
+
     @abstractmethod
     def chat(
         self,
@@ -23,6 +76,21 @@ class LLMClient(ABC):
         """Send a chat completion request and return the response text."""
         pass
 
+    def stream_chat(
+        self,
+        messages: list[dict],
+        model: str,
+        temperature: float = 0,
+        json_output: bool = False,
+        max_tokens: int = 4096,
+    ) -> Iterator[str]:
+        """
+        Send a chat completion request and yield response text as it arrives.
+
+        The default implementation yields the complete response in one chunk.
+        """
+        yield self.chat(messages, model, temperature, json_output, max_tokens)
+
 
 class OpenAIClient(LLMClient):
     """OpenAI API client."""
@@ -39,6 +107,52 @@ class OpenAIClient(LLMClient):
         json_output: bool = False,
         max_tokens: int = 4096,
     ) -> str:
+        # Prompts of 1024+ tokens are cached automatically by OpenAI; the
+        # stable system-message prefix is what makes the cache hit
+        kwargs = self._build_kwargs(messages, model, temperature, json_output, max_tokens)
+        self._set_usage(None)
+        response = self.client.chat.completions.create(**kwargs)
+        self._set_usage(self._usage(response.usage))
+        return response.choices[0].message.content
+
+    def stream_chat(
+        self,
+        messages: list[dict],
+        model: str,
+        temperature: float = 0,
+        json_output: bool = False,
+        max_tokens: int = 4096,
+    ) -> Iterator[str]:
+        kwargs = self._build_kwargs(messages, model, temperature, json_output, max_tokens)
+        self._set_usage(None)
+        stream = self.client.chat.completions.create(
+            **kwargs, stream=True, stream_options={"include_usage": True}
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            if chunk.usage:
+                self._set_usage(self._usage(chunk.usage))
+
+    @staticmethod
+    def _usage(usage) -> TokenUsage | None:
+        if usage is None:
+            return None
+        details = getattr(usage, "prompt_tokens_details", None)
+        return TokenUsage(
+            input_tokens=usage.prompt_tokens,
+            output_tokens=usage.completion_tokens,
+            cached_input_tokens=(getattr(details, "cached_tokens", None) or 0) if details else 0,
+        )
+
+    def _build_kwargs(
+        self,
+        messages: list[dict],
+        model: str,
+        temperature: float,
+        json_output: bool,
+        max_tokens: int,
+    ) -> dict:
         kwargs = {
             "model": model,
             "messages": messages,
@@ -47,17 +161,16 @@ class OpenAIClient(LLMClient):
         }
         if json_output:
             kwargs["response_format"] = {"type": "json_object"}
-
-        response = self.client.chat.completions.create(**kwargs)
-        return response.choices[0].message.content
+        return kwargs
 
 
 class AnthropicClient(LLMClient):
     """Anthropic API client."""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, prompt_caching: bool = False):
         import anthropic
         self.client = anthropic.Anthropic(api_key=api_key)
+        self.prompt_caching = prompt_caching
 
     def chat(
         self,
@@ -67,6 +180,56 @@ class AnthropicClient(LLMClient):
         json_output: bool = False,
         max_tokens: int = 4096,
     ) -> str:
+        kwargs = self._build_kwargs(messages, model, temperature, json_output, max_tokens)
+        self._set_usage(None)
+        response = self.client.messages.create(**kwargs)
+        self._set_usage(self._usage(response.usage))
+        content = response.content[0].text
+
+        # Clean up JSON if needed (Anthropic sometimes wraps in markdown)
+        if json_output:
+            content = self._extract_json(content)
+
+        return content
+
+    def stream_chat(
+        self,
+        messages: list[dict],
+        model: str,
+        temperature: float = 0,
+        json_output: bool = False,
+        max_tokens: int = 4096,
+    ) -> Iterator[str]:
+        # Chunks are passed through as-is; callers parsing JSON should
+        # run the joined text through extract_json
+        kwargs = self._build_kwargs(messages, model, temperature, json_output, max_tokens)
+        self._set_usage(None)
+        with self.client.messages.stream(**kwargs) as stream:
+            yield from stream.text_stream
+            self._set_usage(self._usage(stream.get_final_message().usage))
+
+    @staticmethod
+    def _usage(usage) -> TokenUsage | None:
+        if usage is None:
+            return None
+        # input_tokens excludes tokens read from or written to the cache
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+        return TokenUsage(
+            input_tokens=usage.input_tokens + cache_read + cache_write,
+            output_tokens=usage.output_tokens,
+            cached_input_tokens=cache_read,
+            cache_creation_input_tokens=cache_write,
+        )
+
+    def _build_kwargs(
+        self,
+        messages: list[dict],
+        model: str,
+        temperature: float,
+        json_output: bool,
+        max_tokens: int,
+    ) -> dict:
         # Anthropic uses a different message format
         # Extract system message if present
         system_content = None
@@ -91,28 +254,21 @@ class AnthropicClient(LLMClient):
             "max_tokens": max_tokens,
         }
         if system_content:
-            kwargs["system"] = system_content
-
-        response = self.client.messages.create(**kwargs)
-        content = response.content[0].text
-
-        # Clean up JSON if needed (Anthropic sometimes wraps in markdown)
-        if json_output:
-            content = self._extract_json(content)
-
-        return content
+            if self.prompt_caching:
+                # Cache breakpoint after the static instructions; prefixes below
+                # the model's minimum cacheable length are simply not cached
+                kwargs["system"] = [{
+                    "type": "text",
+                    "text": system_content,
+                    "cache_control": {"type": "ephemeral"},
+                }]
+            else:
+                kwargs["system"] = system_content
+        return kwargs
 
     def _extract_json(self, text: str) -> str:
         """Extract JSON from text that might have markdown formatting."""
-        text = text.strip()
-        # Remove markdown code blocks if present
-        if text.startswith("```json"):
-            text = text[7:]
-        elif text.startswith("```"):
-            text = text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
-        return text.strip()
+        return extract_json(text)
 
 
 # Singleton client instance
@@ -125,12 +281,21 @@ def get_llm_client() -> LLMClient:
     if _llm_client is None:
         settings = get_settings()
         if settings.llm_provider == "anthropic":
-            _llm_client = AnthropicClient(api_key=settings.anthropic_api_key)
+            _llm_client = AnthropicClient(
+                api_key=settings.anthropic_api_key,
+                prompt_caching=settings.llm_prompt_caching,
+            )
         else:
             _llm_client = OpenAIClient(api_key=settings.openai_api_key)
     return _llm_client
 
 
+def set_llm_client(client: LLMClient) -> None:
+    """Use a specific client for components created after this call (e.g. a benchmark stand-in)."""
+    global _llm_client
+    _llm_client = client
+
+
 def reset_llm_client():
     """Reset the singleton client (useful for testing or config changes)."""
     global _llm_client
@@ -12,6 +12,7 @@ class RefinementMode(str, Enum):
     DEDUP = "dedup"         # Deduplicate + prune, preserve original text
     SYNTHESIZE = "synthesize"  # Compress into summary
     FILTER = "filter"       # Score relevance, keep top chunks with original text (no rewriting)
+    LOCAL_FILTER = "local_filter"  # Same as FILTER, scored by local cross-encoder instead of an LLM
 
 
 class RerankingMode(str, Enum):
@@ -55,6 +56,8 @@ class QueryRequest(BaseModel):
     top_k: int = Field(default=10, ge=1, le=50)
     include_trace: bool = True
     sources: list[SourceType] | None = None  # None = auto-select
+    deadline_ms: int | None = Field(default=None, gt=0)  # Latency budget; None = settings.default_deadline_ms
+    profile: bool = False  # Profile this query (needs PROFILING_ENABLED)
 
 
 class RetrievalRequest(BaseModel):
@@ -128,12 +131,18 @@ class LLMCall(BaseModel):
     prompt: str  # The actual prompt sent
     response: str  # Raw response from LLM
     duration_ms: float | None = None
+    input_tokens: int | None = None
+    output_tokens: int | None = None
+    cached_input_tokens: int | None = None  # Input tokens served from the provider's prompt cache
+    cache_creation_input_tokens: int | None = None  # Input tokens written to the prompt cache
+    estimated_cost_usd: float | None = None
 
 
 class QueryTrace(BaseModel):
     """Full execution trace for a query."""
     mlflow_trace_id: str | None = None  # MLflow trace ID for linking
-    mlflow_run_id: str | None = None  # MLflow run ID
+    mlflow_run_id: str | None = None  # MLflow run ID (None until a background-exported run exists)
+    mlflow_query_id: str | None = None  # Run tag / root span attribute "query_id"
     intent: IntentType | None = None
     intent_confidence: str | None = None
     strategy: RetrievalStrategy | None = None
@@ -148,6 +157,9 @@ class QueryTrace(BaseModel):
     total_duration_ms: float | None = None
     steps: list[dict[str, Any]] = Field(default_factory=list)  # Ordered list of steps for timeline
     llm_calls: list[LLMCall] = Field(default_factory=list)  # Raw LLM inputs/outputs for debugging
+    deadline: dict[str, Any] | None = None  # Budget, elapsed time and degradations taken
+    token_usage: dict[str, Any] | None = None  # Tokens and estimated cost per step and in total
+    profile: dict[str, Any] | None = None  # Profiler summary: top functions by self time, storage locations
 
 
 class QueryResponse(BaseModel):
@@ -5,6 +5,8 @@ from .intent_classifier import IntentClassifier
 from .strategy_selector import StrategySelector
 from .context_evaluator import ContextEvaluator
 from .constraint_validator import ConstraintValidator
+from .constraint_filters import compile_constraint_filters
+from .deadline import Deadline, QueryCancelled
 from .orchestrator import Orchestrator
 
 __all__ = [
@@ -12,5 +14,8 @@ __all__ = [
     "StrategySelector",
     "ContextEvaluator",
     "ConstraintValidator",
+    "compile_constraint_filters",
+    "Deadline",
+    "QueryCancelled",
     "Orchestrator",
 ]
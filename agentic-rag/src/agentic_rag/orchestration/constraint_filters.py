@@ -0,0 +1,162 @@
+# constraint_filters.py
+"""Compile extracted query constraints into per-source Qdrant payload filters."""
+
+import re
+from datetime import date
+from typing import TYPE_CHECKING, Any
+
+from agentic_rag.models import SourceType
+
+if TYPE_CHECKING:
+    # constraint_validator imports this module (via constraint_matcher)
+    from .constraint_validator import QueryConstraints
+
+
+MONTHS = {
+    name: index
+    for index, names in enumerate(
+        [
+            ("january", "jan"), ("february", "feb"), ("march", "mar"),
+            ("april", "apr"), ("may",), ("june", "jun"), ("july", "jul"),
+            ("august", "aug"), ("september", "sep", "sept"), ("october", "oct"),
+            ("november", "nov"), ("december", "dec"),
+        ],
+        start=1,
+    )
+    for name in names
+}
+
+YEAR_PATTERN = re.compile(r"^(\d{4})$")
+YEAR_MONTH_PATTERN = re.compile(r"^(\d{4})-(\d{1,2})$")
+ISO_DATE_PATTERN = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})")
+US_DATE_PATTERN = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$")
+MONTH_YEAR_PATTERN = re.compile(r"^([a-z]+)\.?\s+(\d{4})$")
+
+# Payload field holding the event/publication date for each source
+DATE_FIELDS = {
+    SourceType.INCIDENTS: "event_date",
+    SourceType.NEWS: "publish_date",
+}
+
+
+def _next_month(year: int, month: int) -> date:
+    return date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+
+
+def parse_date_bounds(value: str | None) -> tuple[date, date] | None:
+    """
+    Parse a free-text date constraint into a half-open [start, end) range.
+
+    Handles "2023", "2023-03", "2023-03-15", "3/15/2023" and "March 2023".
+    Relative expressions ("last month") return None and are left to the
+    post-retrieval validator.
+    """
+    if not value:
+        return None
+    text = value.strip().lower()
+
+    try:
+        if match := YEAR_PATTERN.match(text):
+            year = int(match.group(1))
+            return date(year, 1, 1), date(year + 1, 1, 1)
+
+        if match := YEAR_MONTH_PATTERN.match(text):
+            year, month = int(match.group(1)), int(match.group(2))
+            return date(year, month, 1), _next_month(year, month)
+
+        if match := ISO_DATE_PATTERN.match(text):
+            day = date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+            return day, date.fromordinal(day.toordinal() + 1)
+
+        if match := US_DATE_PATTERN.match(text):
+            day = date(int(match.group(3)), int(match.group(1)), int(match.group(2)))
+            return day, date.fromordinal(day.toordinal() + 1)
+
+        if (match := MONTH_YEAR_PATTERN.match(text)) and match.group(1) in MONTHS:
+            year, month = int(match.group(2)), MONTHS[match.group(1)]
+            return date(year, month, 1), _next_month(year, month)
+    except ValueError:
+        return None
+
+    return None
+
+
+def _date_range_filter(constraints: "QueryConstraints") -> dict[str, str] | None:
+    """Build a {"$gte", "$lt"} range from the date constraints, if parseable."""
+    start, end = None, None
+
+    if constraints.date_range_start or constraints.date_range_end:
+        start_bounds = parse_date_bounds(constraints.date_range_start)
+        end_bounds = parse_date_bounds(constraints.date_range_end)
+        start = start_bounds[0] if start_bounds else None
+        end = end_bounds[1] if end_bounds else None
+    elif constraints.date:
+        bounds = parse_date_bounds(constraints.date)
+        if bounds:
+            start, end = bounds
+
+    if not (start or end):
+        return None
+
+    range_filter = {}
+    if start:
+        range_filter["$gte"] = start.isoformat()
+    if end:
+        range_filter["$lt"] = end.isoformat()
+    return range_filter
+
+
+def _regulation_filter(regulation: str) -> dict[str, Any]:
+    """Map "91.103", "§91.103" or "Part 61" to a section or part filter."""
+    normalized = regulation.replace("§", "").strip()
+    part_match = re.match(r"^part\s+(\d+)$", normalized, re.IGNORECASE)
+    if part_match:
+        return {"part": part_match.group(1)}
+    normalized = re.sub(r"^part\s+", "", normalized, flags=re.IGNORECASE)
+    if "." in normalized:
+        return {"section": normalized}
+    return {"part": normalized}
+
+
+def compile_constraint_filters(constraints: "QueryConstraints") -> dict[SourceType, dict[str, Any]]:
+    """
+    Compile query constraints into VectorStore filter dicts, one per source.
+
+    Only constraints that match a payload field exactly after normalization
+    are pushed down: event ID, registration, ISO date range and regulation
+    part/section. Location and aircraft are left to the post-retrieval
+    validator, which matches them case-insensitively against text and
+    metadata; Qdrant MatchText without a full-text index is a case-sensitive
+    substring match ("Cessna 172" would miss "CESSNA 172S").
+
+    A source with no applicable constraints is omitted and searched
+    unfiltered.
+
+    Args:
+        constraints: Constraints extracted from the question
+
+    Returns:
+        Mapping of source type to filter dict (see vector_store module docstring)
+    """
+    filters: dict[SourceType, dict[str, Any]] = {}
+    if not constraints.has_constraints():
+        return filters
+
+    incidents: dict[str, Any] = {}
+    if constraints.registration:
+        incidents["registration"] = constraints.registration.strip().upper()
+    if constraints.event_id:
+        incidents["event_id"] = constraints.event_id.strip().upper()
+
+    date_range = _date_range_filter(constraints)
+    if date_range:
+        incidents[DATE_FIELDS[SourceType.INCIDENTS]] = date_range
+        filters[SourceType.NEWS] = {DATE_FIELDS[SourceType.NEWS]: date_range}
+
+    if incidents:
+        filters[SourceType.INCIDENTS] = incidents
+
+    if constraints.regulation:
+        filters[SourceType.REGULATIONS] = _regulation_filter(constraints.regulation)
+
+    return filters
@@ -0,0 +1,183 @@
+# constraint_matcher.py
+"""Compiled constraint matching over retrieved documents.
+
+Documents are normalized once into columns (lowercased text and the
+metadata fields the constraints look at, plus the event/publication date
+parsed from ISO). Constraints are compiled once: lowercased needles, a
+regulation-section regex and a parsed date range. Matching then returns
+one bitmask per document, bit i set when the document satisfies the i-th
+active constraint, so validation, coverage and deduplication all read the
+same result instead of re-scanning the documents per constraint.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING, Callable
+
+from agentic_rag.models import Document
+
+from .constraint_filters import parse_date_bounds
+
+if TYPE_CHECKING:
+    from .constraint_validator import QueryConstraints
+
+# "§91.103", "Part 91.103", "14 CFR 91.103" -> "91.103"
+REGULATION_PREFIX_PATTERN = re.compile(r"§|\b14\s*CFR\s*|\bPart\s+", re.IGNORECASE)
+
+
+def _field(metadata: dict, key: str) -> str:
+    return str(metadata.get(key) or "").lower()
+
+
+def _iso_day(value: str) -> date | None:
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+@dataclass(slots=True)
+class DocumentColumns:
+    """Documents normalized into per-field columns, aligned by position."""
+    ids: list[str]
+    text: list[str]  # Original case: regulation sections are matched case-sensitively
+    text_lower: list[str]
+    location: list[str]
+    dates: list[str]  # event_date and publish_date, lowercased
+    days: list[date | None]  # event_date or publish_date parsed as an ISO date
+    aircraft: list[str]
+    registration: list[str]
+    event_id: list[str]
+    section: list[str]
+
+    @classmethod
+    def from_documents(cls, documents: list[Document]) -> "DocumentColumns":
+        dates = [
+            f"{_field(doc.metadata, 'event_date')} {_field(doc.metadata, 'publish_date')}"
+            for doc in documents
+        ]
+        return cls(
+            ids=[doc.id for doc in documents],
+            text=[doc.text for doc in documents],
+            text_lower=[doc.text.lower() for doc in documents],
+            location=[_field(doc.metadata, "location") for doc in documents],
+            dates=dates,
+            days=[_iso_day(value.strip()) for value in dates],
+            aircraft=[_field(doc.metadata, "aircraft") for doc in documents],
+            registration=[_field(doc.metadata, "registration") for doc in documents],
+            event_id=[_field(doc.metadata, "event_id") for doc in documents],
+            section=[str(doc.metadata.get("section") or "") for doc in documents],
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+# A compiled constraint: columns -> per-document hit list
+ColumnCheck = Callable[[DocumentColumns], list[bool]]
+
+
+def _text_or_field(needle: str, column: str) -> ColumnCheck:
+    """Case-insensitive substring of the text or of one metadata column."""
+    needle = needle.lower()
+
+    def check(columns: DocumentColumns) -> list[bool]:
+        return [
+            needle in text or needle in value
+            for text, value in zip(columns.text_lower, getattr(columns, column))
+        ]
+    return check
+
+
+def _date_check(value: str) -> ColumnCheck:
+    """Substring of the text or date fields, or an ISO date inside the parsed range."""
+    needle = value.lower()
+    bounds = parse_date_bounds(value)
+
+    def check(columns: DocumentColumns) -> list[bool]:
+        hits = [needle in text or needle in dates for text, dates in zip(columns.text_lower, columns.dates)]
+        if bounds:
+            start, end = bounds
+            hits = [hit or (day is not None and start <= day < end) for hit, day in zip(hits, columns.days)]
+        return hits
+    return check
+
+
+def _regulation_check(regulation: str) -> ColumnCheck:
+    """Section number in the text or section field, not as part of a longer number."""
+    section = REGULATION_PREFIX_PATTERN.sub("", regulation).strip()
+    # 91.10 must not match 91.103; 61 must not match 1961
+    pattern = re.compile(rf"(?<![\d.]){re.escape(section)}(?!\d)")
+
+    def check(columns: DocumentColumns) -> list[bool]:
+        return [
+            bool(pattern.search(text) or pattern.search(value))
+            for text, value in zip(columns.text, columns.section)
+        ]
+    return check
+
+
+class ConstraintMatcher:
+    """Query constraints compiled for matching against DocumentColumns."""
+
+    def __init__(self, constraints: "QueryConstraints"):
+        # (label, check) per active constraint; the index is the bit in the masks
+        compiled: list[tuple[str, ColumnCheck]] = []
+        if constraints.location:
+            compiled.append((f"location: {constraints.location}", _text_or_field(constraints.location, "location")))
+        if constraints.date:
+            compiled.append((f"date: {constraints.date}", _date_check(constraints.date)))
+        if constraints.aircraft_type:
+            compiled.append((
+                f"aircraft: {constraints.aircraft_type}",
+                _text_or_field(constraints.aircraft_type, "aircraft"),
+            ))
+        if constraints.registration:
+            compiled.append((
+                f"registration: {constraints.registration}",
+                _text_or_field(constraints.registration, "registration"),
+            ))
+        if constraints.event_id:
+            compiled.append((f"event_id: {constraints.event_id}", _text_or_field(constraints.event_id, "event_id")))
+        if constraints.regulation:
+            compiled.append((f"regulation: {constraints.regulation}", _regulation_check(constraints.regulation)))
+
+        self.labels = [label for label, _ in compiled]
+        self._checks = [check for _, check in compiled]
+
+    def match(self, columns: DocumentColumns) -> list[int]:
+        """Bitmask per document: bit i set when it satisfies constraint i."""
+        masks = [0] * len(columns)
+        for bit, check in enumerate(self._checks):
+            flag = 1 << bit
+            for i, hit in enumerate(check(columns)):
+                if hit:
+                    masks[i] |= flag
+        return masks
+
+    def unmatched(self, masks: list[int]) -> list[str]:
+        """Labels of constraints no document satisfies."""
+        covered = 0
+        for mask in masks:
+            covered |= mask
+        return [label for bit, label in enumerate(self.labels) if not covered >> bit & 1]
+
+    @staticmethod
+    def matched_indices(masks: list[int], columns: DocumentColumns) -> list[int]:
+        """Positions of matching documents, unique by id.
+
+        Ordered by the first constraint each document satisfies, then by
+        position, i.e. the order of listing each constraint's matches in turn.
+        """
+        order = sorted(
+            (i for i, mask in enumerate(masks) if mask),
+            key=lambda i: ((masks[i] & -masks[i]).bit_length(), i),
+        )
+        seen_ids = set()
+        unique = []
+        for i in order:
+            if columns.ids[i] not in seen_ids:
+                seen_ids.add(columns.ids[i])
+                unique.append(i)
+        return unique
@@ -2,19 +2,14 @@
 """Evaluate whether retrieved context is sufficient to answer the question."""
 
 import json
+from dataclasses import dataclass, field
 
 from agentic_rag.config import get_settings
-from agentic_rag.llm import get_llm_client
+from agentic_rag.llm import get_llm_client, prompt_messages
 from agentic_rag.models import Document, IntentType, SourceType
 
 
-EVALUATE_PROMPT = """You are evaluating whether the retrieved context is SUFFICIENT to answer the user's question.
-
-Question: {question}
-Intent: {intent}
-
-Retrieved Context:
-{context}
+EVALUATE_SYSTEM_PROMPT = """You are evaluating whether the retrieved context is SUFFICIENT to answer the user's question.
 
 Evaluate:
 1. Does the context contain the necessary information to answer the question?
@@ -22,14 +17,20 @@ Evaluate:
 3. Which sources would help fill the gaps?
 
 Output JSON:
-{{
+{
     "is_sufficient": true/false,
     "confidence": "high"/"medium"/"low",
     "missing_aspects": ["list of missing information"],
     "suggested_sources": ["incidents", "regulations", "news"],
     "suggested_queries": ["additional queries to run"],
     "reasoning": "explanation"
-}}"""
+}"""
+
+EVALUATE_PROMPT = """Question: {question}
+Intent: {intent}
+
+Retrieved Context:
+{context}"""
 
 
 class EvaluationResult:
@@ -52,13 +53,85 @@ class EvaluationResult:
         self.reasoning = reasoning
 
 
+@dataclass
+class SufficiencyScore:
+    """Cheap, LLM-free sufficiency estimate in [0, 1]."""
+    score: float
+    verdict: str  # "sufficient", "insufficient" or "uncertain"
+    components: dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "score": round(self.score, 3),
+            "verdict": self.verdict,
+            **{k: round(v, 3) for k, v in self.components.items()},
+        }
+
+
 class ContextEvaluator:
     """Evaluate context sufficiency."""
 
+    # Retrieval similarity normalization (cosine scores from the vector store)
+    SIMILARITY_FLOOR = 0.2  # mean top-3 similarity at or below this scores 0
+    SIMILARITY_CEILING = 0.6  # ... and at or above this scores 1
+    STRONG_SIMILARITY = 0.45
+    STRONG_DOCUMENTS_NEEDED = 3
+
     def __init__(self):
         settings = get_settings()
         self.llm = get_llm_client()
         self.model = settings.refinement_model
+        self.accept_threshold = settings.sufficiency_accept_threshold
+        self.reject_threshold = settings.sufficiency_reject_threshold
+
+    def score(
+        self,
+        documents: list[Document],
+        expected_sources: list[SourceType],
+        constraint_coverage: float | None = None,
+    ) -> SufficiencyScore:
+        """
+        Score sufficiency from retrieval scores, source and constraint coverage.
+
+        Args:
+            documents: Documents retrieved so far
+            expected_sources: Sources the retrieval plan queried
+            constraint_coverage: Fraction of query constraints matched by the
+                documents, or None if the query had no constraints
+
+        Returns:
+            SufficiencyScore; "uncertain" when the score falls between the
+            reject and accept thresholds and the LLM evaluator should decide
+        """
+        if not documents:
+            return SufficiencyScore(score=0.0, verdict="insufficient")
+
+        scores = sorted((doc.score for doc in documents), reverse=True)
+        top_mean = sum(scores[:3]) / len(scores[:3])
+        similarity = (top_mean - self.SIMILARITY_FLOOR) / (self.SIMILARITY_CEILING - self.SIMILARITY_FLOOR)
+        strong = sum(1 for score in scores if score >= self.STRONG_SIMILARITY)
+
+        components = {
+            "retrieval_strength": (
+                min(max(similarity, 0.0), 1.0)
+                + min(strong / self.STRONG_DOCUMENTS_NEEDED, 1.0)
+            ) / 2,
+        }
+        if expected_sources:
+            found = {doc.source for doc in documents}
+            components["source_coverage"] = sum(1 for s in expected_sources if s in found) / len(expected_sources)
+        if constraint_coverage is not None:
+            components["constraint_coverage"] = constraint_coverage
+
+        total = sum(components.values()) / len(components)
+
+        if total >= self.accept_threshold:
+            verdict = "sufficient"
+        elif total < self.reject_threshold:
+            verdict = "insufficient"
+        else:
+            verdict = "uncertain"
+        return SufficiencyScore(score=total, verdict=verdict, components=components)
 
     def evaluate(
         self,
@@ -80,16 +153,14 @@ class ContextEvaluator:
         context_text = self._format_context(documents)
 
         response = self.llm.chat(
-            messages=[
-                {
-                    "role": "user",
-                    "content": EVALUATE_PROMPT.format(
-                        question=question,
-                        intent=intent.value,
-                        context=context_text,
-                    ),
-                }
-            ],
+            messages=prompt_messages(
+                EVALUATE_SYSTEM_PROMPT,
+                EVALUATE_PROMPT.format(
+                    question=question,
+                    intent=intent.value,
+                    context=context_text,
+                ),
+            ),
             model=self.model,
             temperature=0,
             json_output=True,
@@ -0,0 +1,69 @@
+# deadline.py
+"""Request deadline tracking and graceful degradation.
+
+A Deadline is created from the request's latency budget and checked before
+each optional or expensive stage. When the time left can't cover a stage
+plus everything after it, the orchestrator takes a cheaper path and records
+the degradation, so the trace shows exactly what was given up to meet the
+deadline.
+
+A deadline can also carry a cancellation flag (e.g. set when a streaming
+client disconnects); check_cancelled() stops the query at the next stage
+boundary so no further model calls are made for it.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+
+
+class QueryCancelled(Exception):
+    """The query was cancelled (its client went away) and stopped early."""
+
+
+@dataclass
+class Deadline:
+    """Time budget for one query."""
+    budget_ms: float | None  # None: no deadline, nothing degrades
+    started_at: float = field(default_factory=time.time)
+    degradations: list[dict] = field(default_factory=list)
+    cancelled: threading.Event | None = None  # Set to stop the query at the next stage
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget_ms is not None
+
+    def elapsed_ms(self) -> float:
+        return (time.time() - self.started_at) * 1000
+
+    def remaining_ms(self) -> float:
+        """Time left in the budget (infinite without a deadline, negative once missed)."""
+        if self.budget_ms is None:
+            return float("inf")
+        return self.budget_ms - self.elapsed_ms()
+
+    def allows(self, needed_ms: float) -> bool:
+        """Whether the remaining budget covers a stage expected to take needed_ms."""
+        return self.remaining_ms() >= needed_ms
+
+    def check_cancelled(self) -> None:
+        """Raise QueryCancelled if the cancellation flag is set."""
+        if self.cancelled is not None and self.cancelled.is_set():
+            raise QueryCancelled(f"query cancelled after {self.elapsed_ms():.0f}ms")
+
+    def degrade(self, action: str, reason: str) -> None:
+        """Record a degradation taken to stay within the deadline."""
+        self.degradations.append({
+            "action": action,
+            "reason": reason,
+            "at_ms": round(self.elapsed_ms(), 1),
+            "remaining_ms": round(self.remaining_ms(), 1),
+        })
+
+    def to_dict(self) -> dict:
+        return {
+            "budget_ms": self.budget_ms,
+            "elapsed_ms": round(self.elapsed_ms(), 1),
+            "met": self.remaining_ms() >= 0,
+            "degradations": self.degradations,
+        }
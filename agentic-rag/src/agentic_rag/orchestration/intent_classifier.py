@@ -6,7 +6,7 @@ import time
 from dataclasses import dataclass
 
 from agentic_rag.config import get_settings
-from agentic_rag.llm import get_llm_client
+from agentic_rag.llm import get_llm_client, prompt_messages
 from agentic_rag.models import IntentType, RefinementMode, LLMCall
 from agentic_rag.tracing.mlflow_tracer import get_mlflow_tracer
 
@@ -20,7 +20,7 @@ class IntentClassificationResult:
     llm_call: LLMCall
 
 
-INTENT_PROMPT = """Classify the user's question about aviation safety into one of these intent types:
+INTENT_SYSTEM_PROMPT = """Classify the user's question about aviation safety into one of these intent types:
 
 - CAUSAL: Questions about what caused something (accidents, failures, incidents)
 - COMPLIANCE: Questions about legal/regulatory compliance (was X allowed, was Y certified)
@@ -29,8 +29,6 @@ INTENT_PROMPT = """Classify the user's question about aviation safety into one o
 - REGULATORY: Questions about what regulations say (not checking compliance, just asking about rules)
 - MULTI_SOURCE: Complex questions requiring cross-referencing multiple sources
 
-Question: {question}
-
 Output JSON with:
 - "intent": one of [causal, compliance, factual, comparative, regulatory, multi_source]
 - "confidence": high, medium, or low
@@ -38,7 +36,9 @@ Output JSON with:
 - "suggested_refinement": one of [none, dedup, synthesize] - which refinement mode best suits this question
 
 Example:
-{{"intent": "compliance", "confidence": "high", "reasoning": "User is asking whether the pilot met legal requirements", "suggested_refinement": "dedup"}}"""
+{"intent": "compliance", "confidence": "high", "reasoning": "User is asking whether the pilot met legal requirements", "suggested_refinement": "dedup"}"""
+
+INTENT_PROMPT = """Question: {question}"""
 
 
 class IntentClassifier:
@@ -68,7 +68,7 @@ class IntentClassifier:
             })
 
             response = self.llm.chat(
-                messages=[{"role": "user", "content": prompt}],
+                messages=prompt_messages(INTENT_SYSTEM_PROMPT, prompt),
                 model=self.model,
                 temperature=0,
                 json_output=True,
@@ -83,9 +83,10 @@ class IntentClassifier:
         llm_call = LLMCall(
             step="intent_classification",
             model=self.model,
-            prompt=prompt,
+            prompt=f"{INTENT_SYSTEM_PROMPT}\n\n{prompt}",
             response=response,
             duration_ms=duration_ms,
+            **self.llm.usage_fields(),
         )
 
         try:
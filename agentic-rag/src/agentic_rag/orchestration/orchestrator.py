@@ -1,8 +1,10 @@
 # orchestrator.py
 """Main orchestration logic for agentic RAG."""
 
+import random
+import threading
 import time
-from typing import Any
+from typing import Any, Callable
 
 from agentic_rag.config import get_settings
 from agentic_rag.models import (
@@ -17,16 +19,21 @@ from agentic_rag.models import (
     SourceType,
     StructuredAnswer,
 )
-from agentic_rag.retrieval import IncidentRetriever, RegulationRetriever, NewsRetriever
+from agentic_rag.retrieval import BaseRetriever, IncidentRetriever, RegulationRetriever, NewsRetriever
 from agentic_rag.refinement import ContextRefiner
 from agentic_rag.reranking.reranker import get_reranker
-from agentic_rag.generation import AnswerGenerator
+from agentic_rag.generation import AnswerGenerator, ModelRouter
+from agentic_rag.tokens import record_token_usage
 from agentic_rag.tracing.mlflow_tracer import get_mlflow_tracer
+from agentic_rag.tracing.telemetry import get_telemetry
+from agentic_rag.tracing.profiling import get_query_profiler
 
 from .intent_classifier import IntentClassifier
 from .strategy_selector import StrategySelector, RetrievalPlan
 from .context_evaluator import ContextEvaluator
 from .constraint_validator import ConstraintValidator
+from .constraint_filters import compile_constraint_filters
+from .deadline import Deadline
 
 
 class Orchestrator:
@@ -44,7 +51,16 @@ class Orchestrator:
 
     MAX_ITERATIONS = 3
 
-    def __init__(self):
+    # Refinement modes that make an LLM call (skipped first under a tight deadline)
+    LLM_REFINEMENT_MODES = {RefinementMode.DEDUP, RefinementMode.SYNTHESIZE, RefinementMode.FILTER}
+
+    def __init__(self, retrievers: dict[SourceType, BaseRetriever] | None = None):
+        """
+        Args:
+            retrievers: Retriever per source (default: Qdrant-backed retrievers)
+        """
+        self._settings = get_settings()
+
         # Components
         self.intent_classifier = IntentClassifier()
         self.strategy_selector = StrategySelector()
@@ -52,21 +68,38 @@ class Orchestrator:
         self.context_refiner = ContextRefiner()
         self.constraint_validator = ConstraintValidator()
         self.generator = AnswerGenerator()
+        self.model_router = ModelRouter()
 
         # Retrievers
-        self.retrievers = {
+        self.retrievers = retrievers or {
             SourceType.INCIDENTS: IncidentRetriever(),
             SourceType.REGULATIONS: RegulationRetriever(),
             SourceType.NEWS: NewsRetriever(),
         }
 
-    async def query(self, request: QueryRequest) -> QueryResponse:
-        """Execute an agentic RAG query."""
+    async def query(
+        self,
+        request: QueryRequest,
+        on_event: Callable[[str, dict], None] | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> QueryResponse:
+        """
+        Execute an agentic RAG query.
+
+        Args:
+            request: Query request
+            on_event: Optional callback for streaming progress. Called with
+                ("step", step) as each pipeline step completes and
+                ("token", {"text": ...}) for each piece of the answer summary.
+            cancelled: Optional flag; once set, the query raises
+                QueryCancelled at the next stage boundary or streamed token
+        """
         # Get MLflow tracer
         mlflow_tracer = get_mlflow_tracer()
 
-        # Run query with MLflow tracking and tracing
-        with mlflow_tracer.start_run(run_name=f"query-{request.question[:30]}"):
+        # Run query with MLflow tracking and tracing, and metrics/OTLP telemetry
+        with get_telemetry().query("agentic", {"refinement_mode": request.refinement_mode.value}), \
+                mlflow_tracer.start_run(run_name="query", question=request.question):
             with mlflow_tracer.start_trace(
                 "agentic_rag_pipeline",
                 inputs={
@@ -75,22 +108,41 @@ class Orchestrator:
                     "top_k": request.top_k,
                 }
             ) as root_span:
-                return await self._execute_query(request, mlflow_tracer, root_span)
-
-    async def _execute_query(self, request: QueryRequest, mlflow_tracer, root_span) -> QueryResponse:
+                profiler = get_query_profiler()
+                if not profiler.should_profile(request.profile):
+                    response = await self._execute_query(request, mlflow_tracer, root_span, on_event, cancelled)
+                else:
+                    with profiler.capture("agentic-query") as profile:
+                        response = await self._execute_query(request, mlflow_tracer, root_span, on_event, cancelled)
+                    if response.trace is not None:
+                        response.trace.profile = profile.to_dict()
+
+                # Read at the end: a background-exported run gets its run_id asynchronously
+                if response.trace is not None:
+                    response.trace.mlflow_run_id, response.trace.mlflow_query_id = mlflow_tracer.current_run_ids()
+                return response
+
+    async def _execute_query(
+        self,
+        request: QueryRequest,
+        mlflow_tracer,
+        root_span,
+        on_event: Callable[[str, dict], None] | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> QueryResponse:
         """Internal query execution with MLflow logging and tracing."""
         start_time = time.time()
+        telemetry = get_telemetry()
         trace = QueryTrace()
+        deadline = Deadline(
+            budget_ms=request.deadline_ms or self._settings.default_deadline_ms,
+            started_at=start_time,
+            cancelled=cancelled,
+        )
 
-        # Capture MLflow trace/run IDs
-        try:
-            import mlflow
-            if mlflow.active_run():
-                trace.mlflow_run_id = mlflow.active_run().info.run_id
-            if root_span:
-                trace.mlflow_trace_id = getattr(root_span, 'request_id', None)
-        except Exception:
-            pass
+        # Capture the MLflow trace ID (run IDs are filled in by query())
+        if root_span:
+            trace.mlflow_trace_id = getattr(root_span, 'request_id', None)
 
         # Log query parameters to MLflow
         mlflow_tracer.log_query_params(
@@ -117,7 +169,8 @@ class Orchestrator:
                 "constraints": constraint_dict,
             })
         step_duration = (time.time() - step_start) * 1000
-        trace.steps.append({
+        telemetry.observe_stage("agentic", "constraints", step_duration, "extraction")
+        self._add_step(trace, on_event, {
             "name": "Constraint Extraction",
             "type": "tool",
             "duration_ms": step_duration,
@@ -129,6 +182,9 @@ class Orchestrator:
             trace.constraints = constraint_dict
             mlflow_tracer.log_constraints(trace.constraints)
 
+        # Push constraints into retrieval as server-side payload filters
+        source_filters = compile_constraint_filters(constraints)
+
         # Step 1: Classify intent (traced)
         step_start = time.time()
         with mlflow_tracer.trace_intent_classification(request.question) as span:
@@ -142,7 +198,8 @@ class Orchestrator:
                 "suggested_refinement": suggested_refinement.value if suggested_refinement else None,
             })
         step_duration = (time.time() - step_start) * 1000
-        trace.steps.append({
+        telemetry.observe_stage("agentic", "intent", step_duration)
+        self._add_step(trace, on_event, {
             "name": "Intent Classification",
             "type": "llm",
             "duration_ms": step_duration,
@@ -173,7 +230,8 @@ class Orchestrator:
                 "source_order": [s.value for s in plan.source_order] if plan.source_order else None,
             })
         step_duration = (time.time() - step_start) * 1000
-        trace.steps.append({
+        telemetry.observe_stage("agentic", "strategy", step_duration, plan.strategy.value)
+        self._add_step(trace, on_event, {
             "name": "Strategy Selection",
             "type": "chain",
             "duration_ms": step_duration,
@@ -187,10 +245,17 @@ class Orchestrator:
 
         # Step 3: Execute retrieval (traced per iteration)
         all_documents: list[Document] = []
+        seen_documents: set[tuple[SourceType, str]] = set()
         iteration = 0
+        retrieval_top_k = request.top_k
+        llm_evaluations = llm_evaluations_avoided = 0
+        shadow_agreements = shadow_evaluations = 0
 
         while iteration < self.MAX_ITERATIONS:
+            deadline.check_cancelled()
             iteration += 1
+            if iteration > 1:
+                telemetry.record_retry("retrieval_iteration")
 
             # Retrieve based on strategy (traced)
             with mlflow_tracer.trace_retrieval(
@@ -199,7 +264,8 @@ class Orchestrator:
                 iteration
             ) as span:
                 retrieval_start = time.time()
-                docs = await self._execute_retrieval(plan, request.top_k)
+                prefilters: list[dict] = []
+                docs = await self._execute_retrieval(plan, retrieval_top_k, source_filters, prefilters)
                 retrieval_duration = (time.time() - retrieval_start) * 1000
 
                 mlflow_tracer.set_span_outputs(span, {
@@ -214,24 +280,61 @@ class Orchestrator:
                 "sources": [s.value for s in plan.sources],
                 "documents_retrieved": len(docs),
                 "duration_ms": retrieval_duration,
+                "prefilters": prefilters,
             })
-            trace.steps.append({
+            self._add_step(trace, on_event, {
                 "name": f"Retrieval (iteration {iteration})",
                 "type": "retriever",
                 "duration_ms": retrieval_duration,
                 "status": "success",
-                "details": {"documents": len(docs), "sources": [s.value for s in plan.sources]},
+                "details": {
+                    "documents": len(docs),
+                    "sources": [s.value for s in plan.sources],
+                    "filtered_sources": [p["source"] for p in prefilters if p["applied"]],
+                    "filter_fallbacks": [p["source"] for p in prefilters if p["fallback"]],
+                },
             })
             mlflow_tracer.log_retrieval_metrics(len(docs), retrieval_duration, iteration)
 
-            all_documents.extend(docs)
+            # Later iterations can return documents already retrieved
+            for doc in docs:
+                if (doc.source, doc.id) not in seen_documents:
+                    seen_documents.add((doc.source, doc.id))
+                    all_documents.append(doc)
 
             # Step 4: Quick sufficiency check
             if self.context_evaluator.quick_check(intent, all_documents):
                 break
 
-            # Step 5: Full sufficiency evaluation (for iterative strategy, traced)
-            if plan.strategy == RetrievalStrategy.ITERATIVE:
+            # Step 5: Sufficiency evaluation (iterative strategy only)
+            if plan.strategy != RetrievalStrategy.ITERATIVE:
+                # Non-iterative strategies stop after one retrieval
+                break
+
+            # Cheap score first; the LLM evaluator only decides uncertain cases
+            # with an iteration left to act on its suggestions
+            sufficiency = self.context_evaluator.score(
+                all_documents,
+                plan.sources,
+                constraint_coverage=(
+                    self.constraint_validator.coverage(constraints, all_documents)
+                    if constraints.has_constraints() else None
+                ),
+            )
+            check = {"iteration": iteration, "score": sufficiency.to_dict()}
+            last_iteration = iteration == self.MAX_ITERATIONS
+            if not last_iteration and not deadline.allows(
+                self._settings.deadline_iteration_ms
+                + self._downstream_ms(request.reranking_mode, refinement_mode)
+            ):
+                last_iteration = True
+                if sufficiency.verdict != "sufficient":
+                    deadline.degrade("iterations_capped", f"stopped after iteration {iteration}")
+            use_llm = sufficiency.verdict == "uncertain" and not last_iteration
+            shadow = not use_llm and random.random() < self._settings.sufficiency_shadow_rate
+
+            eval_result = None
+            if use_llm or shadow:
                 with mlflow_tracer.trace_context_evaluation(
                     request.question, len(all_documents)
                 ) as span:
@@ -242,25 +345,41 @@ class Orchestrator:
                         "is_sufficient": eval_result.is_sufficient,
                         "missing_aspects": eval_result.missing_aspects,
                         "suggested_queries": eval_result.suggested_queries,
+                        "shadow": shadow,
                     })
 
-                trace.sufficiency_checks.append({
-                    "iteration": iteration,
-                    "is_sufficient": eval_result.is_sufficient,
-                    "missing": eval_result.missing_aspects,
-                })
-
-                if eval_result.is_sufficient:
-                    break
+            if use_llm:
+                llm_evaluations += 1
+                is_sufficient = eval_result.is_sufficient
+                check.update(method="llm", is_sufficient=is_sufficient, missing=eval_result.missing_aspects)
+            else:
+                llm_evaluations_avoided += 1
+                is_sufficient = sufficiency.verdict == "sufficient"
+                check.update(method="score", is_sufficient=is_sufficient, missing=[])
+                if shadow:
+                    agrees = eval_result.is_sufficient == is_sufficient
+                    shadow_evaluations += 1
+                    shadow_agreements += agrees
+                    check["shadow"] = {"llm_is_sufficient": eval_result.is_sufficient, "agrees": agrees}
+            trace.sufficiency_checks.append(check)
+
+            if is_sufficient or last_iteration:
+                break
 
+            if use_llm:
                 # Update plan for next iteration
                 if eval_result.suggested_queries:
                     for source in eval_result.suggested_sources:
                         if source in plan.queries_per_source:
                             plan.queries_per_source[source] = eval_result.suggested_queries[0]
             else:
-                # Non-iterative strategies stop after one retrieval
-                break
+                # Clearly insufficient: widen the next retrieval instead
+                retrieval_top_k *= 2
+
+        if plan.strategy == RetrievalStrategy.ITERATIVE:
+            mlflow_tracer.log_sufficiency_metrics(
+                llm_evaluations, llm_evaluations_avoided, shadow_agreements, shadow_evaluations
+            )
 
         # Step 6: Validate constraints (traced)
         step_start = time.time()
@@ -273,7 +392,8 @@ class Orchestrator:
                 "explanation": validation_result.explanation,
             })
         step_duration = (time.time() - step_start) * 1000
-        trace.steps.append({
+        telemetry.observe_stage("agentic", "constraints", step_duration, "validation")
+        self._add_step(trace, on_event, {
             "name": "Constraint Validation",
             "type": "tool",
             "duration_ms": step_duration,
@@ -297,6 +417,11 @@ class Orchestrator:
         if constraints.has_constraints() and not validation_result.is_valid:
             total_duration = (time.time() - start_time) * 1000
             trace.total_duration_ms = total_duration
+            trace.token_usage = record_token_usage(trace.llm_calls)
+            if deadline.enabled:
+                trace.deadline = deadline.to_dict()
+            telemetry.record_llm_calls(trace.llm_calls)
+            telemetry.record_degradations(deadline.degradations)
 
             # Build list of what we DO have
             available_locations = set()
@@ -342,7 +467,13 @@ class Orchestrator:
         )
 
         # Step 6.5: Rerank documents (traced)
+        deadline.check_cancelled()
         reranking_mode = request.reranking_mode
+        if reranking_mode != RerankingMode.NONE and not deadline.allows(
+            self._settings.deadline_reranking_ms + self._downstream_ms(RerankingMode.NONE, refinement_mode)
+        ):
+            deadline.degrade("reranking_skipped", f"{reranking_mode.value} reranking skipped")
+            reranking_mode = RerankingMode.NONE
         reranker = get_reranker(reranking_mode)
 
         reranking_start = time.time()
@@ -352,6 +483,7 @@ class Orchestrator:
             top_k=request.top_k  # Apply top_k after reranking
         )
         reranking_duration = (time.time() - reranking_start) * 1000
+        telemetry.observe_stage("agentic", "rerank", reranking_duration, reranking_mode.value)
 
         # Update documents for refinement with reranked results
         documents_for_refinement = reranking_result.documents
@@ -364,7 +496,7 @@ class Orchestrator:
             "output_count": reranking_result.output_count,
             "duration_ms": reranking_duration,
         }
-        trace.steps.append({
+        self._add_step(trace, on_event, {
             "name": "Reranking",
             "type": "model" if reranking_mode != RerankingMode.NONE else "tool",
             "duration_ms": reranking_duration,
@@ -378,12 +510,20 @@ class Orchestrator:
         })
 
         # Step 7: Refine context (traced)
+        deadline.check_cancelled()
+        if refinement_mode in self.LLM_REFINEMENT_MODES and not deadline.allows(
+            self._settings.deadline_refinement_ms + self._settings.deadline_fallback_generation_ms
+        ):
+            deadline.degrade("refinement_skipped", f"{refinement_mode.value} refinement replaced by none")
+            refinement_mode = RefinementMode.NONE
+
         with mlflow_tracer.trace_refinement(refinement_mode.value, len(documents_for_refinement)) as span:
             refinement_start = time.time()
             refinement_result = self.context_refiner.refine(
                 documents_for_refinement, request.question, refinement_mode
             )
             refinement_duration = (time.time() - refinement_start) * 1000
+            telemetry.observe_stage("agentic", "refinement", refinement_duration, refinement_mode.value)
 
             mlflow_tracer.set_span_outputs(span, {
                 "output_document_count": refinement_result.output_count,
@@ -398,7 +538,7 @@ class Orchestrator:
             "dropped": refinement_result.dropped,
             "duration_ms": refinement_duration,
         }
-        trace.steps.append({
+        self._add_step(trace, on_event, {
             "name": "Context Refinement",
             "type": "llm" if refinement_mode.value == "synthesize" else "tool",
             "duration_ms": refinement_duration,
@@ -418,6 +558,17 @@ class Orchestrator:
         )
 
         # Step 8: Generate answer (traced)
+        deadline.check_cancelled()
+        route = self.model_router.route(
+            intent,
+            refinement_result.documents,
+            constraint_count=sum(1 for value in constraint_dict.values() if value),
+        )
+        generation_model = route.model
+        if route.route == "large" and not deadline.allows(self._settings.deadline_generation_ms):
+            generation_model = self._settings.fallback_generation_model
+            deadline.degrade("generation_model_downgraded", f"generating with {generation_model}")
+
         with mlflow_tracer.trace_generation(
             request.question, intent.value, len(refinement_result.documents)
         ) as span:
@@ -426,6 +577,8 @@ class Orchestrator:
                 question=request.question,
                 intent=intent,
                 documents=refinement_result.documents,
+                model=generation_model,
+                on_token=self._token_callback(on_event, deadline),
             )
             answer = generation_result.answer
             generation_duration = (time.time() - generation_start) * 1000
@@ -443,23 +596,53 @@ class Orchestrator:
         # Collect LLM call from generation
         trace.llm_calls.append(generation_result.llm_call)
 
+        generation_usage = record_token_usage([generation_result.llm_call])["total"]
+        # A deadline downgrade turns a large route into a small one
+        route_taken = route.route if generation_model == route.model else "small"
+        telemetry.observe_stage("agentic", "generation", generation_duration, route_taken)
+        self.model_router.record(
+            route_taken,
+            generation_duration,
+            generation_usage["output_tokens"],
+            generation_usage["estimated_cost_usd"],
+        )
+        mlflow_tracer.log_generation_route(
+            route_taken,
+            generation_model,
+            generation_duration,
+            generation_usage["output_tokens"],
+            generation_usage["estimated_cost_usd"],
+        )
+
         trace.generation = {
             "duration_ms": generation_duration,
             "summary_length": len(answer.summary) if answer.summary else 0,
             "findings_count": len(answer.key_findings),
             "documents_used": len(refinement_result.documents),
+            "model": generation_model,
+            "route": {**route.to_dict(), "route": route_taken},
+            **generation_result.context,
         }
-        trace.steps.append({
+        self._add_step(trace, on_event, {
             "name": "Answer Generation",
             "type": "llm",
             "duration_ms": generation_duration,
             "status": "success",
-            "details": {"findings": len(answer.key_findings), "summary_chars": len(answer.summary) if answer.summary else 0},
+            "details": {
+                "findings": len(answer.key_findings),
+                "summary_chars": len(answer.summary) if answer.summary else 0,
+                "context_tokens": generation_result.context.get("context_tokens"),
+            },
         })
 
         # Finalize trace
         total_duration = (time.time() - start_time) * 1000
         trace.total_duration_ms = total_duration
+        trace.token_usage = record_token_usage(trace.llm_calls)
+        if deadline.enabled:
+            trace.deadline = deadline.to_dict()
+        telemetry.record_llm_calls(trace.llm_calls)
+        telemetry.record_degradations(deadline.degradations)
 
         # Set outputs on root span
         mlflow_tracer.set_span_outputs(root_span, {
@@ -479,10 +662,80 @@ class Orchestrator:
             trace=trace if request.include_trace else None,
         )
 
+    def _downstream_ms(self, reranking_mode: RerankingMode, refinement_mode: RefinementMode) -> float:
+        """Expected time for reranking, refinement and generation."""
+        expected = self._settings.deadline_generation_ms
+        if reranking_mode != RerankingMode.NONE:
+            expected += self._settings.deadline_reranking_ms
+        if refinement_mode in self.LLM_REFINEMENT_MODES:
+            expected += self._settings.deadline_refinement_ms
+        return expected
+
+    @staticmethod
+    def _token_callback(
+        on_event: Callable[[str, dict], None] | None,
+        deadline: Deadline,
+    ) -> Callable[[str], None] | None:
+        """Forward streamed summary text as token events, stopping the stream once cancelled."""
+        if not on_event:
+            return None
+
+        def on_token(text: str) -> None:
+            deadline.check_cancelled()
+            on_event("token", {"text": text})
+        return on_token
+
+    @staticmethod
+    def _add_step(
+        trace: QueryTrace,
+        on_event: Callable[[str, dict], None] | None,
+        step: dict[str, Any],
+    ) -> None:
+        """Record a completed pipeline step and report it to the event callback."""
+        trace.steps.append(step)
+        get_telemetry().record_step(step)
+        if on_event:
+            on_event("step", step)
+
+    def _retrieve_source(
+        self,
+        source: SourceType,
+        query: str,
+        top_k: int,
+        source_filters: dict[SourceType, dict[str, Any]] | None = None,
+        prefilters: list[dict] | None = None,
+    ) -> list[Document]:
+        """
+        Retrieve from one source, applying constraint pre-filters when present.
+
+        Falls back to an unfiltered search only when the filtered search comes
+        back empty, so constraint validation can still explain the miss.
+        """
+        start_time = time.time()
+        filters = (source_filters or {}).get(source)
+        result = self.retrievers[source].retrieve(query, top_k, filters=filters)
+        fallback = bool(filters) and not result.documents
+        if fallback:
+            get_telemetry().record_retry("filter_fallback")
+            result = self.retrievers[source].retrieve(query, top_k)
+        get_telemetry().observe_stage("agentic", "retrieval", (time.time() - start_time) * 1000, source.value)
+
+        if prefilters is not None and filters:
+            prefilters.append({
+                "source": source.value,
+                "filters": filters,
+                "applied": not fallback,
+                "fallback": fallback,
+                "documents": len(result.documents),
+            })
+        return result.documents
+
     async def _execute_retrieval(
         self,
         plan: RetrievalPlan,
         top_k: int,
+        source_filters: dict[SourceType, dict[str, Any]] | None = None,
+        prefilters: list[dict] | None = None,
     ) -> list[Document]:
         """Execute retrieval based on the plan."""
         documents = []
@@ -491,28 +744,28 @@ class Orchestrator:
             # Single source
             source = plan.sources[0]
             query = plan.queries_per_source.get(source, "")
-            result = self.retrievers[source].retrieve(query, top_k)
-            documents.extend(result.documents)
+            documents.extend(self._retrieve_source(source, query, top_k, source_filters, prefilters))
 
         elif plan.strategy == RetrievalStrategy.SEQUENTIAL:
             # Sources in order
             for source in plan.source_order:
                 query = plan.queries_per_source.get(source, "")
-                result = self.retrievers[source].retrieve(query, top_k // len(plan.sources))
-                documents.extend(result.documents)
+                documents.extend(self._retrieve_source(
+                    source, query, top_k // len(plan.sources), source_filters, prefilters
+                ))
 
         elif plan.strategy == RetrievalStrategy.PARALLEL:
             # All sources at once (could use asyncio.gather in production)
             for source in plan.sources:
                 query = plan.queries_per_source.get(source, "")
-                result = self.retrievers[source].retrieve(query, top_k // len(plan.sources))
-                documents.extend(result.documents)
+                documents.extend(self._retrieve_source(
+                    source, query, top_k // len(plan.sources), source_filters, prefilters
+                ))
 
         elif plan.strategy == RetrievalStrategy.ITERATIVE:
             # Start with primary source
             source = plan.sources[0]
             query = plan.queries_per_source.get(source, "")
-            result = self.retrievers[source].retrieve(query, top_k)
-            documents.extend(result.documents)
+            documents.extend(self._retrieve_source(source, query, top_k, source_filters, prefilters))
 
         return documents
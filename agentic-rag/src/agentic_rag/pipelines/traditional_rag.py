@@ -5,9 +5,11 @@ import time
 from typing import Any
 
 from agentic_rag.models import Document, SourceType, LLMCall
-from agentic_rag.retrieval import IncidentRetriever, RegulationRetriever, NewsRetriever
+from agentic_rag.retrieval import BaseRetriever, IncidentRetriever, RegulationRetriever, NewsRetriever
 from agentic_rag.generation import AnswerGenerator
+from agentic_rag.tokens import record_token_usage
 from agentic_rag.tracing.mlflow_tracer import get_mlflow_tracer
+from agentic_rag.tracing.telemetry import get_telemetry
 
 
 class TraditionalRAGTrace:
@@ -17,6 +19,7 @@ class TraditionalRAGTrace:
         self.total_duration_ms: float | None = None
         self.sources_used: list[str] = []
         self.mlflow_run_id: str | None = None
+        self.mlflow_query_id: str | None = None
         self.llm_calls: list[LLMCall] = []
 
 
@@ -33,8 +36,8 @@ class TraditionalRAG:
     No intent classification, no strategy, no refinement.
     """
 
-    def __init__(self):
-        self.retrievers = {
+    def __init__(self, retrievers: dict[SourceType, BaseRetriever] | None = None):
+        self.retrievers = retrievers or {
             SourceType.INCIDENTS: IncidentRetriever(),
             SourceType.REGULATIONS: RegulationRetriever(),
             SourceType.NEWS: NewsRetriever(),
@@ -54,22 +57,15 @@ class TraditionalRAG:
             (answer_text, documents_used, trace)
         """
         mlflow_tracer = get_mlflow_tracer()
+        telemetry = get_telemetry()
         trace = TraditionalRAGTrace() if include_trace else None
         start_time = time.time()
 
-        with mlflow_tracer.start_run(run_name=f"traditional-{question[:30]}"):
+        with telemetry.query("traditional"), mlflow_tracer.start_run(run_name="traditional", question=question):
             with mlflow_tracer.start_trace(
                 "traditional_rag_pipeline",
                 inputs={"question": question, "top_k": top_k}
             ) as root_span:
-                # Capture MLflow run ID
-                try:
-                    import mlflow
-                    if mlflow.active_run() and trace:
-                        trace.mlflow_run_id = mlflow.active_run().info.run_id
-                except Exception:
-                    pass
-
                 # Log parameters
                 mlflow_tracer.log_query_params(
                     question=question,
@@ -89,24 +85,27 @@ class TraditionalRAG:
                         try:
                             result = retriever.retrieve(question, top_k=per_source_k)
                             all_documents.extend(result.documents)
+                            step = {
+                                "name": f"Retrieve from {source_type.value}",
+                                "type": "retriever",
+                                "duration_ms": (time.time() - source_start) * 1000,
+                                "status": "success",
+                                "details": {"documents": len(result.documents)},
+                            }
                             if trace:
                                 trace.sources_used.append(source_type.value)
-                                trace.steps.append({
-                                    "name": f"Retrieve from {source_type.value}",
-                                    "type": "retriever",
-                                    "duration_ms": (time.time() - source_start) * 1000,
-                                    "status": "success",
-                                    "details": {"documents": len(result.documents)},
-                                })
                         except Exception as e:
-                            if trace:
-                                trace.steps.append({
-                                    "name": f"Retrieve from {source_type.value}",
-                                    "type": "retriever",
-                                    "duration_ms": (time.time() - source_start) * 1000,
-                                    "status": "error",
-                                    "details": {"error": str(e)},
-                                })
+                            step = {
+                                "name": f"Retrieve from {source_type.value}",
+                                "type": "retriever",
+                                "duration_ms": (time.time() - source_start) * 1000,
+                                "status": "error",
+                                "details": {"error": str(e)},
+                            }
+                        telemetry.observe_stage("traditional", "retrieval", step["duration_ms"], source_type.value)
+                        telemetry.record_step(step)
+                        if trace:
+                            trace.steps.append(step)
 
                     mlflow_tracer.set_span_outputs(span, {
                         "total_documents": len(all_documents),
@@ -131,15 +130,19 @@ class TraditionalRAG:
 
                 generation_duration = (time.time() - generation_start) * 1000
                 mlflow_tracer.log_generation_metrics(generation_duration)
-
+                telemetry.observe_stage("traditional", "generation", generation_duration)
+                telemetry.record_llm_calls([generation_result.llm_call])
+
+                step = {
+                    "name": "Answer Generation",
+                    "type": "llm",
+                    "duration_ms": generation_duration,
+                    "status": "success",
+                    "details": {"answer_length": len(answer) if answer else 0, **generation_result.context},
+                }
+                telemetry.record_step(step)
                 if trace:
-                    trace.steps.append({
-                        "name": "Answer Generation",
-                        "type": "llm",
-                        "duration_ms": generation_duration,
-                        "status": "success",
-                        "details": {"answer_length": len(answer) if answer else 0},
-                    })
+                    trace.steps.append(step)
                     # Collect LLM call
                     trace.llm_calls.append(generation_result.llm_call)
 
@@ -147,6 +150,9 @@ class TraditionalRAG:
                 total_duration = (time.time() - start_time) * 1000
                 if trace:
                     trace.total_duration_ms = total_duration
+                    trace.token_usage = record_token_usage(trace.llm_calls)
+                    # Read at the end: a background-exported run gets its run_id asynchronously
+                    trace.mlflow_run_id, trace.mlflow_query_id = mlflow_tracer.current_run_ids()
 
                 mlflow_tracer.log_total_metrics(total_duration, success=True, answer_type="traditional")
                 mlflow_tracer.set_span_outputs(root_span, {
@@ -4,7 +4,7 @@
 from .deduplicator import Deduplicator
 from .pruner import Pruner
 from .synthesizer import Synthesizer
-from .filter import RelevanceFilter
+from .filter import RelevanceFilter, LocalRelevanceFilter
 from .refiner import ContextRefiner
 
-__all__ = ["Deduplicator", "Pruner", "Synthesizer", "RelevanceFilter", "ContextRefiner"]
+__all__ = ["Deduplicator", "Pruner", "Synthesizer", "RelevanceFilter", "LocalRelevanceFilter", "ContextRefiner"]
@@ -5,20 +5,17 @@ import json
 import time
 
 from agentic_rag.config import get_settings
-from agentic_rag.llm import get_llm_client
+from agentic_rag.llm import get_llm_client, prompt_messages
 from agentic_rag.models import Document, RefinementResult, RefinementMode, LLMCall
+from agentic_rag.tokens import get_token_counter, trim_to_tokens
 from agentic_rag.tracing.mlflow_tracer import get_mlflow_tracer
+from .near_duplicates import find_near_duplicates
 
 
-DEDUP_PROMPT = """You are analyzing passages retrieved for a user query. Your task is to identify and remove REDUNDANT passages.
+DEDUP_SYSTEM_PROMPT = """You are analyzing passages retrieved for a user query. Your task is to identify and remove REDUNDANT passages.
 
 A passage is REDUNDANT if it contains substantially the same information as another passage. Keep the passage with more detail or from a more authoritative source.
 
-Query: {query}
-
-Passages:
-{passages}
-
 Analyze each passage and return a JSON object with:
 - "keep": list of passage IDs to KEEP, each with a brief reason
 - "drop": list of passage IDs to DROP, each with the ID of the passage it duplicates
@@ -26,24 +23,39 @@ Analyze each passage and return a JSON object with:
 Output ONLY valid JSON, no other text.
 
 Example output:
-{{
+{
     "keep": [
-        {{"id": "p1", "reason": "Primary NTSB source with full details"}},
-        {{"id": "p3", "reason": "Contains unique regulatory information"}}
+        {"id": "p1", "reason": "Primary NTSB source with full details"},
+        {"id": "p3", "reason": "Contains unique regulatory information"}
     ],
     "drop": [
-        {{"id": "p2", "duplicates": "p1", "reason": "Same accident, less detail"}}
+        {"id": "p2", "duplicates": "p1", "reason": "Same accident, less detail"}
     ]
-}}"""
+}"""
+
+DEDUP_PROMPT = """Query: {query}
+
+Passages:
+{passages}"""
 
 
 class Deduplicator:
-    """Remove redundant passages from retrieved context."""
+    """
+    Remove redundant passages from retrieved context.
+
+    A deterministic shingle-similarity pre-pass drops clear near-duplicates;
+    only passages in ambiguous pairs are sent to the LLM, and if there are
+    none the LLM call is skipped entirely.
+    """
 
     def __init__(self):
         settings = get_settings()
         self.llm = get_llm_client()
         self.model = settings.refinement_model
+        self.counter = get_token_counter(self.model)
+        self.passage_max_tokens = settings.refinement_passage_max_tokens
+        self.duplicate_threshold = settings.dedup_duplicate_threshold
+        self.ambiguous_threshold = settings.dedup_ambiguous_threshold
 
     def deduplicate(
         self,
@@ -62,8 +74,24 @@ class Deduplicator:
                 llm_call=None,
             )
 
+        # Deterministic pre-pass: cluster near-duplicates, keep the best of each
+        pre = find_near_duplicates(documents, self.duplicate_threshold, self.ambiguous_threshold)
+        if not pre.ambiguous_pairs:
+            kept_documents = [documents[i] for i in pre.keep]
+            return RefinementResult(
+                documents=kept_documents,
+                mode=RefinementMode.DEDUP,
+                input_count=len(documents),
+                output_count=len(kept_documents),
+                dropped=pre.dropped,
+                llm_call=None,
+            )
+
+        # Only passages in ambiguous pairs go to the LLM; other survivors are kept
+        candidates = sorted({i for i, _, _ in pre.ambiguous_pairs} | {j for _, j, _ in pre.ambiguous_pairs})
+
         # Format passages for the prompt
-        passages_text = self._format_passages(documents)
+        passages_text = self._format_passages(documents, candidates)
         prompt = DEDUP_PROMPT.format(query=query, passages=passages_text)
         mlflow_tracer = get_mlflow_tracer()
 
@@ -74,10 +102,12 @@ class Deduplicator:
                 "prompt": prompt,
                 "model": self.model,
                 "input_document_count": len(documents),
+                "llm_document_count": len(candidates),
+                "prepass_dropped": len(pre.dropped),
             })
 
             response = self.llm.chat(
-                messages=[{"role": "user", "content": prompt}],
+                messages=prompt_messages(DEDUP_SYSTEM_PROMPT, prompt),
                 model=self.model,
                 temperature=0,
                 json_output=True,
@@ -92,22 +122,24 @@ class Deduplicator:
         llm_call = LLMCall(
             step="refinement_dedup",
             model=self.model,
-            prompt=prompt,
+            prompt=f"{DEDUP_SYSTEM_PROMPT}\n\n{prompt}",
             response=response,
             duration_ms=duration_ms,
+            **self.llm.usage_fields(),
         )
 
         # Parse response
         try:
             result = json.loads(response)
         except json.JSONDecodeError:
-            # If parsing fails, return all documents
+            # If parsing fails, keep all pre-pass survivors
+            kept_documents = [documents[i] for i in pre.keep]
             return RefinementResult(
-                documents=documents,
+                documents=kept_documents,
                 mode=RefinementMode.DEDUP,
                 input_count=len(documents),
-                output_count=len(documents),
-                dropped=[],
+                output_count=len(kept_documents),
+                dropped=pre.dropped,
                 llm_call=llm_call,
             )
 
@@ -115,36 +147,37 @@ class Deduplicator:
         keep_ids = {item["id"] for item in result.get("keep", [])}
         dropped = result.get("drop", [])
 
-        # If LLM didn't specify, keep all
+        # If LLM didn't specify, keep all candidates
         if not keep_ids:
-            keep_ids = {f"p{i}" for i in range(len(documents))}
+            keep_ids = {f"p{i}" for i in candidates}
 
-        # Map back to documents
-        kept_documents = []
-        for i, doc in enumerate(documents):
-            if f"p{i}" in keep_ids:
-                kept_documents.append(doc)
+        # Map back to documents (survivors the LLM didn't see are kept)
+        candidate_set = set(candidates)
+        kept_documents = [
+            documents[i] for i in pre.keep
+            if i not in candidate_set or f"p{i}" in keep_ids
+        ]
 
         return RefinementResult(
             documents=kept_documents,
             mode=RefinementMode.DEDUP,
             input_count=len(documents),
             output_count=len(kept_documents),
-            dropped=[{"id": d.get("id"), "reason": d.get("reason", "redundant")} for d in dropped],
+            dropped=pre.dropped + [{"id": d.get("id"), "reason": d.get("reason", "redundant")} for d in dropped],
             llm_call=llm_call,
         )
 
-    def _format_passages(self, documents: list[Document]) -> str:
-        """Format documents as numbered passages."""
+    def _format_passages(self, documents: list[Document], indices: list[int] | None = None) -> str:
+        """Format documents as numbered passages (ids p{i} refer to the full list)."""
         parts = []
-        for i, doc in enumerate(documents):
+        for i in indices if indices is not None else range(len(documents)):
+            doc = documents[i]
             source_info = f"[{doc.source.value}]"
             if doc.metadata.get("header_l3"):
                 source_info += f" {doc.metadata['header_l3']}"
 
             parts.append(f"--- Passage p{i} {source_info} ---")
-            # Truncate long passages
-            text = doc.text[:1000] + "..." if len(doc.text) > 1000 else doc.text
+            text = trim_to_tokens(doc.text, self.passage_max_tokens, self.counter)
             parts.append(text)
             parts.append("")
 
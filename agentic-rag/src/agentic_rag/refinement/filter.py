@@ -15,14 +15,28 @@ This is the recommended production approach because:
 
 import json
 import logging
+import math
 import os
 import time
 
-from ..llm import get_llm_client
+from ..config import get_settings
+from ..llm import get_llm_client, prompt_messages
 from ..models import Document, RefinementResult, RefinementMode, LLMCall
+from ..reranking.candidates import CandidateSet
+from ..tokens import get_token_counter, trim_to_tokens
 
 logger = logging.getLogger(__name__)
 
+FILTER_SYSTEM_PROMPT = """Score each document's relevance to the query on a scale of 1-10.
+
+Instructions:
+- Score 1-3: Not relevant or only tangentially related
+- Score 4-6: Somewhat relevant, contains related information
+- Score 7-10: Highly relevant, directly answers or informs the query
+
+Return ONLY a JSON array of scores in order, like: [8, 3, 7, 5, ...]
+Do not include any other text or explanation."""
+
 
 class RelevanceFilter:
     """Filter documents by relevance score without rewriting.
@@ -48,6 +62,8 @@ class RelevanceFilter:
         self.relevance_threshold = relevance_threshold
         self.min_documents = min_documents
         self._client = None
+        self.counter = get_token_counter(self.model)
+        self.passage_max_tokens = get_settings().refinement_passage_max_tokens
 
     @property
     def client(self):
@@ -82,7 +98,7 @@ class RelevanceFilter:
 
         # Get relevance scores from LLM
         try:
-            messages = [{"role": "user", "content": prompt}]
+            messages = prompt_messages(FILTER_SYSTEM_PROMPT, prompt)
             response = self.client.chat(
                 messages=messages,
                 model=self.model,
@@ -102,34 +118,7 @@ class RelevanceFilter:
                 dropped=[]
             )
 
-        # Score documents and sort by relevance
-        scored_docs = list(zip(documents, scores))
-        scored_docs.sort(key=lambda x: x[1], reverse=True)
-
-        # Filter by threshold, but keep minimum documents
-        kept_docs = []
-        dropped = []
-
-        for i, (doc, score) in enumerate(scored_docs):
-            if score >= self.relevance_threshold or len(kept_docs) < self.min_documents:
-                # Update document metadata with relevance score
-                kept_doc = Document(
-                    id=doc.id,
-                    text=doc.text,  # Original text preserved!
-                    source=doc.source,
-                    metadata={
-                        **doc.metadata,
-                        "relevance_score": score,
-                        "filter_rank": len(kept_docs) + 1
-                    },
-                    score=doc.score
-                )
-                kept_docs.append(kept_doc)
-            else:
-                dropped.append({
-                    "id": doc.id,
-                    "reason": f"Below relevance threshold (score: {score:.1f})"
-                })
+        kept_docs, dropped = self._apply_threshold(documents, scores)
 
         duration_ms = (time.time() - start_time) * 1000
 
@@ -142,9 +131,10 @@ class RelevanceFilter:
         llm_call = LLMCall(
             step="refinement_filter",
             model=self.model,
-            prompt=prompt,
+            prompt=f"{FILTER_SYSTEM_PROMPT}\n\n{prompt}",
             response=response,
-            duration_ms=duration_ms
+            duration_ms=duration_ms,
+            **self.client.usage_fields(),
         )
 
         return RefinementResult(
@@ -156,29 +146,55 @@ class RelevanceFilter:
             llm_call=llm_call
         )
 
+    def _apply_threshold(
+        self,
+        documents: list[Document],
+        scores: list[float],
+    ) -> tuple[list[Document], list[dict]]:
+        """Sort by relevance score and keep documents above threshold (at least min_documents).
+
+        Args:
+            documents: Documents that were scored
+            scores: 1-10 relevance scores aligned with documents
+
+        Returns:
+            Tuple of (kept documents with relevance metadata, dropped records)
+        """
+        # Sort by relevance; scores stay in a side array until the kept set is known
+        candidates = CandidateSet(documents)
+        candidates.add_scores("relevance", scores)
+        relevance = candidates.scores["relevance"]
+
+        # Filter by threshold, but keep minimum documents
+        kept = []
+        dropped = []
+
+        for i in candidates.ranked("relevance"):
+            if relevance[i] >= self.relevance_threshold or len(kept) < self.min_documents:
+                kept.append(i)
+            else:
+                dropped.append({
+                    "id": documents[i].id,
+                    "reason": f"Below relevance threshold (score: {relevance[i]:.1f})"
+                })
+
+        # Original text preserved; relevance recorded in metadata
+        kept_docs = candidates.materialize(kept, metadata={"relevance_score": "relevance"}, rank_key="filter_rank")
+        return kept_docs, dropped
+
     def _build_scoring_prompt(self, documents: list[Document], query: str) -> str:
         """Build the relevance scoring prompt."""
         doc_texts = []
         for i, doc in enumerate(documents):
-            doc_texts.append(f"[Document {i+1}]\n{doc.text[:1500]}...")
+            text = trim_to_tokens(doc.text, self.passage_max_tokens, self.counter)
+            doc_texts.append(f"[Document {i+1}]\n{text}")
 
         docs_section = "\n\n".join(doc_texts)
 
-        return f"""Score each document's relevance to the query on a scale of 1-10.
-
-Query: {query}
+        return f"""Query: {query}
 
 Documents:
-{docs_section}
-
-Instructions:
-- Score 1-3: Not relevant or only tangentially related
-- Score 4-6: Somewhat relevant, contains related information
-- Score 7-10: Highly relevant, directly answers or informs the query
-
-Return ONLY a JSON array of scores in order, like: [8, 3, 7, 5, ...]
-Do not include any other text or explanation.
-"""
+{docs_section}"""
 
     def _parse_scores(self, response: str, expected_count: int) -> list[float]:
         """Parse relevance scores from LLM response."""
@@ -214,3 +230,101 @@ Do not include any other text or explanation.
 
         # Default: all documents get medium score
         return [5.0] * expected_count
+
+
+class LocalRelevanceFilter(RelevanceFilter):
+    """Relevance filter scored by the local cross-encoder instead of an LLM.
+
+    Cross-encoder logits are mapped onto the same 1-10 scale with a logistic
+    calibration, score = 1 + 9 * sigmoid((logit - center) / scale), so
+    relevance_threshold and min_documents keep their meaning. Shares the
+    reranker's scorer, so documents already reranked for this query are
+    cache hits and the stage costs milliseconds on CPU.
+    """
+
+    def __init__(
+        self,
+        relevance_threshold: float = 5.0,
+        min_documents: int = 2,
+        logit_center: float | None = None,
+        logit_scale: float | None = None,
+        scorer=None,
+    ):
+        """Initialize the local relevance filter.
+
+        Args:
+            relevance_threshold: Minimum score (1-10) to keep a document
+            min_documents: Minimum number of documents to keep regardless of threshold
+            logit_center: Cross-encoder logit mapped to 5.5 (default: settings)
+            logit_scale: Logit spread of the calibration curve (default: settings)
+            scorer: CrossEncoderScorer to use (default: shared scorer)
+        """
+        super().__init__(relevance_threshold=relevance_threshold, min_documents=min_documents)
+        settings = get_settings()
+        self.logit_center = settings.local_filter_logit_center if logit_center is None else logit_center
+        self.logit_scale = settings.local_filter_logit_scale if logit_scale is None else logit_scale
+        self._scorer = scorer
+
+    @property
+    def scorer(self):
+        """Lazy load the shared cross-encoder scorer."""
+        if self._scorer is None:
+            from ..reranking.cross_encoder import get_cross_encoder_scorer
+            self._scorer = get_cross_encoder_scorer()
+        return self._scorer
+
+    def calibrate(self, logit: float) -> float:
+        """Map a cross-encoder logit to the 1-10 relevance scale."""
+        z = max(-60.0, min(60.0, (logit - self.logit_center) / self.logit_scale))
+        return round(1.0 + 9.0 / (1.0 + math.exp(-z)), 2)
+
+    def filter(self, documents: list[Document], query: str) -> RefinementResult:
+        """Filter documents by locally computed relevance score.
+
+        Args:
+            documents: Documents to filter
+            query: The query to score relevance against
+
+        Returns:
+            RefinementResult with filtered documents (original text preserved)
+        """
+        if len(documents) <= self.min_documents:
+            return RefinementResult(
+                documents=documents,
+                mode=RefinementMode.LOCAL_FILTER,
+                input_count=len(documents),
+                output_count=len(documents),
+                dropped=[]
+            )
+
+        start_time = time.time()
+
+        try:
+            logits = self.scorer.score(query, documents)
+        except Exception as e:
+            logger.warning(f"Local filter scoring failed: {e}. Passing documents through.")
+            return RefinementResult(
+                documents=documents,
+                mode=RefinementMode.LOCAL_FILTER,
+                input_count=len(documents),
+                output_count=len(documents),
+                dropped=[]
+            )
+
+        scores = [self.calibrate(logit) for logit in logits]
+        kept_docs, dropped = self._apply_threshold(documents, scores)
+
+        duration_ms = (time.time() - start_time) * 1000
+
+        logger.info(
+            f"Local filter refinement: {len(documents)} -> {len(kept_docs)} docs "
+            f"(threshold: {self.relevance_threshold}) in {duration_ms:.1f}ms"
+        )
+
+        return RefinementResult(
+            documents=kept_docs,
+            mode=RefinementMode.LOCAL_FILTER,
+            input_count=len(documents),
+            output_count=len(kept_docs),
+            dropped=dropped,
+        )
@@ -0,0 +1,124 @@
+# near_duplicates.py
+"""Deterministic near-duplicate detection over word shingles.
+
+Runs before the LLM deduplicator. Passages whose shingle sets overlap
+heavily (the same accident reported by several outlets, the same record
+retrieved twice) are clustered and only the most detailed, most
+authoritative passage of each cluster is kept. Pairs in the uncertain
+band are returned for the LLM to judge; everything else never reaches it.
+
+Retrieved sets are small (tens of passages), so pairwise Jaccard similarity
+is computed exactly over the shingle sets; no MinHash approximation needed.
+"""
+
+import re
+import zlib
+from dataclasses import dataclass, field
+
+from agentic_rag.models import Document, SourceType
+
+
+SHINGLE_SIZE = 3
+
+# Higher wins when choosing the representative of a duplicate cluster
+SOURCE_AUTHORITY = {
+    SourceType.REGULATIONS: 3,
+    SourceType.INCIDENTS: 3,
+    SourceType.NEWS: 1,
+}
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class NearDuplicateResult:
+    """Outcome of the near-duplicate pre-pass (indices refer to the input list)."""
+    keep: list[int]
+    dropped: list[dict] = field(default_factory=list)
+    ambiguous_pairs: list[tuple[int, int, float]] = field(default_factory=list)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    """Hashed word n-gram shingles of normalized text."""
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode())} if words else set()
+    return {
+        zlib.crc32(" ".join(words[i:i + size]).encode())
+        for i in range(len(words) - size + 1)
+    }
+
+
+def jaccard(a: set[int], b: set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _preference(doc: Document) -> tuple[int, int]:
+    """Rank cluster members: source authority first, then amount of detail."""
+    return SOURCE_AUTHORITY.get(doc.source, 0), len(doc.text)
+
+
+def find_near_duplicates(
+    documents: list[Document],
+    duplicate_threshold: float = 0.8,
+    ambiguous_threshold: float = 0.5,
+) -> NearDuplicateResult:
+    """
+    Cluster near-duplicate documents and flag ambiguous pairs.
+
+    Args:
+        documents: Retrieved documents
+        duplicate_threshold: Jaccard similarity at or above which two passages
+            are duplicates (identical ids always are)
+        ambiguous_threshold: Similarity at or above which a non-duplicate pair
+            among the survivors is left for the LLM to judge
+
+    Returns:
+        NearDuplicateResult with kept indices (input order), dropped records
+        and ambiguous (i, j, similarity) pairs among kept documents
+    """
+    n = len(documents)
+    shingle_sets = [shingles(doc.text) for doc in documents]
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    similarity: dict[tuple[int, int], float] = {}
+    for i in range(n):
+        for j in range(i + 1, n):
+            sim = 1.0 if documents[i].id == documents[j].id else jaccard(shingle_sets[i], shingle_sets[j])
+            similarity[(i, j)] = sim
+            if sim >= duplicate_threshold:
+                parent[find(j)] = find(i)
+
+    clusters: dict[int, list[int]] = {}
+    for i in range(n):
+        clusters.setdefault(find(i), []).append(i)
+
+    keep, dropped = [], []
+    for members in clusters.values():
+        best = max(members, key=lambda i: (_preference(documents[i]), -i))
+        keep.append(best)
+        for i in members:
+            if i != best:
+                pair = (min(i, best), max(i, best))
+                dropped.append({
+                    "id": documents[i].id,
+                    "reason": f"near-duplicate of {documents[best].id} (similarity {similarity[pair]:.2f})",
+                })
+    keep.sort()
+
+    ambiguous = [
+        (i, j, similarity[(i, j)])
+        for a, i in enumerate(keep)
+        for j in keep[a + 1:]
+        if ambiguous_threshold <= similarity[(i, j)] < duplicate_threshold
+    ]
+
+    return NearDuplicateResult(keep=keep, dropped=dropped, ambiguous_pairs=ambiguous)
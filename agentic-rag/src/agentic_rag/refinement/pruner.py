@@ -5,34 +5,35 @@ import json
 import time
 
 from agentic_rag.config import get_settings
-from agentic_rag.llm import get_llm_client
+from agentic_rag.llm import get_llm_client, prompt_messages
 from agentic_rag.models import Document, RefinementResult, RefinementMode, LLMCall
+from agentic_rag.tokens import get_token_counter, trim_to_tokens
 from agentic_rag.tracing.mlflow_tracer import get_mlflow_tracer
 
 
-PRUNE_PROMPT = """You are analyzing passages retrieved for a user query. Your task is to identify and remove MARGINALLY RELEVANT passages.
+PRUNE_SYSTEM_PROMPT = """You are analyzing passages retrieved for a user query. Your task is to identify and remove MARGINALLY RELEVANT passages.
 
 A passage is MARGINALLY RELEVANT if it:
 - Discusses a tangentially related topic
 - Contains information that doesn't help answer the query
 - Is too general to be useful for the specific question
 
-Query: {query}
-
-Passages:
-{passages}
-
 For each passage, decide: KEEP (directly relevant) or DROP (marginally relevant).
 
 Output ONLY valid JSON:
-{{
+{
     "keep": [
-        {{"id": "p0", "relevance": "Directly answers the question about..."}}
+        {"id": "p0", "relevance": "Directly answers the question about..."}
     ],
     "drop": [
-        {{"id": "p2", "reason": "Discusses unrelated topic..."}}
+        {"id": "p2", "reason": "Discusses unrelated topic..."}
     ]
-}}"""
+}"""
+
+PRUNE_PROMPT = """Query: {query}
+
+Passages:
+{passages}"""
 
 
 class Pruner:
@@ -42,6 +43,8 @@ class Pruner:
         settings = get_settings()
         self.llm = get_llm_client()
         self.model = settings.refinement_model
+        self.counter = get_token_counter(self.model)
+        self.passage_max_tokens = settings.refinement_passage_max_tokens
 
     def prune(
         self,
@@ -73,7 +76,7 @@ class Pruner:
             })
 
             response = self.llm.chat(
-                messages=[{"role": "user", "content": prompt}],
+                messages=prompt_messages(PRUNE_SYSTEM_PROMPT, prompt),
                 model=self.model,
                 temperature=0,
                 json_output=True,
@@ -88,9 +91,10 @@ class Pruner:
         llm_call = LLMCall(
             step="refinement_prune",
             model=self.model,
-            prompt=prompt,
+            prompt=f"{PRUNE_SYSTEM_PROMPT}\n\n{prompt}",
             response=response,
             duration_ms=duration_ms,
+            **self.llm.usage_fields(),
         )
 
         try:
@@ -136,7 +140,7 @@ class Pruner:
         for i, doc in enumerate(documents):
             source_info = f"[{doc.source.value}]"
             parts.append(f"--- Passage p{i} {source_info} ---")
-            text = doc.text[:800] + "..." if len(doc.text) > 800 else doc.text
+            text = trim_to_tokens(doc.text, self.passage_max_tokens, self.counter)
             parts.append(text)
             parts.append("")
         return "\n".join(parts)
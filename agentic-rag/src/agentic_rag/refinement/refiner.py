@@ -5,17 +5,18 @@ from agentic_rag.models import Document, RefinementResult, RefinementMode
 from .deduplicator import Deduplicator
 from .pruner import Pruner
 from .synthesizer import Synthesizer
-from .filter import RelevanceFilter
+from .filter import RelevanceFilter, LocalRelevanceFilter
 
 
 class ContextRefiner:
     """
     Main interface for context refinement.
 
-    Supports four modes:
+    Supports five modes:
     - NONE: Pass through without refinement
     - DEDUP: Deduplicate + prune, preserve original text (may lose nuance)
     - FILTER: Score relevance, keep top docs with original text (recommended)
+    - LOCAL_FILTER: FILTER scored by the local cross-encoder (no LLM call)
     - SYNTHESIZE: Compress into summary (lossy)
     """
 
@@ -24,6 +25,7 @@ class ContextRefiner:
         self.pruner = Pruner()
         self.synthesizer = Synthesizer()
         self.filter = RelevanceFilter()
+        self.local_filter = LocalRelevanceFilter()
 
     def refine(
         self,
@@ -75,5 +77,9 @@ class ContextRefiner:
             # This is the recommended production approach
             return self.filter.filter(documents, query)
 
+        elif mode == RefinementMode.LOCAL_FILTER:
+            # Same thresholding as FILTER, scores from the local cross-encoder
+            return self.local_filter.filter(documents, query)
+
         else:
             raise ValueError(f"Unknown refinement mode: {mode}")
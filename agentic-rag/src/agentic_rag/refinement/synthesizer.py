@@ -4,12 +4,12 @@
 import time
 
 from agentic_rag.config import get_settings
-from agentic_rag.llm import get_llm_client
+from agentic_rag.llm import get_llm_client, prompt_messages
 from agentic_rag.models import Document, RefinementResult, RefinementMode, SourceType, LLMCall
 from agentic_rag.tracing.mlflow_tracer import get_mlflow_tracer
 
 
-SYNTHESIZE_PROMPT = """You are synthesizing multiple passages into a single, condensed context for answering a user query.
+SYNTHESIZE_SYSTEM_PROMPT = """You are synthesizing multiple passages into a single, condensed context for answering a user query.
 
 Your task:
 1. Preserve ALL unique facts from the passages
@@ -17,15 +17,15 @@ Your task:
 3. Maintain source attribution using [Source: X] markers
 4. Organize information logically
 
-Query: {query}
-
-Passages:
-{passages}
-
 Create a synthesized context that contains all relevant information needed to answer the query. Use [Source: incidents/regulations/news] markers to attribute facts.
 
 Output ONLY the synthesized text, no other commentary."""
 
+SYNTHESIZE_PROMPT = """Query: {query}
+
+Passages:
+{passages}"""
+
 
 class Synthesizer:
     """Synthesize passages into compressed summary."""
@@ -74,7 +74,7 @@ class Synthesizer:
             })
 
             synthesized_text = self.llm.chat(
-                messages=[{"role": "user", "content": prompt}],
+                messages=prompt_messages(SYNTHESIZE_SYSTEM_PROMPT, prompt),
                 model=self.model,
                 temperature=0,
             )
@@ -88,9 +88,10 @@ class Synthesizer:
         llm_call = LLMCall(
             step="refinement_synthesize",
             model=self.model,
-            prompt=prompt,
+            prompt=f"{SYNTHESIZE_SYSTEM_PROMPT}\n\n{prompt}",
             response=synthesized_text,
             duration_ms=duration_ms,
+            **self.llm.usage_fields(),
         )
 
         # Create a single synthesized document
@@ -2,5 +2,13 @@
 """Reranking modules for improving retrieval quality."""
 
 from .reranker import Reranker, CrossEncoderReranker
+from .candidates import CandidateSet
+from .cross_encoder import CrossEncoderScorer, get_cross_encoder_scorer
 
-__all__ = ["Reranker", "CrossEncoderReranker"]
+__all__ = [
+    "Reranker",
+    "CrossEncoderReranker",
+    "CandidateSet",
+    "CrossEncoderScorer",
+    "get_cross_encoder_scorer",
+]
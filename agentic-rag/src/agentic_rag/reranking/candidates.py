@@ -0,0 +1,72 @@
+# candidates.py
+"""Candidate documents under scoring, with scores held in side arrays.
+
+Reranking and filtering score 50-200 candidates but keep far fewer.
+Instead of building a validated Document with merged metadata for every
+candidate at every stage, a CandidateSet keeps the input documents as-is
+and records each stage's scores in a list aligned with them. Output
+Documents are built once, for the selected candidates only, with
+model_copy: no validation, and text/source are shared with the input.
+
+Under pydantic v2 validating a Document costs about as much as copying
+one, so the saving comes from not building the documents a stage drops
+(most of them for rerank top_k); see benchmarks/candidates.py.
+"""
+
+from dataclasses import dataclass, field
+
+from ..models import Document
+
+
+@dataclass(slots=True)
+class CandidateSet:
+    """Input documents plus per-stage scores aligned by position."""
+    documents: list[Document]
+    scores: dict[str, list[float]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add_scores(self, stage: str, scores: list[float]) -> None:
+        """Record one stage's scores (one per document, in document order)."""
+        if len(scores) != len(self.documents):
+            raise ValueError(f"{stage}: {len(scores)} scores for {len(self.documents)} documents")
+        self.scores[stage] = [float(score) for score in scores]
+
+    def ranked(self, stage: str) -> list[int]:
+        """Candidate positions by descending stage score (stable for ties)."""
+        stage_scores = self.scores[stage]
+        return sorted(range(len(stage_scores)), key=stage_scores.__getitem__, reverse=True)
+
+    def materialize(
+        self,
+        indices: list[int],
+        score_stage: str | None = None,
+        metadata: dict[str, str] | None = None,
+        rank_key: str | None = None,
+    ) -> list[Document]:
+        """Build output Documents for the selected candidates, in the given order.
+
+        Args:
+            indices: Candidate positions to output
+            score_stage: Stage whose score becomes Document.score (None keeps the input score)
+            metadata: Metadata key -> stage whose score is recorded under that key
+            rank_key: Metadata key for the 1-based output position
+
+        Returns:
+            Unvalidated copies sharing text and source with the inputs
+        """
+        primary = self.scores[score_stage] if score_stage else None
+        annotations = [(key, self.scores[stage]) for key, stage in (metadata or {}).items()]
+
+        output = []
+        for rank, i in enumerate(indices, start=1):
+            doc = self.documents[i]
+            doc_metadata = {**doc.metadata, **{key: stage_scores[i] for key, stage_scores in annotations}}
+            if rank_key:
+                doc_metadata[rank_key] = rank
+            update = {"metadata": doc_metadata}
+            if primary is not None:
+                update["score"] = primary[i]
+            output.append(doc.model_copy(update=update))
+        return output
@@ -0,0 +1,206 @@
+# cross_encoder.py
+"""Cross-encoder scoring engine shared by reranking and filtering.
+
+Wraps a sentence-transformers CrossEncoder with:
+- batched inference with a configurable batch size
+- max sequence truncation (tokens, with a cheap character pre-cut)
+- an LRU cache of (query hash, document id, text hash) -> score, since
+  the same documents recur across nearby queries (the text hash keeps
+  collapsed chunk hits, whose text varies per search, from sharing a score)
+- an optional ONNX Runtime backend, including the int8-quantized
+  MS MARCO MiniLM export, for faster CPU inference
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from agentic_rag.config import get_settings
+from agentic_rag.tracing.telemetry import get_telemetry
+from ..models import Document
+
+logger = logging.getLogger(__name__)
+
+# Generous characters-per-token bound: avoids tokenizing text that would be truncated anyway
+CHARS_PER_TOKEN = 8
+
+
+class ScoreCache:
+    """Thread-safe LRU cache of cross-encoder scores."""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._scores: OrderedDict[tuple[str, str, str], float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def query_key(query: str) -> str:
+        return hashlib.sha1(query.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def document_key(document: Document) -> tuple[str, str]:
+        return document.id, hashlib.sha1(document.text.encode("utf-8")).hexdigest()
+
+    def get(self, key: tuple[str, str, str]) -> float | None:
+        with self._lock:
+            score = self._scores.get(key)
+            if score is None:
+                self.misses += 1
+                return None
+            self._scores.move_to_end(key)
+            self.hits += 1
+            return score
+
+    def put(self, key: tuple[str, str, str], score: float) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._scores[key] = score
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.max_size:
+                self._scores.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scores.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        return {"size": len(self._scores), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+
+class CrossEncoderScorer:
+    """Batched, cached cross-encoder scoring with torch or ONNX backends."""
+
+    def __init__(
+        self,
+        model_name: str | None = None,
+        backend: str | None = None,
+        batch_size: int | None = None,
+        max_length: int | None = None,
+        cache_size: int | None = None,
+    ):
+        """Initialize scorer; unset arguments come from settings.
+
+        Args:
+            model_name: HuggingFace cross-encoder model name
+            backend: "torch", "onnx" or "onnx-int8"
+            batch_size: Pairs per forward pass
+            max_length: Max tokens per query-document pair
+            cache_size: LRU cache entries (0 disables caching)
+        """
+        settings = get_settings()
+        self.model_name = model_name or settings.cross_encoder_model
+        self.backend = backend or settings.reranker_backend
+        self.onnx_file = settings.reranker_onnx_file
+        self.batch_size = batch_size or settings.reranker_batch_size
+        self.max_length = max_length or settings.reranker_max_length
+        self.cache = ScoreCache(settings.reranker_cache_size if cache_size is None else cache_size)
+        self.load_duration_ms: float | None = None
+        self._model = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def model_label(self) -> str:
+        """Model name with backend, as reported in traces."""
+        return self.model_name if self.backend == "torch" else f"{self.model_name} ({self.backend})"
+
+    @property
+    def model(self):
+        """Lazy load the cross-encoder model."""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    def _load_model(self):
+        try:
+            from sentence_transformers import CrossEncoder
+        except ImportError:
+            raise ImportError(
+                "sentence-transformers is required for cross-encoder reranking. "
+                "Install with: pip install sentence-transformers"
+            )
+
+        kwargs = {"max_length": self.max_length}
+        if self.backend in ("onnx", "onnx-int8"):
+            kwargs["backend"] = "onnx"
+            if self.backend == "onnx-int8":
+                kwargs["model_kwargs"] = {"file_name": self.onnx_file}
+
+        logger.info(f"Loading cross-encoder model: {self.model_label}")
+        start_time = time.time()
+        try:
+            model = CrossEncoder(self.model_name, **kwargs)
+        except ImportError as e:
+            raise ImportError(
+                f"ONNX backend unavailable ({e}). "
+                "Install with: pip install 'sentence-transformers[onnx]'"
+            )
+        self.load_duration_ms = (time.time() - start_time) * 1000
+        logger.info(f"Cross-encoder model loaded in {self.load_duration_ms:.0f}ms")
+        return model
+
+    def predict(self, pairs: list[tuple[str, str]]) -> list[float]:
+        """Score raw (query, text) pairs in batches, bypassing the cache."""
+        if not pairs:
+            return []
+        max_chars = self.max_length * CHARS_PER_TOKEN
+        pairs = [(q, t[:max_chars]) for q, t in pairs]
+        scores = self.model.predict(
+            pairs,
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+        )
+        return [float(s) for s in scores]
+
+    def score(self, query: str, documents: list[Document]) -> list[float]:
+        """Score documents against a query, computing only cache misses.
+
+        Args:
+            query: The search query
+            documents: Documents to score
+
+        Returns:
+            Scores aligned with `documents`
+        """
+        query_key = self.cache.query_key(query)
+        doc_keys = [self.cache.document_key(doc) for doc in documents]
+        scores: list[float | None] = [self.cache.get((query_key, *doc_key)) for doc_key in doc_keys]
+
+        missing = [i for i, s in enumerate(scores) if s is None]
+        get_telemetry().record_cache("reranker_scores", hits=len(scores) - len(missing), misses=len(missing))
+        if missing:
+            computed = self.predict([(query, documents[i].text) for i in missing])
+            for i, score in zip(missing, computed):
+                scores[i] = score
+                self.cache.put((query_key, *doc_keys[i]), score)
+
+        return scores
+
+
+_scorer: CrossEncoderScorer | None = None
+_scorer_lock = threading.Lock()
+
+
+def get_cross_encoder_scorer() -> CrossEncoderScorer:
+    """Get the shared cross-encoder scorer (singleton, so the model loads once)."""
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = CrossEncoderScorer()
+    return _scorer
+
+
+def reset_cross_encoder_scorer():
+    """Reset the singleton scorer (useful for testing or config changes)."""
+    global _scorer
+    _scorer = None
@@ -11,12 +11,13 @@ Unlike synthesis/dedup which rewrites text, reranking preserves original documen
 """
 
 import logging
-import os
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
 from ..models import Document, RerankingMode
+from .candidates import CandidateSet
+from .cross_encoder import CrossEncoderScorer, get_cross_encoder_scorer
 
 logger = logging.getLogger(__name__)
 
@@ -90,33 +91,23 @@ class CrossEncoderReranker(Reranker):
 
     DEFAULT_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
 
-    def __init__(self, model_name: str | None = None):
+    def __init__(self, model_name: str | None = None, scorer: CrossEncoderScorer | None = None):
         """Initialize cross-encoder reranker.
 
         Args:
-            model_name: HuggingFace model name. Defaults to ms-marco-MiniLM-L-6-v2
+            model_name: HuggingFace model name. Defaults to settings.cross_encoder_model
+                (CROSS_ENCODER_MODEL), which uses the shared scorer
+            scorer: Scoring engine to use (batching, truncation, cache, backend)
         """
-        self.model_name = model_name or os.environ.get(
-            "CROSS_ENCODER_MODEL",
-            self.DEFAULT_MODEL
-        )
-        self._model = None
+        if scorer is None:
+            scorer = CrossEncoderScorer(model_name=model_name) if model_name else get_cross_encoder_scorer()
+        self.scorer = scorer
+        self.model_name = scorer.model_label
 
     @property
     def model(self):
-        """Lazy load the cross-encoder model."""
-        if self._model is None:
-            try:
-                from sentence_transformers import CrossEncoder
-                logger.info(f"Loading cross-encoder model: {self.model_name}")
-                self._model = CrossEncoder(self.model_name)
-                logger.info("Cross-encoder model loaded successfully")
-            except ImportError:
-                raise ImportError(
-                    "sentence-transformers is required for cross-encoder reranking. "
-                    "Install with: pip install sentence-transformers"
-                )
-        return self._model
+        """The underlying cross-encoder model (lazy loaded by the scorer)."""
+        return self.scorer.model
 
     def rerank(
         self,
@@ -146,37 +137,24 @@ class CrossEncoderReranker(Reranker):
 
         start_time = time.time()
 
-        # Create query-document pairs for cross-encoder
-        pairs = [(query, doc.text) for doc in documents]
-
-        # Get cross-encoder scores
-        scores = self.model.predict(pairs)
-
-        # Pair documents with their new scores
-        scored_docs = list(zip(documents, scores))
-
-        # Sort by cross-encoder score (descending)
-        scored_docs.sort(key=lambda x: x[1], reverse=True)
-
-        # Update document scores and take top_k
-        reranked_docs = []
-        for doc, score in scored_docs:
-            # Create new document with updated score
-            reranked_doc = Document(
-                id=doc.id,
-                text=doc.text,
-                source=doc.source,
-                metadata={
-                    **doc.metadata,
-                    "original_score": doc.score,
-                    "cross_encoder_score": float(score)
-                },
-                score=float(score)  # Use cross-encoder score as primary score
-            )
-            reranked_docs.append(reranked_doc)
+        # Get cross-encoder scores (batched; cached per query and document)
+        scores = self.scorer.score(query, documents)
+
+        # Scores stay in side arrays; only the top_k survivors become new Documents
+        candidates = CandidateSet(documents)
+        candidates.add_scores("original", [doc.score for doc in documents])
+        candidates.add_scores("cross_encoder", scores)
 
-        # Apply top_k limit
-        output_docs = reranked_docs[:top_k] if top_k else reranked_docs
+        # Sort by cross-encoder score (descending) and take top_k
+        order = candidates.ranked("cross_encoder")
+        if top_k:
+            order = order[:top_k]
+
+        output_docs = candidates.materialize(
+            order,
+            score_stage="cross_encoder",  # Use cross-encoder score as primary score
+            metadata={"original_score": "original", "cross_encoder_score": "cross_encoder"},
+        )
 
         duration_ms = (time.time() - start_time) * 1000
 
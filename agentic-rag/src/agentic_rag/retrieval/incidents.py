@@ -4,7 +4,7 @@
 from typing import Any
 
 from agentic_rag.models import SourceType, RetrievalResult
-from agentic_rag.data.indexers.vector_store import get_incidents_store
+from agentic_rag.data.indexers.vector_store import VectorStore, get_incidents_store
 from .base import BaseRetriever
 
 
@@ -13,8 +13,8 @@ class IncidentRetriever(BaseRetriever):
 
     source_type = SourceType.INCIDENTS
 
-    def __init__(self):
-        self.store = get_incidents_store()
+    def __init__(self, store: VectorStore | None = None):
+        self.store = store or get_incidents_store()
 
     def retrieve(
         self,
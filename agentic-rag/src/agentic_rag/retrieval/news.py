@@ -4,7 +4,7 @@
 from typing import Any
 
 from agentic_rag.models import SourceType, RetrievalResult
-from agentic_rag.data.indexers.vector_store import get_news_store
+from agentic_rag.data.indexers.vector_store import VectorStore, get_news_store
 from .base import BaseRetriever
 
 
@@ -12,9 +12,10 @@ class NewsRetriever(BaseRetriever):
     """Retriever for news articles."""
 
     source_type = SourceType.NEWS
+    date_field = "publish_date"
 
-    def __init__(self):
-        self.store = get_news_store()
+    def __init__(self, store: VectorStore | None = None):
+        self.store = store or get_news_store()
 
     def retrieve(
         self,
@@ -75,7 +76,17 @@ class NewsRetriever(BaseRetriever):
         end_date: str,
         top_k: int = 10,
     ) -> RetrievalResult:
-        """Retrieve news within a date range."""
-        # Note: Qdrant supports range filters, but for simplicity
-        # we'll do post-filtering or use text matching
-        return self.retrieve(query=query, top_k=top_k)
+        """
+        Retrieve news published within a date range (inclusive).
+
+        The range is applied server-side on the ISO `publish_date` payload
+        field, so every returned slot is in range. Either bound may be empty.
+        """
+        date_filter = {}
+        if start_date:
+            date_filter["$gte"] = start_date
+        if end_date:
+            date_filter["$lte"] = end_date
+
+        filters = {self.date_field: date_filter} if date_filter else None
+        return self.retrieve(query=query, top_k=top_k, filters=filters)
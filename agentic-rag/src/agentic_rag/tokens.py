@@ -0,0 +1,199 @@
+# tokens.py
+"""Token counting and cost estimation for the configured LLM provider."""
+
+import math
+import re
+from functools import lru_cache
+
+from agentic_rag.config import get_settings
+
+# Lazy import to avoid requiring tiktoken
+_tiktoken = None
+
+# USD per 1M tokens: (input, output)
+MODEL_PRICING = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "claude-3-haiku-20240307": (0.25, 1.25),
+    "claude-3-5-haiku-20241022": (0.80, 4.00),
+    "claude-sonnet-4-20250514": (3.00, 15.00),
+}
+
+# Prompt cache pricing relative to the input price: (cache read, cache write)
+CACHE_PRICE_MULTIPLIERS = {
+    "anthropic": (0.10, 1.25),
+    "openai": (0.50, 1.00),
+}
+
+# Anthropic has no local tokenizer; English prose averages ~3.5 characters per token
+ANTHROPIC_CHARS_PER_TOKEN = 3.5
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n{2,}")
+
+
+def _get_tiktoken():
+    """Lazy load tiktoken."""
+    global _tiktoken
+    if _tiktoken is None:
+        try:
+            import tiktoken
+            _tiktoken = tiktoken
+        except ImportError:
+            _tiktoken = False
+    return _tiktoken if _tiktoken else None
+
+
+class TokenCounter:
+    """
+    Count tokens for a model.
+
+    OpenAI models use their tiktoken encoding. Anthropic models (and OpenAI
+    without tiktoken installed) use a character-based estimate, since exact
+    Claude counts need an API round-trip.
+    """
+
+    def __init__(self, provider: str, model: str):
+        self.provider = provider
+        self.model = model
+        self._encoding = None
+
+        tiktoken = _get_tiktoken() if provider == "openai" else None
+        if tiktoken:
+            try:
+                self._encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("o200k_base")
+
+    @property
+    def exact(self) -> bool:
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text) / ANTHROPIC_CHARS_PER_TOKEN)
+
+    def chars_for_tokens(self, tokens: int) -> int:
+        """Rough character length corresponding to a token count."""
+        return int(tokens * ANTHROPIC_CHARS_PER_TOKEN)
+
+
+@lru_cache(maxsize=16)
+def get_token_counter(model: str | None = None) -> TokenCounter:
+    """Get a token counter for a model of the configured provider (cached)."""
+    settings = get_settings()
+    return TokenCounter(settings.llm_provider, model or settings.generation_model)
+
+
+def trim_to_tokens(text: str, max_tokens: int, counter: TokenCounter | None = None) -> str:
+    """
+    Trim text to at most max_tokens, cutting at a sentence boundary when possible.
+
+    Falls back to a word-boundary cut when the first sentence alone is over
+    the limit. Trimmed text ends with " [...]".
+    """
+    counter = counter or get_token_counter()
+    if counter.count(text) <= max_tokens:
+        return text
+
+    kept, used, position = [], 0, 0
+    for match in _SENTENCE_BOUNDARY.finditer(text + " "):
+        sentence = text[position:match.start()]
+        tokens = counter.count(sentence) + 1
+        if used + tokens > max_tokens:
+            break
+        kept.append(sentence)
+        used += tokens
+        position = match.end()
+
+    if kept:
+        return " ".join(kept) + " [...]"
+
+    cut = text[: counter.chars_for_tokens(max_tokens)]
+    while cut and counter.count(cut) > max_tokens:
+        cut = cut[: int(len(cut) * 0.9)]
+    return cut.rsplit(" ", 1)[0] + " [...]"
+
+
+def estimate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int = 0,
+    cached_input_tokens: int = 0,
+    cache_creation_input_tokens: int = 0,
+) -> float | None:
+    """
+    Estimated USD cost of a call, or None if the model has no pricing entry.
+
+    input_tokens includes cached and cache-write tokens, which are billed at
+    the provider's cache read/write multipliers.
+    """
+    pricing = MODEL_PRICING.get(model)
+    if pricing is None:
+        return None
+    input_price, output_price = pricing
+    read_multiplier, write_multiplier = (
+        CACHE_PRICE_MULTIPLIERS["anthropic"] if model.startswith("claude") else CACHE_PRICE_MULTIPLIERS["openai"]
+    )
+    uncached = input_tokens - cached_input_tokens - cache_creation_input_tokens
+    input_cost = input_price * (
+        uncached
+        + cached_input_tokens * read_multiplier
+        + cache_creation_input_tokens * write_multiplier
+    )
+    return (input_cost + output_tokens * output_price) / 1_000_000
+
+
+def record_token_usage(llm_calls: list) -> dict:
+    """
+    Fill token counts and cost on each LLMCall and aggregate them per step.
+
+    Counts already set (reported by the provider, including cached input
+    tokens) are kept; missing ones are counted locally from the prompt and response text. Skipped calls
+    (no prompt sent) count as zero.
+
+    Returns:
+        {"steps": {step: {...}}, "total": {...}} with input/output tokens,
+        call count and estimated cost (None if any model is unpriced)
+    """
+    steps: dict[str, dict] = {}
+    total = {"calls": 0, "input_tokens": 0, "output_tokens": 0, "cached_input_tokens": 0, "estimated_cost_usd": 0.0}
+
+    for call in llm_calls:
+        if call.prompt.startswith("(skipped"):
+            continue
+        counter = get_token_counter(call.model)
+        if call.input_tokens is None:
+            call.input_tokens = counter.count(call.prompt)
+        if call.output_tokens is None:
+            call.output_tokens = counter.count(call.response)
+        if call.estimated_cost_usd is None:
+            call.estimated_cost_usd = estimate_cost(
+                call.model,
+                call.input_tokens,
+                call.output_tokens,
+                call.cached_input_tokens or 0,
+                call.cache_creation_input_tokens or 0,
+            )
+
+        step = steps.setdefault(call.step, {
+            "model": call.model,
+            "calls": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cached_input_tokens": 0,
+            "estimated_cost_usd": 0.0,
+        })
+        for bucket in (step, total):
+            bucket["calls"] += 1
+            bucket["input_tokens"] += call.input_tokens
+            bucket["output_tokens"] += call.output_tokens
+            bucket["cached_input_tokens"] += call.cached_input_tokens or 0
+            if call.estimated_cost_usd is None or bucket["estimated_cost_usd"] is None:
+                bucket["estimated_cost_usd"] = None
+            else:
+                bucket["estimated_cost_usd"] += call.estimated_cost_usd
+
+    return {"steps": steps, "total": total}
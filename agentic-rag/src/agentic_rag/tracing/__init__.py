@@ -3,5 +3,19 @@
 
 from .tracer import Tracer, TraceSpan
 from .mlflow_tracer import MLflowTracer, get_mlflow_tracer
+from .mlflow_exporter import MLflowExporter
+from .telemetry import Telemetry, get_telemetry
+from .profiling import QueryProfiler, ProfileCapture, get_query_profiler
 
-__all__ = ["Tracer", "TraceSpan", "MLflowTracer", "get_mlflow_tracer"]
+__all__ = [
+    "Tracer",
+    "TraceSpan",
+    "MLflowTracer",
+    "get_mlflow_tracer",
+    "MLflowExporter",
+    "Telemetry",
+    "get_telemetry",
+    "QueryProfiler",
+    "ProfileCapture",
+    "get_query_profiler",
+]
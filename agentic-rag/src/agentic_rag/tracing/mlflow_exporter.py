@@ -0,0 +1,240 @@
+# mlflow_exporter.py
+"""Background MLflow exporter.
+
+Moves run logging off the request path. The tracer enqueues operations
+(create run, metrics, params, text artifacts, end run) on a bounded queue;
+a worker thread drains it in order, coalescing each run's metrics, params
+and tags into MlflowClient.log_batch calls. When the queue is full the
+operation is dropped and counted, so a slow or unavailable MLflow server
+never blocks a query.
+"""
+
+import logging
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# MLflow log_batch limits
+MAX_BATCH_METRICS = 1000
+MAX_BATCH_PARAMS = 100
+MAX_BATCH_TAGS = 100
+
+
+@dataclass
+class RunHandle:
+    """
+    Local handle for a run that the worker creates asynchronously.
+
+    query_id is generated on the request path and tagged on the run, so a
+    query can be looked up in MLflow (tags.query_id) before, or without,
+    knowing its run_id.
+    """
+    run_name: str | None
+    run_id: str | None = None  # Set by the worker once the run exists
+    failed: bool = False
+    query_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+
+@dataclass
+class _Op:
+    kind: str  # create_run, metrics, params, tags, text, end_run
+    run: RunHandle
+    payload: Any = None
+
+
+@dataclass
+class _PendingBatch:
+    metrics: dict[str, tuple[float, int]] = field(default_factory=dict)  # key -> (value, timestamp ms)
+    params: dict[str, str] = field(default_factory=dict)
+    tags: dict[str, str] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.metrics or self.params or self.tags)
+
+
+class MLflowExporter:
+    """Export MLflow runs from a worker thread through a bounded queue."""
+
+    def __init__(
+        self,
+        tracking_uri: str,
+        experiment_name: str,
+        max_queue_size: int = 10000,
+        flush_interval_s: float = 2.0,
+    ):
+        self.tracking_uri = tracking_uri
+        self.experiment_name = experiment_name
+        self.flush_interval_s = flush_interval_s
+
+        self._queue: queue.Queue[_Op | None] = queue.Queue(maxsize=max_queue_size)
+        self._pending: dict[int, tuple[RunHandle, _PendingBatch]] = {}
+        self._client = None
+        self._experiment_id: str | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+        self.dropped = 0
+        self.exported_batches = 0
+        self.exported_artifacts = 0
+        self.errors = 0
+
+    def start(self) -> None:
+        """Start the worker thread (idempotent)."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mlflow-exporter", daemon=True)
+                self._thread.start()
+
+    # ==================== PRODUCER API (request path) ====================
+
+    def _submit(self, op: _Op) -> None:
+        try:
+            self._queue.put_nowait(op)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                dropped = self.dropped
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning(f"MLflow export queue full; {dropped} operations dropped so far")
+
+    def create_run(self, run_name: str | None = None, query_id: str | None = None) -> RunHandle:
+        self.start()
+        handle = RunHandle(run_name=run_name) if query_id is None else RunHandle(run_name=run_name, query_id=query_id)
+        self._submit(_Op("create_run", handle))
+        return handle
+
+    def log_metrics(self, run: RunHandle, metrics: dict[str, float]) -> None:
+        timestamp = int(time.time() * 1000)
+        self._submit(_Op("metrics", run, {k: (float(v), timestamp) for k, v in metrics.items()}))
+
+    def log_params(self, run: RunHandle, params: dict[str, Any]) -> None:
+        self._submit(_Op("params", run, {k: str(v)[:500] for k, v in params.items()}))
+
+    def set_tags(self, run: RunHandle, tags: dict[str, Any]) -> None:
+        self._submit(_Op("tags", run, {k: str(v) for k, v in tags.items()}))
+
+    def log_text(self, run: RunHandle, text: str, artifact_file: str) -> None:
+        self._submit(_Op("text", run, (text, artifact_file)))
+
+    def end_run(self, run: RunHandle, status: str = "FINISHED") -> None:
+        self._submit(_Op("end_run", run, status))
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until everything queued so far has been exported."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._submit(_Op("flush", RunHandle(run_name=None), done))
+        return done.wait(timeout)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "dropped": self.dropped,
+            "exported_batches": self.exported_batches,
+            "exported_artifacts": self.exported_artifacts,
+            "errors": self.errors,
+        }
+
+    # ==================== WORKER ====================
+
+    def _get_client(self):
+        if self._client is None:
+            import mlflow
+            from mlflow.tracking import MlflowClient
+
+            self._client = MlflowClient(tracking_uri=self.tracking_uri)
+            experiment = self._client.get_experiment_by_name(self.experiment_name)
+            self._experiment_id = (
+                experiment.experiment_id if experiment
+                else self._client.create_experiment(self.experiment_name)
+            )
+            # Spans go through the fluent API; point it at the same experiment
+            mlflow.set_experiment(experiment_id=self._experiment_id)
+        return self._client
+
+    def _run(self) -> None:
+        last_flush = time.time()
+        while True:
+            try:
+                op = self._queue.get(timeout=self.flush_interval_s)
+            except queue.Empty:
+                op = None
+
+            if op is not None:
+                try:
+                    self._handle(op)
+                except Exception as e:
+                    self.errors += 1
+                    logger.warning(f"MLflow export of {op.kind} failed: {e}")
+
+            if op is None or time.time() - last_flush >= self.flush_interval_s:
+                self._flush_all()
+                last_flush = time.time()
+
+    def _handle(self, op: _Op) -> None:
+        if op.kind == "flush":
+            self._flush_all()
+            op.payload.set()
+            return
+
+        if op.kind == "create_run":
+            try:
+                run = self._get_client().create_run(
+                    self._experiment_id,
+                    run_name=op.run.run_name,
+                    tags={"query_id": op.run.query_id},
+                )
+                op.run.run_id = run.info.run_id
+            except Exception:
+                op.run.failed = True
+                raise
+            return
+
+        if op.run.failed or op.run.run_id is None:
+            return  # Run creation failed; nothing to attach to
+
+        if op.kind in ("metrics", "params", "tags"):
+            _, batch = self._pending.setdefault(id(op.run), (op.run, _PendingBatch()))
+            getattr(batch, op.kind).update(op.payload)
+            if (
+                len(batch.metrics) >= MAX_BATCH_METRICS
+                or len(batch.params) >= MAX_BATCH_PARAMS
+                or len(batch.tags) >= MAX_BATCH_TAGS
+            ):
+                self._flush_run(op.run)
+        elif op.kind == "text":
+            text, artifact_file = op.payload
+            self._get_client().log_text(op.run.run_id, text, artifact_file)
+            self.exported_artifacts += 1
+        elif op.kind == "end_run":
+            self._flush_run(op.run)
+            self._get_client().set_terminated(op.run.run_id, status=op.payload)
+
+    def _flush_all(self) -> None:
+        for run, _ in list(self._pending.values()):
+            try:
+                self._flush_run(run)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"MLflow batch export failed: {e}")
+
+    def _flush_run(self, run: RunHandle) -> None:
+        entry = self._pending.pop(id(run), None)
+        if entry is None or not entry[1]:
+            return
+        from mlflow.entities import Metric, Param, RunTag
+
+        batch = entry[1]
+        self._get_client().log_batch(
+            run.run_id,
+            metrics=[Metric(k, v, ts, 0) for k, (v, ts) in batch.metrics.items()],
+            params=[Param(k, v) for k, v in batch.params.items()],
+            tags=[RunTag(k, v) for k, v in batch.tags.items()],
+        )
+        self.exported_batches += 1
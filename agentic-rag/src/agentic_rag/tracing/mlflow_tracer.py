@@ -3,16 +3,27 @@
 
 import time
 import json
+import random
+import uuid
+from contextvars import ContextVar
 from typing import Any, Generator
 from contextlib import contextmanager
 
 from agentic_rag.config import get_settings
+from .mlflow_exporter import MLflowExporter, RunHandle
+from .payload import limit_payload
 
 
 # Lazy import to avoid issues when mlflow is not installed
 _mlflow = None
 _mlflow_tracing = None
 
+# Run of the current query (exported in the background or, with a run_id, via the fluent API)
+_active_run: ContextVar[RunHandle | None] = ContextVar("mlflow_active_run", default=None)
+
+# Buffered run logging of a query that head sampling skipped; replayed if tail sampling keeps it
+_deferred_ops: ContextVar[list | None] = ContextVar("mlflow_deferred_ops", default=None)
+
 
 def _get_mlflow():
     """Lazy load mlflow."""
@@ -55,6 +66,8 @@ class MLflowTracer:
         self.enabled = self.settings.mlflow_enabled
         self._initialized = False
         self._current_trace = None
+        self._exporter: MLflowExporter | None = None
+        self._redact_fields = frozenset(f.lower() for f in self.settings.mlflow_redact_fields)
 
     def _ensure_initialized(self):
         """Initialize MLflow connection lazily."""
@@ -68,15 +81,36 @@ class MLflowTracer:
 
         try:
             mlflow.set_tracking_uri(self.settings.mlflow_tracking_uri)
-            mlflow.set_experiment(self.settings.mlflow_experiment_name)
+            if self.settings.mlflow_async_export:
+                # The exporter's worker resolves the experiment off the request path
+                self._exporter = MLflowExporter(
+                    tracking_uri=self.settings.mlflow_tracking_uri,
+                    experiment_name=self.settings.mlflow_experiment_name,
+                    max_queue_size=self.settings.mlflow_export_queue_size,
+                    flush_interval_s=self.settings.mlflow_export_flush_interval_s,
+                )
+                self._exporter.start()
+            else:
+                mlflow.set_experiment(self.settings.mlflow_experiment_name)
             self._initialized = True
         except Exception as e:
             print(f"Warning: Failed to initialize MLflow: {e}")
             self.enabled = False
 
     @contextmanager
-    def start_run(self, run_name: str | None = None):
-        """Start an MLflow run context."""
+    def start_run(self, run_name: str | None = None, question: str | None = None):
+        """
+        Start an MLflow run context, subject to trace sampling.
+
+        With a question, the run is named "{run_name}-{question[:30]}", or
+        "{run_name}-{query_id}" when "question" is in MLFLOW_REDACT_FIELDS.
+
+        Head sampling keeps MLFLOW_SAMPLE_RATE of queries with full spans and
+        logging. The rest run without spans and with run logging buffered in
+        memory; tail sampling still exports them (params, metrics and
+        artifacts, no spans) if they raise, take MLFLOW_SLOW_REQUEST_MS or
+        longer, or logged a profile, and discards them otherwise.
+        """
         if not self.enabled:
             yield None
             return
@@ -86,6 +120,37 @@ class MLflowTracer:
             yield None
             return
 
+        if random.random() >= self.settings.mlflow_sample_rate:
+            with self._deferred_run(run_name, question) as run:
+                yield run
+            return
+
+        with self._open_run(run_name, question) as run:
+            self._log_params({"sampling": "head"})
+            yield run
+
+    def _run_name(self, run_name: str | None, question: str | None, query_id: str) -> str | None:
+        """Run name with the question appended, or the query_id when the question is redacted."""
+        if question is None:
+            return run_name
+        suffix = query_id if "question" in self._redact_fields else question[:30]
+        return f"{run_name}-{suffix}" if run_name else suffix
+
+    @contextmanager
+    def _open_run(self, run_name: str | None, question: str | None = None):
+        """Open a run through the background exporter or the fluent API."""
+        query_id = uuid.uuid4().hex
+        run_name = self._run_name(run_name, question, query_id)
+        if self._exporter is not None:
+            handle = self._exporter.create_run(run_name, query_id=query_id)
+            token = _active_run.set(handle)
+            try:
+                yield handle
+            finally:
+                _active_run.reset(token)
+                self._exporter.end_run(handle)
+            return
+
         mlflow = _get_mlflow()
         run = None
         try:
@@ -95,14 +160,134 @@ class MLflowTracer:
             yield None
             return
 
+        handle = RunHandle(run_name=run_name, run_id=run.info.run_id, query_id=query_id)
+        try:
+            mlflow.set_tag("query_id", handle.query_id)
+        except Exception as e:
+            print(f"Warning: MLflow set_tag failed: {e}")
+        token = _active_run.set(handle)
         try:
             yield run
         finally:
+            _active_run.reset(token)
             try:
                 mlflow.end_run()
             except Exception as e:
                 print(f"Warning: MLflow end_run failed: {e}")
 
+    @contextmanager
+    def _deferred_run(self, run_name: str | None, question: str | None = None):
+        """Buffer run logging; export it afterwards only for errors, slow queries and profiles."""
+        ops: list[tuple[str, Any]] = []
+        token = _deferred_ops.set(ops)
+        start_time = time.time()
+        error = None
+        try:
+            yield None
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            _deferred_ops.reset(token)
+            duration_ms = (time.time() - start_time) * 1000
+            if error is not None:
+                reason = "tail_error"
+            elif duration_ms >= self.settings.mlflow_slow_request_ms:
+                reason = "tail_slow"
+            elif any(kind == "keep" for kind, _ in ops):
+                reason = "tail_profile"
+            else:
+                reason = None
+
+            if reason:
+                try:
+                    with self._open_run(run_name, question):
+                        self._log_params({"sampling": reason})
+                        for kind, payload in ops:
+                            if kind == "metrics":
+                                self._log_metrics(payload)
+                            elif kind == "params":
+                                self._log_params(payload)
+                            elif kind == "text":
+                                self._log_text(*payload)
+                        if error is not None:
+                            self._log_params({"error": str(error)[:500]})
+                            self._log_metrics({"success": 0})
+                except Exception as e:
+                    print(f"Warning: MLflow tail-sampled export failed: {e}")
+
+    def current_run_ids(self) -> tuple[str | None, str | None]:
+        """
+        (run_id, query_id) of the run the current query logs to.
+
+        query_id is known as soon as the run is opened and is tagged on the
+        run and set on the root span. run_id is None while the background
+        exporter has not created the run yet. Both are None for queries
+        whose logging is deferred by sampling (their run may never exist).
+        """
+        run = _active_run.get()
+        if run is None or run.failed:
+            return None, None
+        return run.run_id, run.query_id
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait for queued background exports (no-op when logging synchronously)."""
+        return self._exporter.flush(timeout) if self._exporter else True
+
+    def export_stats(self) -> dict | None:
+        """Background exporter counters, or None when logging synchronously."""
+        return self._exporter.stats() if self._exporter else None
+
+    def _limit(self, payload: Any, max_chars: int | None = None) -> Any:
+        """Apply payload size limits and field redaction."""
+        return limit_payload(
+            payload,
+            max_chars=self.settings.mlflow_span_max_chars if max_chars is None else max_chars,
+            redact_fields=self._redact_fields,
+        )
+
+    # ==================== RUN LOGGING BACKENDS ====================
+
+    def _log_metrics(self, metrics: dict[str, float]):
+        """Log metrics to the current run: queued when exporting in the background."""
+        deferred = _deferred_ops.get()
+        if deferred is not None:
+            deferred.append(("metrics", metrics))
+            return
+        run = _active_run.get()
+        if self._exporter is not None:
+            if run is not None:
+                self._exporter.log_metrics(run, metrics)
+            return
+        _get_mlflow().log_metrics(metrics)
+
+    def _log_params(self, params: dict[str, Any]):
+        """Log params (redacted) to the current run: queued when exporting in the background."""
+        deferred = _deferred_ops.get()
+        if deferred is not None:
+            deferred.append(("params", params))  # Redacted on replay
+            return
+        params = limit_payload(params, max_chars=0, redact_fields=self._redact_fields)
+        run = _active_run.get()
+        if self._exporter is not None:
+            if run is not None:
+                self._exporter.log_params(run, params)
+            return
+        _get_mlflow().log_params(params)
+
+    def _log_text(self, text: str, artifact_file: str):
+        """Log a text artifact to the current run: queued when exporting in the background."""
+        deferred = _deferred_ops.get()
+        if deferred is not None:
+            deferred.append(("text", (text, artifact_file)))
+            return
+        run = _active_run.get()
+        if self._exporter is not None:
+            if run is not None:
+                self._exporter.log_text(run, text, artifact_file)
+            return
+        _get_mlflow().log_text(text, artifact_file)
+
     # ==================== TRACING METHODS ====================
 
     @contextmanager
@@ -117,7 +302,7 @@ class MLflowTracer:
             name: Name of the trace (e.g., "agentic_rag_query")
             inputs: Input parameters to log with the trace
         """
-        if not self.enabled:
+        if not self.enabled or _deferred_ops.get() is not None:
             yield None
             return
 
@@ -131,9 +316,14 @@ class MLflowTracer:
             with mlflow.start_span(name=name) as span:
                 if inputs and span:
                     try:
-                        span.set_inputs(inputs)
+                        span.set_inputs(self._limit(inputs))
                     except Exception:
                         pass
+                # Runs exported in the background aren't the fluent active run,
+                # so spans are linked to their run through query_id
+                run = _active_run.get()
+                if run is not None and span:
+                    self.set_span_attribute(span, "query_id", run.query_id)
                 self._current_trace = span
                 yield span
                 self._current_trace = None
@@ -150,7 +340,7 @@ class MLflowTracer:
             name: Name of the span (e.g., "intent_classification")
             span_type: Type of span (CHAIN, RETRIEVER, LLM, TOOL, etc.)
         """
-        if not self.enabled:
+        if not self.enabled or _deferred_ops.get() is not None:
             yield None
             return
 
@@ -168,20 +358,20 @@ class MLflowTracer:
             yield None
 
     def set_span_inputs(self, span: Any, inputs: dict[str, Any]):
-        """Set inputs on a span."""
+        """Set inputs on a span (size-limited and redacted)."""
         if span is None or not self.enabled:
             return
         try:
-            span.set_inputs(inputs)
+            span.set_inputs(self._limit(inputs))
         except Exception:
             pass
 
     def set_span_outputs(self, span: Any, outputs: dict[str, Any]):
-        """Set outputs on a span."""
+        """Set outputs on a span (size-limited and redacted)."""
         if span is None or not self.enabled:
             return
         try:
-            span.set_outputs(outputs)
+            span.set_outputs(self._limit(outputs))
         except Exception:
             pass
 
@@ -294,7 +484,7 @@ class MLflowTracer:
             return
 
         try:
-            mlflow.log_params({
+            self._log_params({
                 "question": question[:250],  # Truncate long questions
                 "refinement_mode": refinement_mode,
                 "top_k": top_k,
@@ -313,7 +503,7 @@ class MLflowTracer:
             return
 
         try:
-            mlflow.log_params({
+            self._log_params({
                 "intent": intent,
                 "intent_confidence": confidence,
             })
@@ -330,7 +520,7 @@ class MLflowTracer:
             return
 
         try:
-            mlflow.log_params({
+            self._log_params({
                 "strategy": strategy,
                 "sources": ",".join(sources),
             })
@@ -350,7 +540,7 @@ class MLflowTracer:
             # Log non-null constraints
             for key, value in constraints.items():
                 if value is not None:
-                    mlflow.log_param(f"constraint_{key}", str(value)[:250])
+                    self._log_params({f"constraint_{key}": str(value)[:250]})
         except Exception:
             pass
 
@@ -369,7 +559,7 @@ class MLflowTracer:
             return
 
         try:
-            mlflow.log_metrics({
+            self._log_metrics({
                 f"retrieval_{iteration}_docs": documents_retrieved,
                 f"retrieval_{iteration}_duration_ms": retrieval_duration_ms,
             })
@@ -391,7 +581,7 @@ class MLflowTracer:
             return
 
         try:
-            mlflow.log_metrics({
+            self._log_metrics({
                 "constraints_valid": 1 if is_valid else 0,
                 "constraints_matched_count": matched_count,
                 "constraints_unmatched_count": len(unmatched),
@@ -415,8 +605,8 @@ class MLflowTracer:
             return
 
         try:
-            mlflow.log_param("refinement_mode_used", mode)
-            mlflow.log_metrics({
+            self._log_params({"refinement_mode_used": mode})
+            self._log_metrics({
                 "refinement_input_docs": input_count,
                 "refinement_output_docs": output_count,
                 "refinement_dropped_docs": input_count - output_count,
@@ -425,6 +615,32 @@ class MLflowTracer:
         except Exception:
             pass
 
+    def log_sufficiency_metrics(
+        self,
+        llm_evaluations: int,
+        llm_evaluations_avoided: int,
+        shadow_agreements: int = 0,
+        shadow_evaluations: int = 0,
+    ):
+        """Log how often the cheap sufficiency score stood in for the LLM evaluator."""
+        if not self.enabled:
+            return
+
+        mlflow = _get_mlflow()
+        if mlflow is None:
+            return
+
+        try:
+            metrics = {
+                "sufficiency_llm_evaluations": llm_evaluations,
+                "sufficiency_llm_evaluations_avoided": llm_evaluations_avoided,
+            }
+            if shadow_evaluations:
+                metrics["sufficiency_shadow_agreement"] = shadow_agreements / shadow_evaluations
+            self._log_metrics(metrics)
+        except Exception:
+            pass
+
     def log_generation_metrics(self, duration_ms: float):
         """Log generation metrics."""
         if not self.enabled:
@@ -435,7 +651,34 @@ class MLflowTracer:
             return
 
         try:
-            mlflow.log_metric("generation_duration_ms", duration_ms)
+            self._log_metrics({"generation_duration_ms": duration_ms})
+        except Exception:
+            pass
+
+    def log_generation_route(
+        self,
+        route: str,
+        model: str,
+        duration_ms: float,
+        output_tokens: int | None,
+        cost_usd: float | None,
+    ):
+        """Log the generation route taken and its latency, output length and cost."""
+        if not self.enabled:
+            return
+
+        mlflow = _get_mlflow()
+        if mlflow is None:
+            return
+
+        try:
+            self._log_params({"generation_route": route, "generation_model_used": model})
+            metrics = {f"generation_{route}_duration_ms": duration_ms}
+            if output_tokens is not None:
+                metrics[f"generation_{route}_output_tokens"] = output_tokens
+            if cost_usd is not None:
+                metrics[f"generation_{route}_cost_usd"] = cost_usd
+            self._log_metrics(metrics)
         except Exception:
             pass
 
@@ -454,11 +697,11 @@ class MLflowTracer:
             return
 
         try:
-            mlflow.log_metrics({
+            self._log_metrics({
                 "total_duration_ms": total_duration_ms,
                 "success": 1 if success else 0,
             })
-            mlflow.log_param("answer_type", answer_type)
+            self._log_params({"answer_type": answer_type})
         except Exception:
             pass
 
@@ -472,8 +715,10 @@ class MLflowTracer:
             return
 
         try:
-            trace_json = json.dumps(trace, indent=2, default=str)
-            mlflow.log_text(trace_json, "trace.json")
+            trace_json = json.dumps(
+                self._limit(trace, self.settings.mlflow_artifact_max_chars), indent=2, default=str
+            )
+            self._log_text(trace_json, "trace.json")
         except Exception:
             pass
 
@@ -487,11 +732,37 @@ class MLflowTracer:
             return
 
         try:
-            answer_json = json.dumps(answer, indent=2, default=str)
-            mlflow.log_text(answer_json, "answer.json")
+            answer_json = json.dumps(
+                self._limit(answer, self.settings.mlflow_artifact_max_chars), indent=2, default=str
+            )
+            self._log_text(answer_json, "answer.json")
         except Exception:
             pass
 
+    def log_profile_artifact(self, report: str, artifact_file: str) -> bool:
+        """
+        Log a profiler report (text or HTML) as an artifact.
+
+        A query whose run logging is deferred by sampling is kept and
+        exported rather than discarded, so the profile can be found.
+
+        Returns:
+            True if the artifact goes to a run, False if it was not logged
+        """
+        if not self.enabled:
+            return False
+
+        try:
+            deferred = _deferred_ops.get()
+            if deferred is not None:
+                deferred.append(("keep", None))
+            elif _active_run.get() is None:
+                return False
+            self._log_text(report, artifact_file)
+            return True
+        except Exception:
+            return False
+
     def log_error(self, error: str):
         """Log an error."""
         if not self.enabled:
@@ -502,8 +773,8 @@ class MLflowTracer:
             return
 
         try:
-            mlflow.log_param("error", error[:500])
-            mlflow.log_metric("success", 0)
+            self._log_params({"error": error[:500]})
+            self._log_metrics({"success": 0})
         except Exception:
             pass
 
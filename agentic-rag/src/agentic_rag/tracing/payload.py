@@ -0,0 +1,63 @@
+# payload.py
+"""Size limits and redaction for payloads sent to MLflow.
+
+Span inputs/outputs and trace artifacts carry prompts, responses and
+document texts. limit_payload walks a payload and:
+- replaces values of redacted fields with a hash marker
+- truncates long strings, keeping a prefix and a hash of the full value
+- truncates long lists, noting how many items were dropped
+
+Hashes (sha256, 12 hex chars) let identical values be matched across
+traces without storing them.
+"""
+
+import hashlib
+from typing import Any
+
+MAX_LIST_ITEMS = 50
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="replace")).hexdigest()[:12]
+
+
+def limit_payload(
+    value: Any,
+    max_chars: int,
+    redact_fields: frozenset[str] = frozenset(),
+    max_items: int = MAX_LIST_ITEMS,
+) -> Any:
+    """
+    Return a size-limited, redacted copy of a JSON-like payload.
+
+    Args:
+        value: Payload (dicts, lists, strings, scalars; pydantic models are dumped)
+        max_chars: Longest string kept verbatim; 0 disables truncation
+        redact_fields: Lower-case keys whose values are replaced by a hash marker
+        max_items: Longest list kept in full
+    """
+    if hasattr(value, "model_dump"):
+        value = value.model_dump()
+
+    if isinstance(value, dict):
+        limited = {}
+        for key, item in value.items():
+            if str(key).lower() in redact_fields and item is not None:
+                limited[key] = f"[redacted sha256:{content_hash(str(item))}]"
+            else:
+                limited[key] = limit_payload(item, max_chars, redact_fields, max_items)
+        return limited
+
+    if isinstance(value, (list, tuple)):
+        limited = [limit_payload(item, max_chars, redact_fields, max_items) for item in value[:max_items]]
+        if len(value) > max_items:
+            limited.append(f"[... {len(value) - max_items} more items]")
+        return limited
+
+    if isinstance(value, str) and max_chars and len(value) > max_chars:
+        return (
+            f"{value[:max_chars]}[... truncated {len(value) - max_chars} chars, "
+            f"sha256:{content_hash(value)}]"
+        )
+
+    return value
@@ -0,0 +1,189 @@
+# profiling.py
+"""On-demand per-request profiling.
+
+With PROFILING_ENABLED, a query is profiled when it asks for it (the
+X-Debug-Profile header or QueryRequest.profile) or falls in the sampled
+PROFILING_SAMPLE_RATE. Profiles are stored as an MLflow artifact of the
+query's run and/or under PROFILING_OUTPUT_DIR, and the top-N functions by
+self time go into trace.profile.
+
+Backends:
+- cprofile (stdlib): deterministic, profiles the calling thread only. On
+  the event loop thread (/api/query) other requests interleaving on the
+  loop are included; streaming queries run on their own thread.
+- pyinstrument (optional): sampling, with async-aware attribution to the
+  profiled task. Falls back to cprofile when not installed.
+"""
+
+import cProfile
+import importlib.util
+import io
+import logging
+import pstats
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from agentic_rag.config import get_settings
+from .mlflow_tracer import get_mlflow_tracer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProfileCapture:
+    """One captured profile and its summary."""
+    name: str
+    backend: str
+    profile_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    duration_ms: float | None = None
+    top_functions: list[dict[str, Any]] = field(default_factory=list)
+    report: str = ""  # Human-readable report (pstats listing or pyinstrument text)
+    html: str | None = None  # pyinstrument only
+    locations: list[str] = field(default_factory=list)  # Where the profile was stored
+
+    def to_dict(self) -> dict:
+        return {
+            "profile_id": self.profile_id,
+            "backend": self.backend,
+            "duration_ms": self.duration_ms,
+            "top_functions": self.top_functions,
+            "locations": self.locations,
+        }
+
+
+def _cprofile_top(profile: cProfile.Profile, top_n: int) -> tuple[list[dict], str]:
+    """Top functions by self time and the pstats report."""
+    stream = io.StringIO()
+    stats = pstats.Stats(profile, stream=stream)
+    stats.sort_stats("tottime").print_stats(top_n * 2)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top_n]
+    top = [
+        {
+            "function": f"{func} ({Path(filename).name}:{line})",
+            "calls": calls,
+            "self_ms": round(tottime * 1000, 2),
+            "cumulative_ms": round(cumtime * 1000, 2),
+        }
+        for (filename, line, func), (_, calls, tottime, cumtime, _) in rows
+    ]
+    return top, stream.getvalue()
+
+
+def _pyinstrument_top(session, top_n: int) -> list[dict]:
+    """Aggregate self and total time per function over the pyinstrument frame tree."""
+    totals: dict[str, dict] = {}
+
+    def walk(frame, ancestors: frozenset):
+        key = f"{frame.function} ({frame.file_path_short}:{frame.line_no})"
+        entry = totals.setdefault(key, {"function": key, "self_ms": 0.0, "cumulative_ms": 0.0})
+        entry["self_ms"] += frame.total_self_time * 1000
+        if key not in ancestors:  # Count recursive frames once
+            entry["cumulative_ms"] += frame.time * 1000
+        for child in frame.children:
+            walk(child, ancestors | {key})
+
+    root = session.root_frame()
+    if root is not None:
+        walk(root, frozenset())
+    top = sorted(totals.values(), key=lambda entry: entry["self_ms"], reverse=True)[:top_n]
+    return [{**e, "self_ms": round(e["self_ms"], 2), "cumulative_ms": round(e["cumulative_ms"], 2)} for e in top]
+
+
+class QueryProfiler:
+    """Decide which queries to profile, capture them and store the results."""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.enabled = self.settings.profiling_enabled
+        self.backend = self.settings.profiling_backend
+        if self.backend == "pyinstrument" and importlib.util.find_spec("pyinstrument") is None:
+            logger.warning("pyinstrument not installed; profiling with cProfile")
+            self.backend = "cprofile"
+
+    def should_profile(self, requested: bool = False) -> bool:
+        """Profile when enabled and either requested or sampled."""
+        if not self.enabled:
+            return False
+        return requested or random.random() < self.settings.profiling_sample_rate
+
+    @contextmanager
+    def capture(self, name: str):
+        """Profile the enclosed block; the capture is summarized and stored on exit."""
+        capture = ProfileCapture(name=name, backend=self.backend)
+        top_n = self.settings.profiling_top_n
+        start_time = time.time()
+
+        if self.backend == "pyinstrument":
+            from pyinstrument import Profiler
+
+            profiler = Profiler(async_mode="enabled")
+            profiler.start()
+            try:
+                yield capture
+            finally:
+                session = profiler.stop()
+                capture.duration_ms = (time.time() - start_time) * 1000
+                capture.top_functions = _pyinstrument_top(session, top_n)
+                capture.report = profiler.output_text(unicode=True)
+                capture.html = profiler.output_html()
+                self._store(capture)
+            return
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Python 3.12+ allows one active cProfile per process
+            logger.warning(f"Profiling of {name} skipped: {e}")
+            yield capture
+            return
+        try:
+            yield capture
+        finally:
+            profile.disable()
+            capture.duration_ms = (time.time() - start_time) * 1000
+            capture.top_functions, capture.report = _cprofile_top(profile, top_n)
+            self._store(capture, profile)
+
+    def _store(self, capture: ProfileCapture, profile: cProfile.Profile | None = None) -> None:
+        """Write the profile to PROFILING_OUTPUT_DIR and the MLflow run; locations lists where it went."""
+        stem = f"{datetime.now():%Y%m%d-%H%M%S}-{capture.name}-{capture.profile_id}"
+
+        output_dir = self.settings.profiling_output_dir
+        if output_dir:
+            try:
+                output_dir = Path(output_dir)
+                output_dir.mkdir(parents=True, exist_ok=True)
+                (output_dir / f"{stem}.txt").write_text(capture.report)
+                if profile is not None:
+                    # Binary stats for snakeviz / pstats
+                    profile.dump_stats(output_dir / f"{stem}.prof")
+                if capture.html:
+                    (output_dir / f"{stem}.html").write_text(capture.html)
+                capture.locations.append(str(output_dir / stem))
+            except Exception as e:
+                logger.warning(f"Failed to write profile to {output_dir}: {e}")
+
+        mlflow_tracer = get_mlflow_tracer()
+        if mlflow_tracer.log_profile_artifact(capture.report, f"profile/{stem}.txt"):
+            if capture.html:
+                mlflow_tracer.log_profile_artifact(capture.html, f"profile/{stem}.html")
+            capture.locations.append(f"mlflow:profile/{stem}")
+
+
+# Global profiler instance
+_profiler: QueryProfiler | None = None
+
+
+def get_query_profiler() -> QueryProfiler:
+    """Get or create the global query profiler."""
+    global _profiler
+    if _profiler is None:
+        _profiler = QueryProfiler()
+    return _profiler
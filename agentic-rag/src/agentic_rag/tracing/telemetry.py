@@ -0,0 +1,311 @@
+# telemetry.py
+"""Prometheus metrics and OpenTelemetry span export.
+
+Complements MLflow (per-query runs for debugging) with aggregate signals
+for latency dashboards:
+- Prometheus histograms per pipeline stage, per LLM call (by model) and
+  per HTTP route, plus counters for cache hits, retries and deadline
+  degradations, served from GET /metrics
+- Optional OTLP export: each query's pipeline steps are collected as
+  TraceSpan entries on a Tracer and sent as OpenTelemetry spans when
+  OTEL_EXPORTER_OTLP_ENDPOINT is set
+
+Both are optional dependencies (prometheus-client, opentelemetry-sdk and
+opentelemetry-exporter-otlp-proto-http); without them every call is a no-op.
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from agentic_rag.config import get_settings
+from .tracer import Tracer
+
+logger = logging.getLogger(__name__)
+
+# LLM calls and generation run to tens of seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+# Pipeline steps of the current query, exported as OTLP spans when it finishes
+_current_tracer: ContextVar[Tracer | None] = ContextVar("telemetry_tracer", default=None)
+
+
+def _otel_attributes(attributes: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    """Flatten attributes into the primitive values OpenTelemetry accepts."""
+    flat = {}
+    for key, value in attributes.items():
+        name = f"{prefix}{key}"
+        if value is None:
+            continue
+        if isinstance(value, (bool, int, float, str)):
+            flat[name] = value
+        elif isinstance(value, dict):
+            flat.update(_otel_attributes(value, prefix=f"{name}."))
+        elif isinstance(value, (list, tuple)) and all(isinstance(v, (bool, int, float, str)) for v in value):
+            flat[name] = [str(v) for v in value]
+        else:
+            flat[name] = json.dumps(value, default=str)
+    return flat
+
+
+def _ns(timestamp: float) -> int:
+    return int(timestamp * 1e9)
+
+
+class Telemetry:
+    """Prometheus metrics and OTLP span export for the RAG pipelines."""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.metrics_enabled = self.settings.metrics_enabled
+        self.otlp_enabled = bool(self.settings.otel_exporter_otlp_endpoint)
+        self._lock = threading.Lock()
+        self._metrics_initialized = False
+        self._otel_initialized = False
+        self._registry = None
+        self._metrics: dict[str, Any] = {}
+        self._otel_provider = None
+        self._otel_tracer = None
+
+    # ==================== INITIALIZATION ====================
+
+    def _ensure_metrics(self) -> bool:
+        if not self.metrics_enabled:
+            return False
+        with self._lock:
+            if self._metrics_initialized:
+                return self._registry is not None
+            self._metrics_initialized = True
+            try:
+                from prometheus_client import CollectorRegistry, Counter, Histogram
+            except ImportError:
+                logger.warning("prometheus-client not installed; /metrics is disabled")
+                return False
+
+            registry = CollectorRegistry()
+            self._metrics = {
+                "http": Histogram(
+                    "agentic_rag_http_request_duration_seconds", "HTTP request duration",
+                    ["method", "route", "status"], buckets=LATENCY_BUCKETS, registry=registry,
+                ),
+                "query": Histogram(
+                    "agentic_rag_query_duration_seconds", "End-to-end query duration",
+                    ["pipeline", "outcome"], buckets=LATENCY_BUCKETS, registry=registry,
+                ),
+                "stage": Histogram(
+                    "agentic_rag_stage_duration_seconds",
+                    "Pipeline stage duration (detail: source, mode or route)",
+                    ["pipeline", "stage", "detail"], buckets=LATENCY_BUCKETS, registry=registry,
+                ),
+                "llm": Histogram(
+                    "agentic_rag_llm_call_duration_seconds", "LLM call duration",
+                    ["model", "step"], buckets=LATENCY_BUCKETS, registry=registry,
+                ),
+                "llm_tokens": Counter(
+                    "agentic_rag_llm_tokens", "LLM tokens (input includes cached)",
+                    ["model", "kind"], registry=registry,
+                ),
+                "cache": Counter(
+                    "agentic_rag_cache_requests", "Cache lookups",
+                    ["cache", "result"], registry=registry,
+                ),
+                "retries": Counter(
+                    "agentic_rag_retries", "Repeated work: extra retrieval iterations and filter fallbacks",
+                    ["reason"], registry=registry,
+                ),
+                "degradations": Counter(
+                    "agentic_rag_degradations", "Degradations taken to meet a request deadline",
+                    ["action"], registry=registry,
+                ),
+            }
+            self._registry = registry
+            return True
+
+    def _ensure_otel(self):
+        if not self.otlp_enabled:
+            return None
+        with self._lock:
+            if self._otel_initialized:
+                return self._otel_tracer
+            self._otel_initialized = True
+            try:
+                from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+                from opentelemetry.sdk.resources import Resource
+                from opentelemetry.sdk.trace import TracerProvider
+                from opentelemetry.sdk.trace.export import BatchSpanProcessor
+            except ImportError:
+                logger.warning(
+                    "OTLP export requested but OpenTelemetry is not installed. Install with: "
+                    "pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http"
+                )
+                return None
+
+            endpoint = self.settings.otel_exporter_otlp_endpoint.rstrip("/")
+            if not endpoint.endswith("/v1/traces"):
+                endpoint = f"{endpoint}/v1/traces"
+            # A private provider: don't replace a global one the host process may have set up
+            provider = TracerProvider(resource=Resource.create({"service.name": self.settings.otel_service_name}))
+            provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+            self._otel_provider = provider
+            self._otel_tracer = provider.get_tracer("agentic_rag")
+            logger.info(f"Exporting OTLP spans to {endpoint}")
+            return self._otel_tracer
+
+    # ==================== QUERY CONTEXT ====================
+
+    @contextmanager
+    def query(self, pipeline: str, attributes: dict[str, Any] | None = None):
+        """
+        Time one query and collect its pipeline steps.
+
+        Yields the query's Tracer; record_step adds spans to it. On exit the
+        query duration is observed and, with OTLP enabled, the Tracer is
+        exported as a root span with one child span per step.
+        """
+        tracer = Tracer()
+        token = _current_tracer.set(tracer)
+        outcome = "success"
+        try:
+            yield tracer
+        except Exception as e:
+            outcome = "error"
+            tracer.start_span("error", {"error": str(e)[:500]}).end()
+            raise
+        finally:
+            _current_tracer.reset(token)
+            duration_s = time.time() - tracer.start_time
+            if self._ensure_metrics():
+                self._metrics["query"].labels(pipeline, outcome).observe(duration_s)
+            self._export_spans(tracer, f"{pipeline}_rag_query", {
+                "pipeline": pipeline,
+                "outcome": outcome,
+                **(attributes or {}),
+            })
+
+    def record_step(self, step: dict[str, Any]) -> None:
+        """Add a completed pipeline step (trace.steps entry) to the current query's Tracer."""
+        tracer = _current_tracer.get()
+        if tracer is None:
+            return
+        tracer.record_span(
+            step["name"],
+            step.get("duration_ms") or 0.0,
+            attributes={
+                "type": step.get("type"),
+                "status": step.get("status"),
+                **step.get("details", {}),
+            },
+        )
+
+    def _export_spans(self, tracer: Tracer, name: str, attributes: dict[str, Any]) -> None:
+        otel_tracer = self._ensure_otel()
+        if otel_tracer is None:
+            return
+        try:
+            from opentelemetry import trace as otel_trace
+
+            end_time = time.time()
+            root = otel_tracer.start_span(
+                name,
+                start_time=_ns(tracer.start_time),
+                attributes=_otel_attributes({**attributes, "trace_id": tracer.trace_id}),
+            )
+            context = otel_trace.set_span_in_context(root)
+            for span in tracer.spans:
+                child = otel_tracer.start_span(
+                    span.name,
+                    context=context,
+                    start_time=_ns(span.start_time),
+                    attributes=_otel_attributes(span.attributes),
+                )
+                for event in span.events:
+                    child.add_event(
+                        event["name"], _otel_attributes(event["attributes"]), timestamp=_ns(event["timestamp"])
+                    )
+                if span.attributes.get("status") == "error" or span.name == "error":
+                    child.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR))
+                child.end(end_time=_ns(span.end_time or end_time))
+            root.end(end_time=_ns(end_time))
+        except Exception as e:
+            logger.warning(f"OTLP span export failed: {e}")
+
+    # ==================== METRICS ====================
+
+    def observe_stage(self, pipeline: str, stage: str, duration_ms: float, detail: str = "") -> None:
+        """Observe a pipeline stage duration."""
+        if self._ensure_metrics():
+            self._metrics["stage"].labels(pipeline, stage, detail).observe(duration_ms / 1000)
+
+    def observe_http(self, method: str, route: str, status: int, duration_ms: float) -> None:
+        """Observe an HTTP request duration (route is the path template)."""
+        if self._ensure_metrics():
+            self._metrics["http"].labels(method, route, str(status)).observe(duration_ms / 1000)
+
+    def record_llm_calls(self, llm_calls: list) -> None:
+        """Observe LLM call durations and token counts by model; count prompt cache hits."""
+        if not self._ensure_metrics():
+            return
+        for call in llm_calls:
+            if call.prompt.startswith("(skipped"):
+                continue
+            if call.duration_ms is not None:
+                self._metrics["llm"].labels(call.model, call.step).observe(call.duration_ms / 1000)
+            for kind in ("input_tokens", "output_tokens", "cached_input_tokens"):
+                value = getattr(call, kind)
+                if value:
+                    self._metrics["llm_tokens"].labels(call.model, kind.removesuffix("_tokens")).inc(value)
+            if call.input_tokens:
+                self.record_cache("prompt", hits=int(bool(call.cached_input_tokens)), misses=int(not call.cached_input_tokens))
+
+    def record_cache(self, cache: str, hits: int = 0, misses: int = 0) -> None:
+        """Count cache hits and misses."""
+        if not self._ensure_metrics():
+            return
+        if hits:
+            self._metrics["cache"].labels(cache, "hit").inc(hits)
+        if misses:
+            self._metrics["cache"].labels(cache, "miss").inc(misses)
+
+    def record_retry(self, reason: str) -> None:
+        """Count repeated work (another retrieval iteration, an unfiltered fallback search)."""
+        if self._ensure_metrics():
+            self._metrics["retries"].labels(reason).inc()
+
+    def record_degradations(self, degradations: list[dict]) -> None:
+        """Count deadline degradations (Deadline.degradations entries)."""
+        if not self._ensure_metrics():
+            return
+        for degradation in degradations:
+            self._metrics["degradations"].labels(degradation["action"]).inc()
+
+    def render_metrics(self) -> tuple[bytes, str] | None:
+        """Metrics in the Prometheus text format, or None when metrics are unavailable."""
+        if not self._ensure_metrics():
+            return None
+        from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+        return generate_latest(self._registry), CONTENT_TYPE_LATEST
+
+    def shutdown(self) -> None:
+        """Flush pending OTLP spans."""
+        if self._otel_provider is not None:
+            try:
+                self._otel_provider.shutdown()
+            except Exception as e:
+                logger.warning(f"OTLP shutdown failed: {e}")
+
+
+# Global telemetry instance
+_telemetry: Telemetry | None = None
+
+
+def get_telemetry() -> Telemetry:
+    """Get or create the global telemetry instance."""
+    global _telemetry
+    if _telemetry is None:
+        _telemetry = Telemetry()
+    return _telemetry
@@ -60,6 +60,24 @@ class Tracer:
         self.spans.append(span)
         return span
 
+    def record_span(
+        self,
+        name: str,
+        duration_ms: float,
+        attributes: dict[str, Any] | None = None,
+        end_time: float | None = None,
+    ) -> TraceSpan:
+        """Record a span that has already finished (ending now unless end_time is given)."""
+        end_time = end_time or time.time()
+        span = TraceSpan(
+            name=name,
+            start_time=end_time - duration_ms / 1000,
+            end_time=end_time,
+            attributes=attributes or {},
+        )
+        self.spans.append(span)
+        return span
+
     def to_dict(self) -> dict:
         return {
             "trace_id": self.trace_id,